@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+
+@dataclass(frozen=True)
+class AnomalySettings:
+    """Per-check sensitivity, from the ``anomaly`` block in checks.yml."""
+
+    enabled: bool = True
+    alpha: float = 0.05
+    z_threshold: float = 4.0
+    min_delta_ms: int = 50
+    min_samples: int = 20
+    consecutive: int = 3
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any] | None) -> AnomalySettings:
+        if not data:
+            return cls()
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass(slots=True)
+class LatencyBaseline:
+    """EWMA mean/variance of a check's latency plus the DEGRADED state.
+
+    Only normal samples feed the baseline, so a sustained regression is not
+    absorbed into it while the check is degraded.
+    """
+
+    mean: float = 0.0
+    var: float = 0.0
+    samples: int = 0
+    degraded: bool = False
+    streak: int = 0
+
+    def _learn(self, latency_ms: float, alpha: float) -> None:
+        if self.samples == 0:
+            self.mean = latency_ms
+        else:
+            diff = latency_ms - self.mean
+            incr = alpha * diff
+            self.mean += incr
+            self.var = (1 - alpha) * (self.var + diff * incr)
+        self.samples += 1
+
+    def zscore(self, latency_ms: float) -> float:
+        # Floor the deviation at 1ms so a perfectly flat baseline cannot
+        # turn jitter into huge z-scores.
+        return (latency_ms - self.mean) / max(math.sqrt(self.var), 1.0)
+
+    def observe(self, latency_ms: float, cfg: AnomalySettings) -> str | None:
+        """Feed one successful sample; return ``DEGRADED``/``RECOVERED`` on edges."""
+        if self.samples < cfg.min_samples:
+            self._learn(latency_ms, cfg.alpha)
+            return None
+
+        anomalous = (
+            latency_ms - self.mean >= cfg.min_delta_ms
+            and self.zscore(latency_ms) >= cfg.z_threshold
+        )
+        if not anomalous:
+            self._learn(latency_ms, cfg.alpha)
+
+        if self.degraded == anomalous:
+            self.streak = 0
+            return None
+        self.streak += 1
+        if self.streak < cfg.consecutive:
+            return None
+        self.streak = 0
+        self.degraded = anomalous
+        return "DEGRADED" if anomalous else "RECOVERED"
+
+    def reset_state(self) -> None:
+        """Forget DEGRADED (e.g. the check went DOWN) but keep the baseline."""
+        self.degraded = False
+        self.streak = 0
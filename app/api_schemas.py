@@ -26,6 +26,14 @@ class CheckStateResponse(BaseModel):
     latency_ms: int | None = None
     status_code: int | None = None
     error: str | None = None
+    flapping: bool = False
+
+
+class StatusChecksDeltaResponse(BaseModel):
+    generation: int = Field(description="Generation to pass as `since` on the next poll")
+    full: bool = Field(description="True when `changed` is a full resync of all checks")
+    changed: dict[str, CheckStateResponse]
+    removed: list[str] = Field(default_factory=list)
 
 
 class RegistryNormalizedResponse(BaseModel):
@@ -42,6 +50,82 @@ class StatusSummaryResponse(BaseModel):
     down_checks: list[CheckStateResponse]
 
 
+class TagSummaryResponse(BaseModel):
+    tag: str
+    total: int
+    up: int
+    down: int
+    unknown: int
+    worst: Literal["up", "down", "unknown"]
+    latency_p95_ms: int | None = None
+
+
+class LatencyWindowStats(BaseModel):
+    count: int = Field(description="Samples in the window")
+    p50_ms: float | None = None
+    p90_ms: float | None = None
+    p99_ms: float | None = None
+
+
+class CheckLatencyResponse(BaseModel):
+    id: str
+    timestamp: str
+    latency_ms: int | None = Field(default=None, description="Latest sample")
+    windows: dict[str, LatencyWindowStats]
+
+
+class CheckAvailability(BaseModel):
+    up_s: float
+    down_s: float
+    monitored_s: float = Field(description="up_s + down_s")
+    no_data_s: float = Field(
+        description="Part of the range with no up/down credit (monitor down, unknown, not yet created)"
+    )
+    availability: float | None = Field(description="up_s / monitored_s, null without data")
+
+
+class AvailabilityResponse(BaseModel):
+    timestamp: str
+    start: str = Field(description="First UTC day (inclusive)")
+    end: str = Field(description="Last UTC day (inclusive)")
+    checks: dict[str, CheckAvailability]
+
+
+class IncidentCheck(BaseModel):
+    id: str
+    down_at: str
+    up_at: str | None = None
+
+
+class IncidentResponse(BaseModel):
+    id: int
+    status: Literal["open", "resolved"]
+    started_at: str
+    ended_at: str | None = None
+    duration_s: float | None = None
+    affected: list[IncidentCheck]
+    keys: list[str] = Field(description="Correlation keys (tag:<tag>, dep:<check id>)")
+
+
+class ProxmoxOpenIssue(BaseModel):
+    key: str = Field(description="Issue identity, e.g. ct_disk_high:vmid=111,name=dashboards")
+    issue: Any
+    since: str
+
+
+class ProxmoxIssueChange(BaseModel):
+    ts: str
+    change: Literal["APPEARED", "RESOLVED"]
+    key: str
+    issue: Any
+    duration_s: float | None = Field(default=None, description="Set on RESOLVED")
+
+
+class ProxmoxIssuesResponse(BaseModel):
+    open: list[ProxmoxOpenIssue]
+    history: list[ProxmoxIssueChange] = Field(description="Newest first")
+
+
 class StatusEventResponse(BaseModel):
     ts: str
     id: str
@@ -50,6 +134,7 @@ class StatusEventResponse(BaseModel):
     latency_ms: int | None = None
     status_code: int | None = None
     error: str | None = None
+    detail: str | None = None
 
 
 class AlertTestResponse(BaseModel):
@@ -72,8 +157,22 @@ class OpsProxmoxSummary(BaseModel):
 
 
 class OpsDockerSummary(BaseModel):
-    status: Literal["unknown"]
-    note: str
+    status: Literal["ok", "warn", "unknown", "unavailable"]
+    note: str | None = None
+    endpoints: int | None = Field(default=None, description="Portainer environments listed")
+    failed_endpoints: list[str] = Field(
+        default_factory=list, description="'<environment>: <error>' for environments that failed to list"
+    )
+    containers_total: int | None = None
+    containers_running: int | None = None
+    unhealthy: list[str] = Field(
+        default_factory=list, description="'<environment>/<container>' reporting unhealthy"
+    )
+    down_checks: list[str] = Field(
+        default_factory=list, description="Container check ids currently down"
+    )
+    last_fetch_ts: str | None = None
+    last_error: str | None = None
 
 
 class OpsRecentEvent(BaseModel):
@@ -106,7 +205,7 @@ class OpsDependencyPlaceholder(BaseModel):
 class OpsDependenciesResponse(BaseModel):
     proxmox_stats: OpsDependencyStatus
     ntfy: OpsDependencyPlaceholder
-    portainer: OpsDependencyPlaceholder
+    portainer: OpsDependencyStatus
 
 
 class OpsHealthResponse(BaseModel):
@@ -114,6 +213,68 @@ class OpsHealthResponse(BaseModel):
     dependencies: OpsDependenciesResponse
 
 
+class TimingStats(BaseModel):
+    count: int = Field(description="Samples recorded since startup")
+    window: int = Field(description="Samples in the rolling window used for percentiles")
+    total_ms: float
+    mean_ms: float | None = None
+    p50_ms: float | None = None
+    p90_ms: float | None = None
+    p99_ms: float | None = None
+    window_max_ms: float | None = None
+    max_ms: float
+
+
+class ReadConnectionStatsResponse(BaseModel):
+    name: str
+    acquisitions: int
+    wait_total_ms: float
+    wait_avg_ms: float
+    wait_max_ms: float
+
+
+class SinkStatsResponse(BaseModel):
+    queue_depth: int
+    delivered: int
+    dropped: int
+    circuit: Literal["closed", "open", "half_open"] | None = None
+
+
+class NotifierStatsResponse(BaseModel):
+    queue_depth: int = Field(description="Notifications not yet delivered (outbox)")
+    delivered: int
+    dropped: int = Field(description="Given up after max attempts")
+    sinks: dict[str, SinkStatsResponse] = Field(default_factory=dict)
+
+
+class CoalescerStatsResponse(BaseModel):
+    pending: int = Field(description="Checks waiting for the next digest")
+    posts: int = Field(description="Notifications handed to the dispatcher")
+    suppressed: int = Field(description="Repeats of the last notified kind")
+
+
+class PollerStatsResponse(BaseModel):
+    interval_s: float
+    consecutive_failures: int
+    circuit: Literal["closed", "open", "half_open"]
+
+
+class OpsSelfResponse(BaseModel):
+    timestamp: str
+    timings: dict[str, TimingStats]
+    sqlite_read_pool: list[ReadConnectionStatsResponse] = Field(default_factory=list)
+    notifier: NotifierStatsResponse | None = Field(
+        default=None, description="Null when no sink is configured"
+    )
+    coalescer: CoalescerStatsResponse | None = Field(
+        default=None, description="Null when no sink is configured or coalescing is off"
+    )
+    proxmox_poller: PollerStatsResponse | None = None
+    portainer_poller: PollerStatsResponse | None = Field(
+        default=None, description="Null when PORTAINER_BASE_URL is not set"
+    )
+
+
 class ReportGenerateRequest(BaseModel):
     range_minutes: int = Field(default=1440, ge=5, le=10080)
 
@@ -149,6 +310,7 @@ class ReportSourcesInfo(BaseModel):
     status_summary_included: bool
     events_limit: int
     proxmox_included: bool
+    incidents_count: int = 0
 
 
 class ReportGenerateResponse(BaseModel):
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any, Iterable
+
+DAY_US = 86_400 * 1_000_000
+_EPOCH_DATE = date(1970, 1, 1)
+
+
+def day_of(us: int) -> int:
+    """UTC day number (days since the epoch) containing ``us``."""
+    return us // DAY_US
+
+
+def day_to_date(day: int) -> date:
+    return _EPOCH_DATE + timedelta(days=day)
+
+
+def date_to_day(d: date) -> int:
+    return (d - _EPOCH_DATE).days
+
+
+class AvailabilityTracker:
+    """Up/down seconds per check in UTC day buckets.
+
+    Time between two consecutive probes is credited to the status the check
+    held during it. Gaps longer than ``max_gap_s`` (the monitor was stopped or
+    stalled) are only credited up to ``max_gap_s``; the rest counts as no data
+    rather than up or down. Unknown status is never credited either way.
+    """
+
+    def __init__(self, max_gap_s: float = 300.0, retention_days: int = 400) -> None:
+        self.max_gap_us = int(max_gap_s * 1_000_000)
+        self.retention_days = retention_days
+        # check_id -> day -> [up_s, down_s]
+        self._days: dict[str, dict[int, list[float]]] = {}
+
+    def load(self, rows: Iterable[tuple[str, int, float, float]]) -> None:
+        for check_id, day, up_s, down_s in rows:
+            self._days.setdefault(check_id, {})[day] = [up_s, down_s]
+
+    def forget(self, check_id: str) -> None:
+        self._days.pop(check_id, None)
+
+    def accrue(
+        self,
+        check_id: str,
+        ok: bool | None,
+        start_us: int | None,
+        end_us: int,
+    ) -> list[tuple[int, float, float]]:
+        """Credit ``[start_us, end_us)`` to ``ok``; return touched ``(day, up_s, down_s)``."""
+        if ok is None or start_us is None or end_us <= start_us:
+            return []
+        end_us = min(end_us, start_us + self.max_gap_us)
+        slot = 0 if ok else 1
+        days = self._days.setdefault(check_id, {})
+        touched = []
+        cursor = start_us
+        while cursor < end_us:
+            day = day_of(cursor)
+            chunk_end = min(end_us, (day + 1) * DAY_US)
+            bucket = days.get(day)
+            if bucket is None:
+                bucket = days[day] = [0.0, 0.0]
+                self._trim(days, day)
+            bucket[slot] += (chunk_end - cursor) / 1_000_000
+            touched.append((day, bucket[0], bucket[1]))
+            cursor = chunk_end
+        return touched
+
+    def _trim(self, days: dict[int, list[float]], newest: int) -> None:
+        floor = newest - self.retention_days
+        for day in [d for d in days if d < floor]:
+            del days[day]
+
+    def availability(
+        self,
+        check_id: str,
+        first_day: int,
+        last_day: int,
+        now_us: int,
+    ) -> dict[str, Any]:
+        """Totals over UTC days ``first_day..last_day`` inclusive, O(buckets).
+
+        ``no_data_s`` is the part of the range (up to ``now_us``) with no
+        up/down credit: before the check existed, monitor downtime, unknown.
+        """
+        up = down = 0.0
+        for day, (up_s, down_s) in self._days.get(check_id, {}).items():
+            if first_day <= day <= last_day:
+                up += up_s
+                down += down_s
+        monitored = up + down
+        span_us = min((last_day + 1) * DAY_US, now_us) - first_day * DAY_US
+        return {
+            "up_s": round(up, 3),
+            "down_s": round(down, 3),
+            "monitored_s": round(monitored, 3),
+            "no_data_s": round(max(0.0, span_us / 1_000_000 - monitored), 3),
+            "availability": round(up / monitored, 6) if monitored else None,
+        }
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+class CircuitBreaker:
+    """Stops calls to a failing dependency (a sink, proxmox-stats).
+
+    ``failure_threshold`` consecutive failures open the circuit. After
+    ``reset_s`` one trial call is let through (half-open); it closes the
+    circuit on success and reopens it on failure.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_s = reset_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_s:
+                return "half_open"
+            return "open"
+
+    def retry_in(self) -> float:
+        """Seconds until a call may be attempted (0 when allowed now)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_s - self._clock())
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                # A failed half-open trial restarts the full reset period.
+                self._opened_at = self._clock()
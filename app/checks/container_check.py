@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from app.checks.results import CheckResult
+from app.ops_logic import is_fresh
+from app.state import PortainerCache
+
+
+def run_container(
+    cache: PortainerCache,
+    container: str,
+    endpoint: str | None,
+    poll_seconds: int,
+    now: datetime | None = None,
+) -> CheckResult | None:
+    """Resolve a container check against the Portainer cache.
+
+    Returns None when there is no fresh Portainer data to judge by; the
+    caller marks the check unknown. Results carry no latency: nothing was
+    probed.
+    """
+    if not is_fresh(cache.last_success_ts, poll_seconds=poll_seconds, now=now):
+        return None
+
+    matches = [
+        c
+        for c in cache.containers.get(container, ())
+        if endpoint is None or c["endpoint"] == endpoint
+    ]
+    if not matches:
+        environments = (cache.last_payload or {}).get("endpoints") or []
+        failed = [
+            f"{e['name']}: {e['error']}"
+            for e in environments
+            if e.get("error") and (endpoint is None or e.get("name") == endpoint)
+        ]
+        where = f" on {endpoint}" if endpoint else ""
+        error = f"container not found{where}"
+        if failed:
+            # Most likely on the environment that could not be listed.
+            error = f"{error} ({'; '.join(failed)})"
+        return CheckResult(ok=False, latency_ms=None, error=error)
+
+    # With several environments running the same name, any unhealthy copy
+    # fails the check.
+    for c in matches:
+        if c.get("state") != "running":
+            detail = c.get("status") or c.get("state")
+            return CheckResult(ok=False, latency_ms=None, error=f"{c['endpoint']}: {detail}")
+        if c.get("health") == "unhealthy":
+            return CheckResult(ok=False, latency_ms=None, error=f"{c['endpoint']}: unhealthy")
+    return CheckResult(ok=True, latency_ms=None)
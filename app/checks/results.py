@@ -6,6 +6,7 @@ from dataclasses import dataclass
 @dataclass
 class CheckResult:
     ok: bool
-    latency_ms: int
+    # None when nothing was probed (e.g. container checks).
+    latency_ms: int | None
     status_code: int | None = None
     error: str | None = None
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+import requests
+
+from app.config import settings
+
+# Keep-alive connections to Portainer across polls.
+_session = requests.Session()
+
+# Portainer environment types that expose the Docker API (1 = Docker,
+# 2 = Agent, 4 = Edge agent); Kubernetes environments are skipped.
+_DOCKER_ENDPOINT_TYPES = {1, 2, 4}
+# Portainer marks unreachable environments with Status 2.
+_ENDPOINT_DOWN = 2
+# "Up 3 hours (healthy)", "Up 5 seconds (health: starting)"
+_HEALTH_RE = re.compile(r"\((?:health: )?(healthy|unhealthy|starting)\)")
+
+
+def _health(status: str) -> str | None:
+    match = _HEALTH_RE.search(status or "")
+    return match.group(1) if match else None
+
+
+def _container_name(raw: dict[str, Any]) -> str:
+    names = raw.get("Names") or []
+    if names:
+        return str(names[0]).lstrip("/")
+    return str(raw.get("Id", ""))[:12]
+
+
+class PortainerClient:
+    """Lists every container on every Docker environment Portainer manages.
+
+    One poll costs one ``/api/endpoints`` request plus one container listing
+    per environment, however many container checks resolve against it. An
+    environment that fails is reported with its ``error`` and no containers;
+    the poll as a whole fails only when no environment could be listed.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        timeout_s: float | None = None,
+        session: requests.Session | None = None,
+    ) -> None:
+        self.base_url = base_url or settings.PORTAINER_BASE_URL
+        self.api_key = api_key or settings.PORTAINER_API_KEY
+        self.timeout_s = timeout_s or settings.PORTAINER_TIMEOUT_S
+        self._session = session or _session
+
+    def _get(self, path: str, **params: Any) -> Any:
+        resp = self._session.get(
+            f"{self.base_url.rstrip('/')}{path}",
+            params=params or None,
+            headers={"X-API-Key": self.api_key} if self.api_key else None,
+            timeout=self.timeout_s,
+        )
+        if resp.status_code >= 300:
+            raise RuntimeError(f"portainer returned HTTP {resp.status_code} for {path}")
+        return resp.json()
+
+    def fetch_containers(self) -> dict[str, Any]:
+        if not self.base_url:
+            return {"status": "unavailable", "error": "PORTAINER_BASE_URL is not configured"}
+
+        try:
+            endpoints = self._get("/api/endpoints")
+        except Exception as exc:
+            return {"status": "unavailable", "error": str(exc)}
+        if not isinstance(endpoints, list):
+            return {"status": "unavailable", "error": "portainer endpoints payload is not a list"}
+
+        listed: list[dict[str, Any]] = []
+        containers: list[dict[str, Any]] = []
+        for endpoint in endpoints:
+            if not isinstance(endpoint, dict):
+                continue
+            if endpoint.get("Type") not in _DOCKER_ENDPOINT_TYPES:
+                continue
+            entry: dict[str, Any] = {
+                "id": endpoint.get("Id"),
+                "name": endpoint.get("Name") or str(endpoint.get("Id")),
+                "containers": 0,
+                "error": None,
+            }
+            listed.append(entry)
+            if endpoint.get("Status") == _ENDPOINT_DOWN:
+                entry["error"] = "environment is down"
+                continue
+            try:
+                raw = self._get(
+                    f"/api/endpoints/{entry['id']}/docker/containers/json", all=1
+                )
+            except Exception as exc:
+                entry["error"] = str(exc)
+                continue
+            if not isinstance(raw, list):
+                entry["error"] = "containers payload is not a list"
+                continue
+            for item in raw:
+                if not isinstance(item, dict):
+                    continue
+                status = str(item.get("Status") or "")
+                containers.append(
+                    {
+                        "endpoint": entry["name"],
+                        "name": _container_name(item),
+                        "state": item.get("State"),
+                        "status": status,
+                        "health": _health(status),
+                        "image": item.get("Image"),
+                    }
+                )
+                entry["containers"] += 1
+
+        if listed and all(entry["error"] for entry in listed):
+            return {
+                "status": "unavailable",
+                "error": "; ".join(f"{e['name']}: {e['error']}" for e in listed),
+            }
+        return {"status": "ok", "endpoints": listed, "containers": containers}
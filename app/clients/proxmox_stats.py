@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 from urllib.parse import urlparse
 
 import requests
 
 from app.config import settings
 
+# Keep-alive connections to proxmox-stats across polls.
+_session = requests.Session()
+
+# Returned instead of a payload when proxmox-stats has nothing new; the
+# cache keeps its last payload (see ``apply_proxmox_fetch_result``).
+NOT_MODIFIED: dict = {"status": "not_modified"}
+
 
 def _build_summary_url(base_url: str) -> str:
     parsed = urlparse(base_url)
@@ -14,34 +22,85 @@ def _build_summary_url(base_url: str) -> str:
     return f"{base_url.rstrip('/')}/api/metrics/health-summary"
 
 
-def get_health_summary() -> dict:
-    base_url = settings.PROXMOX_STATS_BASE_URL
-    if not base_url:
-        return {
-            "status": "unavailable",
-            "error": "PROXMOX_STATS_BASE_URL is not configured",
-        }
-
-    try:
-        resp = requests.get(
-            _build_summary_url(base_url),
-            timeout=settings.PROXMOX_STATS_TIMEOUT_SECONDS,
-        )
-    except Exception as exc:
-        return {"status": "unavailable", "error": str(exc)}
-
-    if resp.status_code >= 400:
-        return {
-            "status": "unavailable",
-            "error": f"proxmox-stats returned HTTP {resp.status_code}",
-        }
-
-    try:
-        payload = resp.json()
-    except ValueError as exc:
-        return {"status": "unavailable", "error": f"invalid JSON: {exc}"}
-
-    if isinstance(payload, dict):
+class ProxmoxStatsClient:
+    """Fetches the health summary, skipping payloads that did not change.
+
+    Sends ``If-None-Match``/``If-Modified-Since`` when proxmox-stats returned
+    ``ETag``/``Last-Modified`` before. Upstreams without validators still
+    send the full body, so it is hashed and an identical one is reported as
+    ``NOT_MODIFIED`` without being parsed again. Failure payloads are never
+    remembered, so each one reaches the cache.
+    """
+
+    def __init__(self, session: requests.Session | None = None) -> None:
+        self._session = session or _session
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._body_hash: bytes | None = None
+
+    def _forget(self) -> None:
+        self._etag = self._last_modified = self._body_hash = None
+
+    def get_health_summary(self) -> dict:
+        base_url = settings.PROXMOX_STATS_BASE_URL
+        if not base_url:
+            return {
+                "status": "unavailable",
+                "error": "PROXMOX_STATS_BASE_URL is not configured",
+            }
+
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        try:
+            resp = self._session.get(
+                _build_summary_url(base_url),
+                headers=headers,
+                timeout=settings.PROXMOX_STATS_TIMEOUT_SECONDS,
+            )
+        except Exception as exc:
+            return {"status": "unavailable", "error": str(exc)}
+
+        if resp.status_code == 304 and self._body_hash is not None:
+            return NOT_MODIFIED
+        if resp.status_code >= 300:
+            # Includes a 304 we cannot serve from our side: start over.
+            self._forget()
+            return {
+                "status": "unavailable",
+                "error": f"proxmox-stats returned HTTP {resp.status_code}",
+            }
+
+        body_hash = hashlib.blake2b(resp.content, digest_size=16).digest()
+        if body_hash == self._body_hash:
+            return NOT_MODIFIED
+
+        try:
+            payload = resp.json()
+        except ValueError as exc:
+            self._forget()
+            return {"status": "unavailable", "error": f"invalid JSON: {exc}"}
+
+        if not isinstance(payload, dict):
+            self._forget()
+            return {
+                "status": "unknown",
+                "error": "proxmox-stats payload is not a JSON object",
+            }
+
+        if payload.get("error") or payload.get("status") == "unavailable":
+            # A repeated failure must be reported again, not as NOT_MODIFIED.
+            self._forget()
+            return payload
+
+        self._etag = resp.headers.get("ETag")
+        self._last_modified = resp.headers.get("Last-Modified")
+        self._body_hash = body_hash
         return payload
 
-    return {"status": "unknown", "error": "proxmox-stats payload is not a JSON object"}
+
+def get_health_summary(session: requests.Session | None = None) -> dict:
+    """One-off fetch; always returns the full payload (or an error)."""
+    return ProxmoxStatsClient(session).get_health_summary()
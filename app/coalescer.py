@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from app.state import now_us
+
+COALESCER_THREAD_NAME = "ops-monitor-coalesce"
+
+# Event name -> notifier send_* kind.
+EVENT_KINDS = {
+    "DOWN": "down",
+    "UP": "up",
+    "DEGRADED": "degraded",
+    "RECOVERED": "recovered",
+    "FLAPPING": "flapping",
+}
+# Digest priority follows the most severe kind it contains.
+_SEVERITY = ("down", "flapping", "degraded", "recovered", "up")
+
+
+def event_kind(event: dict[str, Any]) -> str | None:
+    if event["event"] == "STABLE":
+        return "up" if event.get("ok") else "down"
+    return EVENT_KINDS.get(event["event"])
+
+
+@dataclass
+class _Pending:
+    check_id: str
+    due_us: int
+    events: list[str] = field(default_factory=list)
+    kind: str = "up"
+    title: str = ""
+    message: str = ""
+    first_ts: str = ""
+    sinks: frozenset[str] | None = None
+
+
+class NotificationCoalescer:
+    """Merges notifications from a short window into one digest.
+
+    Transitions are held for ``window_s`` and then sent together, so a mass
+    outage costs one or two posts instead of one per check. Per check, a
+    repeat of the last notified kind is dropped, and a check notified less
+    than ``cooldown_s`` ago waits until its cooldown ends; events that arrive
+    meanwhile are merged. Checks in ``core_ids`` bypass both and are sent
+    immediately.
+
+    ``target`` is a notifier, ``NotificationDispatcher`` or
+    ``NotificationFanout``. With ``route`` (``NotificationFanout.route``),
+    checks are grouped by the sinks they go to and each group gets its own
+    digest, so a sink never sees checks it is not routed for.
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        window_s: float = 15.0,
+        cooldown_s: float = 60.0,
+        core_ids: Iterable[str] = (),
+        route: Callable[[str, Iterable[str]], frozenset[str]] | None = None,
+    ) -> None:
+        self._target = target
+        self._route = route
+        self.window_us = int(window_s * 1_000_000)
+        self.cooldown_us = int(cooldown_s * 1_000_000)
+        self.core_ids = frozenset(core_ids)
+        self._cond = threading.Condition()
+        self._pending: dict[str, _Pending] = {}
+        self._last_sent: dict[str, tuple[str, int]] = {}
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self.posts = 0
+        self.suppressed = 0
+
+    def submit(
+        self,
+        event: dict[str, Any],
+        title: str,
+        message: str,
+        tags: Iterable[str] = (),
+    ) -> None:
+        kind = event_kind(event)
+        if kind is None:
+            return
+        check_id = event["id"]
+        sinks = self._route(check_id, tags) if self._route is not None else None
+        now = now_us()
+        with self._cond:
+            pending = self._pending.get(check_id)
+            last = self._last_sent.get(check_id)
+            if pending is None and last is not None and last[0] == kind:
+                self.suppressed += 1
+                return
+
+            if check_id in self.core_ids:
+                self._pending.pop(check_id, None)
+                self._last_sent[check_id] = (kind, now)
+                self.posts += 1
+                send = getattr(self._target, f"send_{kind}")
+            else:
+                send = None
+                if pending is None:
+                    due = now + self.window_us
+                    if last is not None:
+                        due = max(due, last[1] + self.cooldown_us)
+                    pending = self._pending[check_id] = _Pending(
+                        check_id=check_id, due_us=due, first_ts=event["ts"], sinks=sinks
+                    )
+                pending.events.append(event["event"])
+                pending.kind = kind
+                pending.title = title
+                pending.message = message
+                self._cond.notify()
+        if send is not None:
+            self._send(send, title, message, sinks)
+
+    def flush(self, force: bool = False) -> int:
+        """Send everything due (or all pending with ``force``); return posts made."""
+        now = now_us()
+        groups: dict[frozenset[str] | None, list[_Pending]] = {}
+        with self._cond:
+            for p in list(self._pending.values()):
+                if not force and p.due_us > now:
+                    continue
+                del self._pending[p.check_id]
+                self._last_sent[p.check_id] = (p.kind, now)
+                groups.setdefault(p.sinks, []).append(p)
+            self.posts += len(groups)
+        for sinks, items in groups.items():
+            kind, title, message = self._render(items)
+            self._send(getattr(self._target, f"send_{kind}"), title, message, sinks)
+        return len(groups)
+
+    @staticmethod
+    def _send(
+        send: Callable[..., None], title: str, message: str, sinks: frozenset[str] | None
+    ) -> None:
+        if sinks is None:
+            send(title=title, message=message)
+        elif sinks:
+            send(title=title, message=message, sinks=sinks)
+
+    @staticmethod
+    def _render(items: list[_Pending]) -> tuple[str, str, str]:
+        if len(items) == 1 and len(items[0].events) == 1:
+            p = items[0]
+            return p.kind, p.title, p.message
+
+        kind = min((p.kind for p in items), key=_SEVERITY.index)
+        counts: dict[str, int] = {}
+        for p in items:
+            counts[p.events[-1]] = counts.get(p.events[-1], 0) + 1
+        summary = ", ".join(f"{n} {name}" for name, n in sorted(counts.items()))
+        title = f"[DIGEST] {len(items)} checks: {summary}"
+        lines = [
+            f"{' -> '.join(p.events)}  {p.check_id}  ({p.first_ts})"
+            for p in sorted(items, key=lambda p: (_SEVERITY.index(p.kind), p.check_id))
+        ]
+        return kind, title, "\n".join(lines)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "posts": self.posts,
+                "suppressed": self.suppressed,
+            }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=COALESCER_THREAD_NAME, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the flush thread and send whatever is still pending."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush(force=True)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                if self._pending:
+                    next_due = min(p.due_us for p in self._pending.values())
+                    wait_s = max(0.0, (next_due - now_us()) / 1_000_000)
+                else:
+                    wait_s = None
+                self._cond.wait(wait_s)
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                # A failing target must never kill the flush thread.
+                continue
@@ -24,7 +24,31 @@ class Settings:
         for check_id in os.getenv("OPS_CORE_CHECK_IDS", "").split(",")
         if check_id.strip()
     )
+    OPS_INCIDENT_WINDOW_S: float = float(os.getenv("OPS_INCIDENT_WINDOW_S", "120"))
+    # Transitions within this many seconds go out as one digest (0 disables).
+    OPS_NOTIFY_COALESCE_S: float = float(os.getenv("OPS_NOTIFY_COALESCE_S", "15"))
+    OPS_NOTIFY_COOLDOWN_S: float = float(os.getenv("OPS_NOTIFY_COOLDOWN_S", "60"))
+    OPS_PROFILER_ENABLED: bool = os.getenv("OPS_PROFILER_ENABLED", "").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
     MONITOR_INTERVAL: int = int(os.getenv("MONITOR_INTERVAL", 30))
+    # Probe gaps longer than this count as "no data" in availability.
+    OPS_AVAILABILITY_MAX_GAP_S: float = float(
+        os.getenv("OPS_AVAILABILITY_MAX_GAP_S") or max(120, 4 * MONITOR_INTERVAL)
+    )
+    # proxmox-stats is polled by its own thread, independent of probe cycles.
+    PROXMOX_STATS_INTERVAL_S: int = int(
+        os.getenv("PROXMOX_STATS_INTERVAL_S") or MONITOR_INTERVAL
+    )
+    PROXMOX_STATS_BACKOFF_MAX_S: float = float(
+        os.getenv("PROXMOX_STATS_BACKOFF_MAX_S", "300")
+    )
+    # Portainer container state is pulled in bulk by its own thread too.
+    PORTAINER_INTERVAL_S: int = int(os.getenv("PORTAINER_INTERVAL_S") or MONITOR_INTERVAL)
+    PORTAINER_TIMEOUT_S: float = float(os.getenv("PORTAINER_TIMEOUT_S", "5"))
+    PORTAINER_BACKOFF_MAX_S: float = float(os.getenv("PORTAINER_BACKOFF_MAX_S", "300"))
     OPSMONITOR_DB_PATH: str = os.getenv(
         "OPSMONITOR_DB_PATH", "/opt/ops-monitor/data/ops-monitor.sqlite3"
     )
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from app.breaker import CircuitBreaker
+from app.metrics import metrics
+from app.persistence import SQLitePersistence
+from app.state import now_us
+from app.timing import timings
+
+logger = logging.getLogger(__name__)
+
+DISPATCHER_THREAD_NAME = "ops-monitor-notify"
+KINDS = ("down", "up", "degraded", "recovered", "flapping")
+
+
+@dataclass
+class OutboxItem:
+    kind: str
+    title: str
+    message: str
+    created_us: int
+    attempts: int = 0
+    row_id: int | None = None
+
+
+class NotificationDispatcher:
+    """Delivers notifications from a queue on its own worker thread.
+
+    Exposes the notifier's ``send_*`` methods, which only enqueue, so the
+    runner can use it in place of the notifier. Items are written to the
+    SQLite outbox before they are queued and removed once delivered, so
+    pending notifications survive a restart. Failed sends are retried in
+    order with exponential backoff and dropped after ``max_attempts``.
+
+    One dispatcher serves one sink; its outbox rows are tagged with ``sink``.
+    With a ``breaker``, deliveries pause while the circuit is open instead of
+    hammering a sink that keeps failing.
+    """
+
+    def __init__(
+        self,
+        notifier: Any,
+        outbox: SQLitePersistence | None = None,
+        max_attempts: int = 8,
+        backoff_base_s: float = 1.0,
+        backoff_max_s: float = 60.0,
+        sink: str = "ntfy",
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self._notifier = notifier
+        self._outbox = outbox
+        self.sink = sink
+        self.breaker = breaker
+        self.max_attempts = max_attempts
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self._queue: queue.Queue[OutboxItem] = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._in_flight = 0
+        self.delivered = 0
+        self.dropped = 0
+
+        if outbox is not None:
+            for row in outbox.load_outbox(sink=sink):
+                self._queue.put(
+                    OutboxItem(
+                        kind=row["kind"],
+                        title=row["title"],
+                        message=row["message"],
+                        created_us=row["created_us"],
+                        attempts=row["attempts"],
+                        row_id=row["id"],
+                    )
+                )
+        self._report_depth()
+
+    def send_down(self, title: str, message: str) -> None:
+        self.enqueue("down", title, message)
+
+    def send_up(self, title: str, message: str) -> None:
+        self.enqueue("up", title, message)
+
+    def send_degraded(self, title: str, message: str) -> None:
+        self.enqueue("degraded", title, message)
+
+    def send_recovered(self, title: str, message: str) -> None:
+        self.enqueue("recovered", title, message)
+
+    def send_flapping(self, title: str, message: str) -> None:
+        self.enqueue("flapping", title, message)
+
+    def enqueue(self, kind: str, title: str, message: str) -> None:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown notification kind: {kind}")
+        item = OutboxItem(kind=kind, title=title, message=message, created_us=now_us())
+        if self._outbox is not None:
+            item.row_id = self._outbox.add_outbox_item(
+                item.created_us, kind, title, message, sink=self.sink
+            )
+        self._queue.put(item)
+        self._report_depth()
+
+    def depth(self) -> int:
+        """Notifications not yet delivered, including one being sent."""
+        return self._queue.qsize() + self._in_flight
+
+    def stats(self) -> dict[str, Any]:
+        out: dict[str, Any] = {
+            "queue_depth": self.depth(),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+        if self.breaker is not None:
+            out["circuit"] = self.breaker.state
+        return out
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"{DISPATCHER_THREAD_NAME}-{self.sink}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker; undelivered items stay in the outbox."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def process_pending(self) -> None:
+        """Deliver everything queued on the calling thread (no worker needed)."""
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._deliver(item)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._deliver(item)
+
+    def _report_depth(self) -> None:
+        metrics.set_notifier_backlog(self.sink, self.depth())
+
+    def _deliver(self, item: OutboxItem) -> None:
+        self._in_flight = 1
+        try:
+            self._deliver_with_retry(item)
+        finally:
+            self._in_flight = 0
+            self._report_depth()
+
+    def _deliver_with_retry(self, item: OutboxItem) -> None:
+        send = getattr(self._notifier, f"send_{item.kind}")
+        while True:
+            if self.breaker is not None:
+                wait_s = self.breaker.retry_in()
+                if wait_s > 0:
+                    if self._stop.wait(wait_s):
+                        return
+                    continue
+            try:
+                with timings.time("notifier.send"):
+                    send(title=item.title, message=item.message)
+            except Exception as exc:
+                self._record_breaker(ok=False)
+                item.attempts += 1
+                if item.attempts >= self.max_attempts:
+                    logger.warning(
+                        "Dropping notification %r after %d attempts: %s",
+                        item.title,
+                        item.attempts,
+                        exc,
+                    )
+                    metrics.observe_notification(self.sink, "dropped")
+                    self.dropped += 1
+                    self._forget(item)
+                    return
+                metrics.observe_notification(self.sink, "error")
+                if self._outbox is not None and item.row_id is not None:
+                    self._outbox.update_outbox_attempts(item.row_id, item.attempts)
+                delay = min(
+                    self.backoff_max_s, self.backoff_base_s * 2 ** (item.attempts - 1)
+                )
+                if self._stop.wait(delay):
+                    # Shutting down; the outbox row is retried on next start.
+                    return
+                continue
+
+            self._record_breaker(ok=True)
+            latency_s = (now_us() - item.created_us) / 1_000_000
+            timings.record("notifier.delivery_latency", latency_s)
+            metrics.observe_notification(self.sink, "ok", delivery_s=latency_s)
+            self.delivered += 1
+            self._forget(item)
+            return
+
+    def _record_breaker(self, ok: bool) -> None:
+        if self.breaker is None:
+            return
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        metrics.set_notifier_circuit(self.sink, self.breaker.state == "open")
+
+    def _forget(self, item: OutboxItem) -> None:
+        if self._outbox is not None and item.row_id is not None:
+            self._outbox.delete_outbox_item(item.row_id)
+
+
+@dataclass(frozen=True)
+class SinkRoute:
+    """Which checks a sink receives; no ``checks`` and no ``tags`` means all."""
+
+    name: str
+    checks: frozenset[str] = frozenset()
+    tags: frozenset[str] = frozenset()
+
+    def matches(self, check_id: str, tags: Iterable[str]) -> bool:
+        if not self.checks and not self.tags:
+            return True
+        return check_id in self.checks or not self.tags.isdisjoint(tags)
+
+
+class NotificationFanout:
+    """Sends each notification to every routed sink through its own dispatcher.
+
+    Every sink has its own queue, worker thread, retries and circuit breaker,
+    so a slow or failing sink never delays delivery to the others.
+    ``send_*`` take an optional ``sinks`` set from ``route``; ``None`` means
+    every sink.
+    """
+
+    def __init__(
+        self,
+        dispatchers: dict[str, NotificationDispatcher],
+        routes: Iterable[SinkRoute] = (),
+    ) -> None:
+        self.dispatchers = dispatchers
+        self.routes = {route.name: route for route in routes}
+
+    def route(self, check_id: str, tags: Iterable[str] = ()) -> frozenset[str]:
+        tags = tuple(tags)
+        return frozenset(
+            name
+            for name in self.dispatchers
+            if name not in self.routes or self.routes[name].matches(check_id, tags)
+        )
+
+    def send_down(self, title: str, message: str, sinks: Iterable[str] | None = None) -> None:
+        self.enqueue("down", title, message, sinks)
+
+    def send_up(self, title: str, message: str, sinks: Iterable[str] | None = None) -> None:
+        self.enqueue("up", title, message, sinks)
+
+    def send_degraded(
+        self, title: str, message: str, sinks: Iterable[str] | None = None
+    ) -> None:
+        self.enqueue("degraded", title, message, sinks)
+
+    def send_recovered(
+        self, title: str, message: str, sinks: Iterable[str] | None = None
+    ) -> None:
+        self.enqueue("recovered", title, message, sinks)
+
+    def send_flapping(
+        self, title: str, message: str, sinks: Iterable[str] | None = None
+    ) -> None:
+        self.enqueue("flapping", title, message, sinks)
+
+    def enqueue(
+        self, kind: str, title: str, message: str, sinks: Iterable[str] | None = None
+    ) -> None:
+        names = self.dispatchers.keys() if sinks is None else set(sinks)
+        for name, dispatcher in self.dispatchers.items():
+            if name in names:
+                dispatcher.enqueue(kind, title, message)
+
+    def depth(self) -> int:
+        return sum(d.depth() for d in self.dispatchers.values())
+
+    def stats(self) -> dict[str, Any]:
+        per_sink = {name: d.stats() for name, d in self.dispatchers.items()}
+        return {
+            "queue_depth": sum(s["queue_depth"] for s in per_sink.values()),
+            "delivered": sum(s["delivered"] for s in per_sink.values()),
+            "dropped": sum(s["dropped"] for s in per_sink.values()),
+            "sinks": per_sink,
+        }
+
+    def start(self) -> None:
+        for dispatcher in self.dispatchers.values():
+            dispatcher.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        for dispatcher in self.dispatchers.values():
+            dispatcher._stop.set()
+        for dispatcher in self.dispatchers.values():
+            dispatcher.stop(timeout)
+
+    def process_pending(self) -> None:
+        for dispatcher in self.dispatchers.values():
+            dispatcher.process_pending()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Callable
+
+from fastapi import Response
+
+try:  # Optional: noticeably faster encoding for large check tables.
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def json_bytes_response(body: bytes) -> Response:
+    """Return pre-encoded JSON, bypassing response_model validation.
+
+    Only use with payloads that already match the route's response model;
+    the OpenAPI schema still comes from ``response_model``.
+    """
+    return Response(content=body, media_type="application/json")
+
+
+class EncodedCache:
+    """Encoded JSON for the latest version of a payload.
+
+    ``get`` re-encodes only when ``version`` differs from the cached one, so
+    repeated reads of an unchanged snapshot cost a tuple lookup.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cached: tuple[str | None, bytes] = (None, b"")
+
+    def get(self, version: str, build: Callable[[], Any]) -> bytes:
+        cached_version, body = self._cached
+        if cached_version == version:
+            return body
+        with self._lock:
+            cached_version, body = self._cached
+            if cached_version != version:
+                body = dumps(build())
+                self._cached = (version, body)
+            return body
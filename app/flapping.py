@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+
+@dataclass(frozen=True)
+class FlapSettings:
+    """Per-check flap detection, from the ``flap`` block in checks.yml."""
+
+    enabled: bool = True
+    window: int = 10
+    high_threshold: float = 0.5
+    low_threshold: float = 0.25
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any] | None) -> FlapSettings:
+        if not data:
+            return cls()
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass(slots=True)
+class FlapTracker:
+    """Exponentially weighted rate of state transitions per probe.
+
+    ``rate`` approaches 1.0 for a check that changes state on every probe.
+    The smoothing factor follows ``window`` (``2 / (window + 1)``), so recent
+    probes weigh more than old ones. Hysteresis between the high and low
+    thresholds keeps the FLAPPING state itself from flapping.
+    """
+
+    rate: float = 0.0
+    samples: int = 0
+    flapping: bool = False
+    since_us: int | None = None
+    transitions: int = 0
+
+    def record(self, changed: bool, ts_us: int, cfg: FlapSettings) -> str | None:
+        """Feed one probe; return ``FLAPPING`` or ``STABLE`` on edges."""
+        alpha = 2.0 / (cfg.window + 1)
+        self.rate += alpha * ((1.0 if changed else 0.0) - self.rate)
+        self.samples += 1
+        if changed and self.flapping:
+            self.transitions += 1
+
+        if not self.flapping:
+            if self.samples >= cfg.window and self.rate >= cfg.high_threshold:
+                self.flapping = True
+                self.since_us = ts_us
+                self.transitions = 1 if changed else 0
+                return "FLAPPING"
+            return None
+        if self.rate < cfg.low_threshold:
+            self.flapping = False
+            return "STABLE"
+        return None
+
+    def resume(self, cfg: FlapSettings, since_us: int | None) -> None:
+        """Continue a FLAPPING state restored from persistence."""
+        self.flapping = True
+        self.rate = cfg.high_threshold
+        self.samples = cfg.window
+        self.since_us = since_us
@@ -3,28 +3,34 @@ from __future__ import annotations
 from typing import Any, Dict
 
 
+def check_target(check: Dict[str, Any]) -> str:
+    if check["type"] == "http":
+        return check["url"]
+    if check["type"] == "container":
+        where = f" on {check['endpoint']}" if check.get("endpoint") else ""
+        return f"container {check['container']}{where}"
+    return f"{check['host']}:{check['port']}"
+
+
 def format_transition(
     event: Dict[str, Any], check: Dict[str, Any], state: Dict[str, Any]
 ) -> tuple[str, str]:
     # Title
-    status = event["event"]  # "UP" or "DOWN"
+    status = event["event"]  # UP/DOWN, DEGRADED/RECOVERED or FLAPPING/STABLE
     title = f"[{status}] {check['id']}"
 
-    # Target
-    if check["type"] == "http":
-        target = check["url"]
-    else:
-        target = f"{check['host']}:{check['port']}"
-
     # Body
     lines = [
         f"Check: {check['id']} ({check['type']})",
-        f"Target: {target}",
-        f"Latency: {state.get('latency_ms')} ms",
+        f"Target: {check_target(check)}",
     ]
+    if state.get("latency_ms") is not None:
+        lines.append(f"Latency: {state['latency_ms']} ms")
     if state.get("status_code") is not None:
         lines.append(f"HTTP: {state.get('status_code')}")
     if state.get("error"):
         lines.append(f"Error: {state['error']}")
+    if event.get("detail"):
+        lines.append(event["detail"])
     lines.append(f"Time: {event['ts']}")
     return title, "\n".join(lines)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Awaitable, Callable, Mapping
+
+ASGIApp = Callable[..., Awaitable[None]]
+
+
+def make_etag(*parts: str) -> str:
+    """Strong ETag from version parts (generation numbers, query string)."""
+    digest = hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=8)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2).
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ConditionalGetMiddleware:
+    """Answer conditional GETs with 304 before the endpoint runs.
+
+    ``sources`` maps a request path to a zero-argument callable returning a
+    cheap version string for that resource (for example a store generation).
+    Matching requests never reach the endpoint or response model validation.
+    """
+
+    def __init__(self, app: ASGIApp, sources: Mapping[str, Callable[[], str]]) -> None:
+        self.app = app
+        self.sources = sources
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["method"] not in {"GET", "HEAD"}:
+            await self.app(scope, receive, send)
+            return
+
+        source = self.sources.get(scope["path"])
+        if source is None:
+            await self.app(scope, receive, send)
+            return
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        etag = make_etag(source(), query)
+        etag_header = (b"etag", etag.encode("latin-1"))
+        cache_header = (b"cache-control", b"no-cache")
+
+        if_none_match = None
+        for name, value in scope.get("headers", []):
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        if etag_matches(if_none_match, etag):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [etag_header, cache_header],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = list(message.get("headers", []))
+                headers.extend([etag_header, cache_header])
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
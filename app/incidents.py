@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from app.ops_logic import serialize_ts
+
+# Checks going DOWN are attributed to the same incident when they share a tag
+# or dependency parent with it and arrive within this many seconds of its
+# latest DOWN.
+DEFAULT_WINDOW_S = 120.0
+_MAX_RECENT = 200
+
+
+def _ts(us: int | None) -> str | None:
+    if us is None:
+        return None
+    return serialize_ts(datetime.fromtimestamp(us / 1_000_000, tz=timezone.utc))
+
+
+def correlation_keys(
+    check_id: str, tags: Iterable[str], depends_on: str | None
+) -> frozenset[str]:
+    """Keys two checks must share to be correlated.
+
+    A check's own id is a ``dep:`` key so that a parent going down joins the
+    incident of its dependents (and vice versa).
+    """
+    keys = {f"tag:{tag}" for tag in tags}
+    keys.add(f"dep:{check_id}")
+    if depends_on:
+        keys.add(f"dep:{depends_on}")
+    return frozenset(keys)
+
+
+@dataclass
+class Incident:
+    id: int
+    started_us: int
+    last_down_us: int
+    ended_us: int | None = None
+    # check_id -> [down_us, up_us | None]
+    checks: dict[str, list[int | None]] = field(default_factory=dict)
+    keys: set[str] = field(default_factory=set)
+
+    @property
+    def open(self) -> bool:
+        return self.ended_us is None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": "open" if self.open else "resolved",
+            "started_at": _ts(self.started_us),
+            "ended_at": _ts(self.ended_us),
+            "duration_s": (
+                round((self.ended_us - self.started_us) / 1_000_000, 3)
+                if self.ended_us is not None
+                else None
+            ),
+            "affected": [
+                {
+                    "id": check_id,
+                    "down_at": _ts(down_us),
+                    "up_at": _ts(up_us),
+                }
+                for check_id, (down_us, up_us) in self.checks.items()
+            ],
+            "keys": sorted(self.keys),
+        }
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> Incident:
+        return cls(
+            id=record["id"],
+            started_us=record["started_us"],
+            last_down_us=record["last_down_us"],
+            ended_us=record["ended_us"],
+            checks={cid: list(span) for cid, span in record["checks"].items()},
+            keys=set(record["keys"]),
+        )
+
+    def to_record(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "started_us": self.started_us,
+            "last_down_us": self.last_down_us,
+            "ended_us": self.ended_us,
+            "checks": self.checks,
+            "keys": sorted(self.keys),
+        }
+
+
+class IncidentTracker:
+    """Groups DOWN/UP transitions into incidents as they arrive.
+
+    Each call touches only the open incidents, so the cost does not depend
+    on event history.
+    """
+
+    def __init__(self, window_s: float = DEFAULT_WINDOW_S) -> None:
+        self.window_us = int(window_s * 1_000_000)
+        self._open: dict[int, Incident] = {}
+        self._recent: deque[Incident] = deque(maxlen=_MAX_RECENT)
+        self._next_id = 1
+
+    def load(self, incidents: Iterable[Incident]) -> None:
+        """Restore incidents, oldest first."""
+        for incident in incidents:
+            self._recent.append(incident)
+            if incident.open:
+                self._open[incident.id] = incident
+            self._next_id = max(self._next_id, incident.id + 1)
+
+    def on_down(self, check_id: str, ts_us: int, keys: frozenset[str]) -> Incident:
+        target = None
+        for incident in self._open.values():
+            if check_id in incident.checks:
+                target = incident
+                break
+            if ts_us - incident.last_down_us <= self.window_us and keys & incident.keys:
+                target = incident
+                break
+        if target is None:
+            target = Incident(id=self._next_id, started_us=ts_us, last_down_us=ts_us)
+            self._next_id += 1
+            self._open[target.id] = target
+            self._recent.append(target)
+        target.last_down_us = max(target.last_down_us, ts_us)
+        span = target.checks.get(check_id)
+        if span is None:
+            target.checks[check_id] = [ts_us, None]
+        else:
+            # Down again before the incident closed: keep the first down time.
+            span[1] = None
+        target.keys |= keys
+        return target
+
+    def on_up(self, check_id: str, ts_us: int) -> Incident | None:
+        for incident in self._open.values():
+            span = incident.checks.get(check_id)
+            if span is None or span[1] is not None:
+                continue
+            span[1] = ts_us
+            if all(up is not None for _, up in incident.checks.values()):
+                incident.ended_us = ts_us
+                del self._open[incident.id]
+            return incident
+        return None
+
+    def forget_check(self, check_id: str, ts_us: int) -> Incident | None:
+        """A removed check can no longer recover; close its span."""
+        return self.on_up(check_id, ts_us)
+
+    def get(self, incident_id: int) -> Incident | None:
+        for incident in self._recent:
+            if incident.id == incident_id:
+                return incident
+        return self._open.get(incident_id)
+
+    def recent(self, limit: int, status: str = "all") -> list[dict[str, Any]]:
+        """Newest first; ``status`` is ``open``, ``resolved`` or ``all``."""
+        out = []
+        for incident in reversed(self._recent):
+            if status == "open" and not incident.open:
+                continue
+            if status == "resolved" and incident.open:
+                continue
+            out.append(incident.to_dict())
+            if len(out) >= limit:
+                break
+        return out
+
+    def overlapping(self, start_us: int) -> list[dict[str, Any]]:
+        """Incidents open at or after ``start_us``, oldest first."""
+        return [
+            incident.to_dict()
+            for incident in self._recent
+            if incident.ended_us is None or incident.ended_us >= start_us
+        ]
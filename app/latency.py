@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any
+
+# Log-scale buckets with four sub-buckets per power of two (~19% wide, so
+# reported percentiles are within ~10% of the true value). Bucket 0 holds
+# 0ms; the last bucket absorbs everything above ~2^17 ms.
+_SUB_BUCKETS = 4
+BUCKET_COUNT = 1 + 17 * _SUB_BUCKETS + 1
+
+# name -> (slot width in seconds, number of slots)
+WINDOWS: dict[str, tuple[int, int]] = {
+    "5m": (60, 5),
+    "1h": (600, 6),
+    "24h": (3600, 24),
+}
+MAX_WINDOW_S = max(width * slots for width, slots in WINDOWS.values())
+PERCENTILES = (50, 90, 99)
+
+
+def bucket_index(latency_ms: int) -> int:
+    if latency_ms <= 0:
+        return 0
+    idx = 1 + int(math.log2(latency_ms) * _SUB_BUCKETS)
+    return min(idx, BUCKET_COUNT - 1)
+
+
+def bucket_value(idx: int) -> float:
+    """Representative latency (geometric midpoint) of a bucket, in ms."""
+    if idx == 0:
+        return 0.0
+    lo = 2 ** ((idx - 1) / _SUB_BUCKETS)
+    hi = 2 ** (idx / _SUB_BUCKETS)
+    return round(math.sqrt(lo * hi), 1)
+
+
+class SlidingHistogram:
+    """Ring of per-slot bucket counts covering ``width_s * slots`` seconds.
+
+    A check's latencies cluster in a few buckets, so each slot is a sparse
+    ``array("I")`` of ``bucket, count`` pairs, allocated on first write. A
+    sample is a short scan of that array plus one increment (or clearing a
+    stale slot when the ring advances).
+    """
+
+    __slots__ = ("width_s", "epochs", "counts")
+
+    def __init__(self, width_s: int, slots: int) -> None:
+        self.width_s = width_s
+        self.epochs = array("q", [-1]) * slots
+        self.counts: list[array | None] = [None] * slots
+
+    def record(self, latency_ms: int, ts_s: float) -> None:
+        epoch = int(ts_s // self.width_s)
+        pos = epoch % len(self.epochs)
+        slot = self.counts[pos]
+        if self.epochs[pos] != epoch or slot is None:
+            if self.epochs[pos] > epoch:
+                # Older than the ring covers; drop it.
+                return
+            self.epochs[pos] = epoch
+            slot = self.counts[pos] = array("I")
+        idx = bucket_index(latency_ms)
+        for i in range(0, len(slot), 2):
+            if slot[i] == idx:
+                slot[i + 1] += 1
+                return
+        slot.extend((idx, 1))
+
+    def merged(self, now_s: float) -> list[int]:
+        newest = int(now_s // self.width_s)
+        oldest = newest - len(self.epochs) + 1
+        out = [0] * BUCKET_COUNT
+        for epoch, slot in zip(self.epochs, self.counts):
+            if slot and oldest <= epoch <= newest:
+                for i in range(0, len(slot), 2):
+                    out[slot[i]] += slot[i + 1]
+        return out
+
+
+def percentiles(counts: list[int]) -> dict[str, Any]:
+    total = sum(counts)
+    out: dict[str, Any] = {"count": total}
+    targets = [(p, max(1, math.ceil(p / 100 * total))) for p in PERCENTILES]
+    seen = 0
+    t = 0
+    for idx, c in enumerate(counts):
+        if not c:
+            continue
+        seen += c
+        while t < len(targets) and seen >= targets[t][1]:
+            out[f"p{targets[t][0]}_ms"] = bucket_value(idx)
+            t += 1
+    for p, _ in targets[t:]:
+        out[f"p{p}_ms"] = None
+    return out
+
+
+class CheckLatencyHistograms:
+    """One ``SlidingHistogram`` per window in ``WINDOWS`` for a single check."""
+
+    __slots__ = ("windows",)
+
+    def __init__(self) -> None:
+        self.windows = {
+            name: SlidingHistogram(width, slots) for name, (width, slots) in WINDOWS.items()
+        }
+
+    def record(self, latency_ms: int, ts_s: float) -> None:
+        for hist in self.windows.values():
+            hist.record(latency_ms, ts_s)
+
+    def summary(self, now_s: float) -> dict[str, dict[str, Any]]:
+        return {name: percentiles(h.merged(now_s)) for name, h in self.windows.items()}
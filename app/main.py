@@ -1,36 +1,60 @@
+import asyncio
 import logging
 import json
 from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 from app.api_schemas import (
     AlertTestResponse,
+    AvailabilityResponse,
+    CheckLatencyResponse,
     CheckStateResponse,
     ConfigResponse,
     HealthResponse,
+    IncidentResponse,
     OpsHealthResponse,
+    OpsSelfResponse,
     OpsSummaryResponse,
+    ProxmoxIssuesResponse,
     ReportGenerateRequest,
     ReportGenerateResponse,
     ReportRangeInfo,
     ReportSourcesInfo,
     RegistryNormalizedResponse,
+    StatusChecksDeltaResponse,
     StatusEventResponse,
     StatusSummaryResponse,
+    TagSummaryResponse,
 )
+from app.availability import date_to_day
+from app.formatting import check_target
+from app.fastjson import EncodedCache, dumps, json_bytes_response
+from app.http_cache import ConditionalGetMiddleware
 from app.clients.ollama_client import OllamaClientError, generate_json_report
 from app.notifier import NtfyConfig, NtfyNotifier
 from app.models import Registry
 from app.ops_logic import (
-    compute_overall_status,
     is_fresh,
     serialize_ts,
-    summarize_checks,
     utcnow_iso,
 )
-from app.state import StateStore
-from app.runner import loop_forever
+from app.state import StateStore, now_us
+from app.streaming import StreamBroker, encode_sse
+from app.timing import timings
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics
+from app.materialized import OpsSummaryView, ops_summary_version
+from app.profiler import (
+    MAX_DURATION_S,
+    RUNNER_THREAD_NAME,
+    ProfilerBusyError,
+    sample_threads,
+)
+from app.portainer_poller import PortainerPoller
+from app.proxmox_poller import ProxmoxPoller
+from app.runner import build_coalescer, build_dispatcher, loop_forever
 from app.config import settings
 from app.registry import apply_defaults, load_registry
 from app.reporting import (
@@ -48,18 +72,63 @@ from app.reporting import (
 import threading
 
 logger = logging.getLogger(__name__)
-store = StateStore(db_path=settings.OPSMONITOR_DB_PATH)
+store = StateStore(
+    db_path=settings.OPSMONITOR_DB_PATH,
+    availability_max_gap_s=settings.OPS_AVAILABILITY_MAX_GAP_S,
+    incident_window_s=settings.OPS_INCIDENT_WINDOW_S,
+)
+stream_broker = StreamBroker()
+ops_summary_view = OpsSummaryView()
+_checks_body = EncodedCache()
+_summary_body = EncodedCache()
+store.add_listener(stream_broker.publish)
+store.add_listener(metrics.observe_store_change)
+
+STREAM_KEEPALIVE_S = 15.0
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI):
+async def lifespan(app: FastAPI):
+    dispatcher = build_dispatcher(store)
+    notifier = build_coalescer(dispatcher)
+    app.state.notification_dispatcher = dispatcher
+    app.state.notification_coalescer = notifier if notifier is not dispatcher else None
     t = threading.Thread(
         target=loop_forever,
         args=(store, settings.MONITOR_INTERVAL),
+        kwargs={
+            "after_cycle": lambda: ops_summary_view.refresh(store),
+            "notifier": notifier,
+        },
+        name=RUNNER_THREAD_NAME,
         daemon=True,
     )
     t.start()
+    proxmox_poller = ProxmoxPoller(
+        store,
+        interval_s=settings.PROXMOX_STATS_INTERVAL_S,
+        backoff_max_s=settings.PROXMOX_STATS_BACKOFF_MAX_S,
+    )
+    proxmox_poller.start()
+    app.state.proxmox_poller = proxmox_poller
+    portainer_poller = None
+    if settings.PORTAINER_BASE_URL:
+        portainer_poller = PortainerPoller(
+            store,
+            interval_s=settings.PORTAINER_INTERVAL_S,
+            backoff_max_s=settings.PORTAINER_BACKOFF_MAX_S,
+        )
+        portainer_poller.start()
+    app.state.portainer_poller = portainer_poller
     yield
+    store.flush()
+    proxmox_poller.stop()
+    if portainer_poller is not None:
+        portainer_poller.stop()
+    if notifier is not dispatcher:
+        notifier.stop()
+    if dispatcher is not None:
+        dispatcher.stop()
 
 
 app = FastAPI(
@@ -67,12 +136,39 @@ app = FastAPI(
     version="1.0.0",
     description=(
         "Service checks monitor that loads checks from checks.yml, "
-        "runs HTTP/TCP probes, and exposes current status and event history."
+        "runs HTTP/TCP probes and Portainer container checks, and exposes current status and event history."
     ),
     lifespan=lifespan,
 )
 
 
+def _checks_version() -> str:
+    return f"{store.instance_id}:{store.generation}"
+
+
+def _events_version() -> str:
+    # Proxmox issue events change the log without publishing a check snapshot.
+    return f"{store.instance_id}:{store.events_generation}"
+
+
+def _ops_summary_version() -> str:
+    return ops_summary_version(store)
+
+
+# Status payloads only change when the store publishes a new generation, so
+# conditional polls are answered with 304 before the endpoint runs.
+app.add_middleware(
+    ConditionalGetMiddleware,
+    sources={
+        "/api/status/checks": _checks_version,
+        "/api/status/summary": _checks_version,
+        "/api/status/events": _events_version,
+        "/api/status/tags": _checks_version,
+        "/api/ops/summary": _ops_summary_version,
+    },
+)
+
+
 @app.get(
     "/health",
     response_model=HealthResponse,
@@ -99,6 +195,22 @@ def config():
     }
 
 
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    tags=["system"],
+    summary="Prometheus Metrics",
+    description="Prometheus text exposition for per-check state and runner internals.",
+)
+def prometheus_metrics():
+    last_fetch_ts = store.proxmox_stats_snapshot().last_fetch_ts
+    age_s = None
+    if last_fetch_ts is not None:
+        age_s = max(0.0, (datetime.now(timezone.utc) - last_fetch_ts).total_seconds())
+    metrics.set_proxmox_cache_age(age_s)
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get(
     "/api/registry/raw",
     response_model=Registry,
@@ -108,7 +220,12 @@ def config():
 )
 def registry_raw():
     reg = load_registry()
-    return reg.model_dump()
+    data = reg.model_dump()
+    for sink in data["sinks"]:
+        # Webhook headers usually carry credentials.
+        if "headers" in sink:
+            sink["headers"] = {k: "***" for k in sink["headers"]}
+    return data
 
 
 @app.get(
@@ -127,15 +244,95 @@ def registry_normalized():
     }
 
 
+def _split_csv(value: str | None) -> list[str] | None:
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+CHECK_STATE_FIELDS = tuple(CheckStateResponse.model_fields)
+
+
+def _project(views: dict[str, dict], fields: list[str]) -> dict[str, dict]:
+    return {
+        check_id: {name: view[name] for name in fields}
+        for check_id, view in views.items()
+    }
+
+
 @app.get(
     "/api/status/checks",
-    response_model=dict[str, CheckStateResponse],
+    response_model=dict[str, CheckStateResponse] | StatusChecksDeltaResponse,
     tags=["status"],
     summary="Current Check States",
-    description="Latest known state per check id.",
+    description=(
+        "Latest known state per check id. With `since`, returns only checks "
+        "changed after that generation plus removed ids. `ids`/`tag` filter and "
+        "`fields` projects the returned states."
+    ),
 )
-def status_checks():
-    return store.snapshot()
+def status_checks(
+    since: int | None = Query(
+        default=None,
+        ge=0,
+        description="Generation from a previous delta response; 0 forces a full resync",
+    ),
+    fields: str | None = Query(
+        default=None,
+        description="Comma-separated state fields to return (`id` is always included)",
+    ),
+    ids: str | None = Query(
+        default=None,
+        description="Comma-separated check ids to return",
+    ),
+    tag: str | None = Query(
+        default=None,
+        description="Comma-separated tags; returns checks carrying any of them",
+    ),
+):
+    field_list = _split_csv(fields)
+    if field_list is not None:
+        unknown = [name for name in field_list if name not in CHECK_STATE_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}",
+            )
+        field_list = ["id"] + [name for name in dict.fromkeys(field_list) if name != "id"]
+    id_list = _split_csv(ids)
+    tag_list = _split_csv(tag)
+    filtered = id_list is not None or tag_list is not None
+
+    if since is None:
+        if not filtered and field_list is None:
+            # Check views are produced by CheckState.to_dict and already match
+            # CheckStateResponse, so they are encoded directly.
+            body = _checks_body.get(
+                _checks_version(), lambda: dict(store.published().checks)
+            )
+            return json_bytes_response(body)
+        views = store.select_checks(ids=id_list, tags=tag_list)
+        if field_list is not None:
+            views = _project(views, field_list)
+        return json_bytes_response(dumps(views))
+
+    delta = store.changes_since(since)
+    if filtered:
+        wanted = store.tag_members(tag_list) if tag_list is not None else None
+        if id_list is not None:
+            wanted = set(id_list) if wanted is None else wanted & set(id_list)
+        delta["changed"] = {
+            cid: view for cid, view in delta["changed"].items() if cid in wanted
+        }
+        if id_list is not None:
+            delta["removed"] = [cid for cid in delta["removed"] if cid in wanted]
+    if field_list is not None:
+        delta["changed"] = _project(delta["changed"], field_list)
+    return json_bytes_response(dumps(delta))
+
+
+def status_summary() -> dict:
+    return store.summary()
 
 
 @app.get(
@@ -144,9 +341,91 @@ def status_checks():
     tags=["status"],
     summary="Status Summary",
     description="Aggregate counts and list of currently down checks.",
+    operation_id="status_summary_api_status_summary_get",
 )
-def status_summary():
-    return store.summary()
+def status_summary_route():
+    return json_bytes_response(_summary_body.get(_checks_version(), store.summary))
+
+
+@app.get(
+    "/api/status/tags",
+    response_model=dict[str, TagSummaryResponse],
+    tags=["status"],
+    summary="Tag Aggregates",
+    description=(
+        "Per-tag up/down/unknown counts, worst status and p95 of the latest "
+        "latency across each tag's checks."
+    ),
+)
+def status_tags():
+    return store.tag_summaries()
+
+
+@app.get(
+    "/api/status/checks/{check_id}/latency",
+    response_model=CheckLatencyResponse,
+    tags=["status"],
+    summary="Check Latency Percentiles",
+    description=(
+        "p50/p90/p99 latency for one check over sliding 5m, 1h and 24h "
+        "windows, from log-bucketed histograms (about 10% resolution)."
+    ),
+)
+def status_check_latency(check_id: str):
+    try:
+        windows = store.latency_percentiles(check_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown check_id: {check_id}")
+    state = store.published().checks.get(check_id) or {}
+    return {
+        "id": check_id,
+        "timestamp": utcnow_iso(),
+        "latency_ms": state.get("latency_ms"),
+        "windows": windows,
+    }
+
+
+@app.get(
+    "/api/status/availability",
+    response_model=AvailabilityResponse,
+    tags=["status"],
+    summary="Check Availability",
+    description=(
+        "Up/down time and availability per check over the last `days` UTC days "
+        "(including today) or an explicit `start`..`end` date range, from "
+        "incrementally maintained day buckets."
+    ),
+)
+def status_availability(
+    days: int = Query(30, ge=1, le=400, description="Range length when start is not given"),
+    start: date | None = Query(None, description="First UTC day (YYYY-MM-DD)"),
+    end: date | None = Query(None, description="Last UTC day, default today"),
+    ids: str | None = Query(None, description="Comma-separated check ids"),
+):
+    today = datetime.now(timezone.utc).date()
+    end_date = end or today
+    start_date = start or (end_date - timedelta(days=days - 1))
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    first_day, last_day = date_to_day(start_date), date_to_day(end_date)
+    id_list = _split_csv(ids)
+    checks = {}
+    for check_id in store.select_checks(ids=id_list):
+        try:
+            checks[check_id] = store.availability(check_id, first_day, last_day)
+        except KeyError:
+            continue
+    return {
+        "timestamp": utcnow_iso(),
+        "start": start_date.isoformat(),
+        "end": end_date.isoformat(),
+        "checks": checks,
+    }
+
+
+def status_events(limit: int = 50) -> list[dict]:
+    return store.events(limit=limit)
 
 
 @app.get(
@@ -154,132 +433,270 @@ def status_summary():
     response_model=list[StatusEventResponse],
     tags=["status"],
     summary="Recent Status Events",
-    description="Recent INIT/UP/DOWN events, newest first.",
+    description="Recent INIT/UP/DOWN and DEGRADED/RECOVERED events, newest first.",
+    operation_id="status_events_api_status_events_get",
 )
-def status_events(
+def status_events_route(
     limit: int = Query(default=50, ge=1, le=500, description="Max number of events to return")
 ):
-    return store.events(limit=limit)
+    return json_bytes_response(dumps(store.events(limit=limit)))
 
 
 @app.get(
-    "/api/ops/summary",
-    response_model=OpsSummaryResponse,
-    tags=["ops"],
-    summary="Unified Ops Summary",
-    description="Unified control-plane summary for checks, proxmox status, and recent events.",
+    "/api/status/stream",
+    response_class=StreamingResponse,
+    tags=["status"],
+    summary="Status Change Stream",
+    description=(
+        "Server-Sent Events stream of `transition` events and per-check `state` "
+        "deltas. Reconnect with `Last-Event-ID` to resume; a `resync` event means "
+        "the client must refetch `/api/status/checks?since=0`."
+    ),
 )
-def ops_summary():
-    checks = store.snapshot()
-    up, down, down_list, core_down, non_core_down = summarize_checks(
-        check_results=checks,
-        core_check_ids=set(settings.OPS_CORE_CHECK_IDS),
-    )
+async def status_stream(
+    request: Request,
+    last_event_id: str | None = Header(default=None),
+):
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+
+    broker = stream_broker
+    sub, backlog = broker.subscribe(asyncio.get_running_loop(), resume_from)
 
-    proxmox_cache = store.proxmox_stats_snapshot()
-    proxmox_payload = proxmox_cache.last_payload if isinstance(proxmox_cache.last_payload, dict) else {}
-    proxmox_status = proxmox_payload.get("status")
-    if proxmox_status not in {"ok", "warn", "crit", "unknown", "unavailable"}:
-        proxmox_status = "unknown"
-
-    issues = proxmox_payload.get("issues")
-    if not isinstance(issues, list):
-        issues = []
-    issues = [issue for issue in issues if isinstance(issue, dict)]
-
-    overall = compute_overall_status(
-        core_down=core_down,
-        non_core_down=non_core_down,
-        proxmox_status=proxmox_status,
+    async def events():
+        try:
+            yield b"retry: 3000\n\n"
+            if backlog is None:
+                yield encode_sse(
+                    broker.current_id(),
+                    "resync",
+                    {"generation": store.generation},
+                )
+            else:
+                for msg in backlog:
+                    yield msg.payload
+
+            while True:
+                try:
+                    msg = await asyncio.wait_for(sub.get(), timeout=STREAM_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": keepalive\n\n"
+                    continue
+                if msg is None:
+                    # Buffer overflowed; the client reconnects and resumes.
+                    yield b"event: dropped\ndata: {}\n\n"
+                    break
+                yield msg.payload
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    recent_events = [
-        {"ts": event["ts"], "id": event["id"], "event": event["event"]}
-        for event in store.events(limit=20)
-    ]
 
-    return {
-        "timestamp": utcnow_iso(),
-        "overall": overall,
-        "services": {
-            "up": up,
-            "down": down,
-            "down_list": down_list,
-        },
-        "proxmox": {
-            "status": proxmox_status,
-            "issues": issues,
-            "last_fetch_ts": serialize_ts(proxmox_cache.last_fetch_ts),
-            "last_error": proxmox_cache.last_error,
-        },
-        "docker": {
-            "status": "unknown",
-            "note": "portainer checks not enabled",
-        },
-        "recent_events": recent_events,
-    }
+def ops_summary() -> dict:
+    """Materialized ops summary payload (shared; treat as read-only)."""
+    payload, _ = ops_summary_view.current(store)
+    return payload
 
 
 @app.get(
-    "/api/ops/health",
-    response_model=OpsHealthResponse,
+    "/api/ops/summary",
+    response_model=OpsSummaryResponse,
     tags=["ops"],
-    summary="Control-Plane Dependency Health",
-    description="Dependency reachability from cached poll/check state only.",
+    summary="Unified Ops Summary",
+    description="Unified control-plane summary for checks, proxmox status, and recent events.",
+    operation_id="ops_summary_api_ops_summary_get",
 )
-def ops_health():
-    proxmox_cache = store.proxmox_stats_snapshot()
-    proxmox_last_fetch_ts = serialize_ts(proxmox_cache.last_fetch_ts)
-    proxmox_fresh = is_fresh(
-        last_fetch_ts=proxmox_cache.last_fetch_ts,
-        poll_seconds=settings.MONITOR_INTERVAL,
-    )
+def ops_summary_route():
+    # Bytes are validated against OpsSummaryResponse when materialized.
+    _, body = ops_summary_view.current(store)
+    return json_bytes_response(body)
+
+
+def _poll_dependency_status(cache, poll_seconds: int, label: str) -> dict:
+    """Status of a background-polled dependency from its cache (no I/O)."""
+    last_fetch_ts = serialize_ts(cache.last_fetch_ts)
+    fresh = is_fresh(last_fetch_ts=cache.last_fetch_ts, poll_seconds=poll_seconds)
 
-    if proxmox_cache.last_fetch_ts is None:
-        proxmox_status = {
+    if cache.last_fetch_ts is None:
+        return {
             "status": "unknown",
             "last_fetch_ts": None,
-            "last_error": proxmox_cache.last_error,
-            "note": "proxmox-stats not polled yet",
+            "last_error": cache.last_error,
+            "note": f"{label} not polled yet",
         }
-    elif proxmox_fresh and proxmox_cache.last_error is None:
-        proxmox_status = {
+    if fresh and cache.last_error is None:
+        return {
             "status": "ok",
-            "last_fetch_ts": proxmox_last_fetch_ts,
+            "last_fetch_ts": last_fetch_ts,
             "last_error": None,
             "note": None,
         }
-    elif proxmox_fresh:
-        proxmox_status = {
+    if fresh:
+        return {
             "status": "unavailable",
-            "last_fetch_ts": proxmox_last_fetch_ts,
-            "last_error": proxmox_cache.last_error,
+            "last_fetch_ts": last_fetch_ts,
+            "last_error": cache.last_error,
             "note": None,
         }
+    return {
+        "status": "unknown",
+        "last_fetch_ts": last_fetch_ts,
+        "last_error": cache.last_error,
+        "note": f"stale {label} poll data",
+    }
+
+
+@app.get(
+    "/api/ops/health",
+    response_model=OpsHealthResponse,
+    tags=["ops"],
+    summary="Control-Plane Dependency Health",
+    description="Dependency reachability from cached poll/check state only.",
+)
+def ops_health():
+    if settings.PORTAINER_BASE_URL:
+        portainer_status = _poll_dependency_status(
+            store.portainer_snapshot(), settings.PORTAINER_INTERVAL_S, "portainer"
+        )
     else:
-        proxmox_status = {
-            "status": "unknown",
-            "last_fetch_ts": proxmox_last_fetch_ts,
-            "last_error": proxmox_cache.last_error,
-            "note": "stale proxmox-stats poll data",
-        }
+        portainer_status = {"status": "unknown", "note": "portainer not configured"}
 
     return {
         "timestamp": utcnow_iso(),
         "dependencies": {
-            "proxmox_stats": proxmox_status,
+            "proxmox_stats": _poll_dependency_status(
+                store.proxmox_stats_snapshot(),
+                settings.PROXMOX_STATS_INTERVAL_S,
+                "proxmox-stats",
+            ),
             "ntfy": {
                 "status": "unknown",
                 "note": "ntfy checks not enabled",
             },
-            "portainer": {
-                "status": "unknown",
-                "note": "portainer checks not enabled",
-            },
+            "portainer": portainer_status,
         },
     }
 
 
+@app.get(
+    "/api/ops/self",
+    response_model=OpsSelfResponse,
+    tags=["ops"],
+    summary="Monitor Self-Instrumentation",
+    description=(
+        "Rolling timings for each runner phase, state store lock waits and "
+        "persistence calls, SQLite read pool wait times, notification "
+        "queue depth and proxmox-stats/Portainer poller state."
+    ),
+)
+def ops_self():
+    dispatcher = getattr(app.state, "notification_dispatcher", None)
+    coalescer = getattr(app.state, "notification_coalescer", None)
+    proxmox_poller = getattr(app.state, "proxmox_poller", None)
+    portainer_poller = getattr(app.state, "portainer_poller", None)
+    return {
+        "timestamp": utcnow_iso(),
+        "timings": timings.snapshot(),
+        "sqlite_read_pool": store.read_pool_stats(),
+        "notifier": (dispatcher.stats() if dispatcher is not None else None),
+        "coalescer": (coalescer.stats() if coalescer is not None else None),
+        "proxmox_poller": (
+            proxmox_poller.stats() if proxmox_poller is not None else None
+        ),
+        "portainer_poller": (
+            portainer_poller.stats() if portainer_poller is not None else None
+        ),
+    }
+
+
+@app.post(
+    "/api/ops/profile",
+    tags=["ops"],
+    summary="Sample Monitor Threads",
+    description=(
+        "Runs an in-process sampling profiler over the runner and API worker "
+        "threads for the requested duration and returns collapsed stacks "
+        "(flamegraph.pl input) or speedscope JSON. Disabled unless "
+        "OPS_PROFILER_ENABLED is set; one session at a time."
+    ),
+    responses={
+        200: {"content": {"text/plain": {}, "application/json": {}}},
+        403: {"description": "Profiler disabled"},
+        409: {"description": "Another profiling session is running"},
+    },
+)
+def ops_profile(
+    seconds: float = Query(5.0, gt=0, le=MAX_DURATION_S, description="Sampling duration"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Sampling interval"),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+    target: str = Query("all", pattern="^(all|runner)$", description="Threads to sample"),
+):
+    if not settings.OPS_PROFILER_ENABLED:
+        raise HTTPException(status_code=403, detail="Profiler disabled (set OPS_PROFILER_ENABLED)")
+    try:
+        profile = sample_threads(seconds, interval_ms / 1000.0, target=target)
+    except ProfilerBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    if format == "speedscope":
+        return json_bytes_response(dumps(profile.speedscope()))
+    return PlainTextResponse(profile.collapsed())
+
+
+@app.get(
+    "/api/ops/proxmox/issues",
+    response_model=ProxmoxIssuesResponse,
+    tags=["ops"],
+    summary="Proxmox Issue History",
+    description=(
+        "Open proxmox-stats issues and when they appeared or resolved, "
+        "diffed between polls. Newest changes first."
+    ),
+)
+def proxmox_issues(limit: int = Query(50, ge=1, le=200)):
+    return store.proxmox_issues(limit=limit)
+
+
+@app.get(
+    "/api/incidents",
+    response_model=list[IncidentResponse],
+    tags=["incidents"],
+    summary="Recent Incidents",
+    description=(
+        "DOWN transitions grouped into incidents: checks that go down within "
+        "OPS_INCIDENT_WINDOW_S of each other and share a tag or dependency "
+        "parent. Newest first."
+    ),
+)
+def incidents_list(
+    status: str = Query("all", pattern="^(all|open|resolved)$"),
+    limit: int = Query(50, ge=1, le=200),
+):
+    return store.incidents(limit=limit, status=status)
+
+
+@app.get(
+    "/api/incidents/{incident_id}",
+    response_model=IncidentResponse,
+    tags=["incidents"],
+    summary="Incident Detail",
+    description="One incident with its affected checks.",
+)
+def incident_detail(incident_id: int):
+    incident = store.incident(incident_id)
+    if incident is None:
+        raise HTTPException(status_code=404, detail=f"Unknown incident: {incident_id}")
+    return incident
+
+
 @app.post(
     "/api/alerts/test",
     response_model=AlertTestResponse,
@@ -305,7 +722,7 @@ def alerts_test(
     if check is None:
         raise HTTPException(status_code=404, detail=f"Unknown check_id: {check_id}")
 
-    target = check["url"] if check["type"] == "http" else f"{check['host']}:{check['port']}"
+    target = check_target(check)
     title = f"[TEST] {check_id}"
     message = (
         "This is a test notification from ops-monitor.\n"
@@ -330,12 +747,14 @@ def reports_generate(request: ReportGenerateRequest) -> ReportGenerateResponse:
     ops_summary_payload = ops_summary()
     status_summary_payload = status_summary()
     events_payload = status_events(limit=REPORT_EVENTS_LIMIT)
+    incidents_payload = store.incidents_since(now_us() - request.range_minutes * 60_000_000)
     proxmox_payload = proxmox_payload_from_cache(proxmox_cache=store.proxmox_stats_snapshot())
 
     facts = build_facts_payload(
         ops_summary_payload=ops_summary_payload,
         status_summary_payload=status_summary_payload,
         events_payload=events_payload,
+        incidents_payload=incidents_payload,
         proxmox_payload=proxmox_payload,
         generated_at=generated_at,
         range_minutes=request.range_minutes,
@@ -379,6 +798,7 @@ def reports_generate(request: ReportGenerateRequest) -> ReportGenerateResponse:
                 "status_summary_included": True,
                 "events_limit": REPORT_EVENTS_LIMIT,
                 "proxmox_included": True,
+                "incidents_count": len(incidents_payload),
             }
             markdown = render_report_markdown(
                 report_data=report_data,
@@ -407,6 +827,7 @@ def reports_generate(request: ReportGenerateRequest) -> ReportGenerateResponse:
         "status_summary_included": True,
         "events_limit": REPORT_EVENTS_LIMIT,
         "proxmox_included": True,
+        "incidents_count": len(incidents_payload),
     }
 
     model_output = ollama_payload.get("response")
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from app.api_schemas import OpsSummaryResponse
+from app.config import settings
+from app.ops_logic import (
+    compute_overall_status,
+    is_fresh,
+    serialize_ts,
+    split_down_by_core,
+    utcnow_iso,
+)
+from app.state import StateStore
+
+OPS_RECENT_EVENTS = 20
+
+
+def ops_summary_version(store: StateStore) -> str:
+    """Cheap version string; changes whenever the ops summary could change."""
+    core_ids = ",".join(sorted(settings.OPS_CORE_CHECK_IDS))
+    # Portainer data goes stale without any update, which changes the docker
+    # section, so its freshness is part of the version.
+    docker = "-"
+    if settings.PORTAINER_BASE_URL:
+        fresh = is_fresh(
+            store.portainer_last_success_ts,
+            poll_seconds=settings.PORTAINER_INTERVAL_S,
+        )
+        docker = "fresh" if fresh else "stale"
+    return (
+        f"{store.instance_id}:{store.generation}:"
+        f"{store.proxmox_generation}:{store.portainer_generation}:{docker}:{core_ids}"
+    )
+
+
+def build_docker_summary(store: StateStore) -> dict[str, Any]:
+    """Container overview from the Portainer cache and container check states."""
+    if not settings.PORTAINER_BASE_URL:
+        return {"status": "unknown", "note": "portainer not configured"}
+
+    cache = store.portainer_snapshot()
+    summary: dict[str, Any] = {
+        "last_fetch_ts": serialize_ts(cache.last_fetch_ts),
+        "last_error": cache.last_error,
+    }
+    if cache.last_payload is None:
+        if cache.last_error is None:
+            return {**summary, "status": "unknown", "note": "portainer not polled yet"}
+        return {**summary, "status": "unavailable"}
+    if not is_fresh(cache.last_success_ts, poll_seconds=settings.PORTAINER_INTERVAL_S):
+        return {**summary, "status": "unknown", "note": "stale portainer data"}
+
+    containers = cache.last_payload.get("containers") or []
+    environments = cache.last_payload.get("endpoints") or []
+    failed_endpoints = [
+        f"{e['name']}: {e['error']}" for e in environments if e.get("error")
+    ]
+    unhealthy = [
+        f"{c['endpoint']}/{c['name']}" for c in containers if c.get("health") == "unhealthy"
+    ]
+    snapshot = store.published()
+    down_checks = [
+        check_id
+        for check_id in snapshot.aggregates.down_ids
+        if snapshot.checks.get(check_id, {}).get("type") == "container"
+    ]
+    if cache.last_error is not None:
+        # The latest poll failed; counts are from the previous good one.
+        status = "unavailable"
+    elif unhealthy or down_checks or failed_endpoints:
+        status = "warn"
+    else:
+        status = "ok"
+    return {
+        **summary,
+        "status": status,
+        "endpoints": len(environments),
+        "failed_endpoints": failed_endpoints,
+        "containers_total": len(containers),
+        "containers_running": sum(1 for c in containers if c.get("state") == "running"),
+        "unhealthy": unhealthy,
+        "down_checks": down_checks,
+    }
+
+
+def build_ops_summary(store: StateStore) -> dict[str, Any]:
+    aggregates = store.published().aggregates
+    down_list = list(aggregates.down_ids)
+    core_down, non_core_down = split_down_by_core(
+        down_ids=down_list,
+        core_check_ids=set(settings.OPS_CORE_CHECK_IDS),
+    )
+
+    proxmox_cache = store.proxmox_stats_snapshot()
+    proxmox_payload = (
+        proxmox_cache.last_payload if isinstance(proxmox_cache.last_payload, dict) else {}
+    )
+    proxmox_status = proxmox_payload.get("status")
+    if proxmox_status not in {"ok", "warn", "crit", "unknown", "unavailable"}:
+        proxmox_status = "unknown"
+
+    issues = proxmox_payload.get("issues")
+    if not isinstance(issues, list):
+        issues = []
+    issues = [issue for issue in issues if isinstance(issue, dict)]
+
+    overall = compute_overall_status(
+        core_down=core_down,
+        non_core_down=non_core_down,
+        proxmox_status=proxmox_status,
+    )
+
+    recent_events = [
+        {"ts": event["ts"], "id": event["id"], "event": event["event"]}
+        for event in store.events(limit=OPS_RECENT_EVENTS)
+    ]
+
+    return {
+        "timestamp": utcnow_iso(),
+        "overall": overall,
+        "services": {
+            "up": aggregates.up,
+            "down": aggregates.down,
+            "down_list": down_list,
+        },
+        "proxmox": {
+            "status": proxmox_status,
+            "issues": issues,
+            "last_fetch_ts": serialize_ts(proxmox_cache.last_fetch_ts),
+            "last_error": proxmox_cache.last_error,
+        },
+        "docker": build_docker_summary(store),
+        "recent_events": recent_events,
+    }
+
+
+class OpsSummaryView:
+    """Ops summary materialized once per store/proxmox/Portainer change.
+
+    The runner refreshes it after every cycle; requests in between reuse the
+    same payload and its pre-validated JSON bytes. A request that observes a
+    newer version than the cached one rebuilds it once.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (version, payload, body) swapped as one reference for lock-free reads.
+        self._cached: tuple[str | None, dict[str, Any], bytes] = (None, {}, b"")
+
+    def current(self, store: StateStore) -> tuple[dict[str, Any], bytes]:
+        """Return the shared (read-only) payload dict and its JSON bytes."""
+        version = ops_summary_version(store)
+        cached_version, payload, body = self._cached
+        if version == cached_version:
+            return payload, body
+        with self._lock:
+            cached_version, payload, body = self._cached
+            if version != cached_version:
+                payload = build_ops_summary(store)
+                body = (
+                    OpsSummaryResponse.model_validate(payload)
+                    .model_dump_json()
+                    .encode("utf-8")
+                )
+                self._cached = (version, payload, body)
+            return payload, body
+
+    def refresh(self, store: StateStore) -> None:
+        self.current(store)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Iterable
+
+LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CYCLE_BUCKETS_S = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SQLITE_BUCKETS_S = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+DELIVERY_BUCKETS_S = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Family:
+    """One metric family with cached per-series text.
+
+    Changing a series only invalidates that series' lines and the family's
+    joined text, so a scrape re-renders just what changed since the last one.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()) -> None:
+        self.name = name
+        self.labels = tuple(labels)
+        self._header = f"# HELP {name} {help_text}\n# TYPE {name} {self.kind}\n"
+        self._series: dict[tuple[str, ...], Any] = {}
+        self._lines: dict[tuple[str, ...], str | None] = {}
+        self._text: str | None = None
+
+    def _touch(self, key: tuple[str, ...]) -> None:
+        self._lines[key] = None
+        self._text = None
+
+    def remove(self, *label_values: str) -> None:
+        key = tuple(label_values)
+        if key in self._series:
+            del self._series[key]
+            del self._lines[key]
+            self._text = None
+
+    def _render_series(self, key: tuple[str, ...], value: Any) -> str:
+        return f"{self.name}{_label_text(self.labels, key)} {_format_value(value)}\n"
+
+    def render(self) -> str:
+        if self._text is None:
+            for key, line in self._lines.items():
+                if line is None:
+                    self._lines[key] = self._render_series(key, self._series[key])
+            self._text = self._header + "".join(self._lines.values())  # type: ignore[arg-type]
+        return self._text
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        key = tuple(label_values)
+        self._series[key] = self._series.get(key, 0.0) + amount
+        self._touch(key)
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def set(self, *label_values: str, value: float) -> None:
+        key = tuple(label_values)
+        if self._series.get(key) == value and key in self._lines:
+            return
+        self._series[key] = value
+        self._touch(key)
+
+
+class Histogram(_Family):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_S,
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, *label_values: str, value: float) -> None:
+        key = tuple(label_values)
+        state = self._series.get(key)
+        if state is None:
+            # [per-bucket counts..., sum, count]
+            state = [0] * len(self.buckets) + [0.0, 0]
+            self._series[key] = state
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        state[-2] += value
+        state[-1] += 1
+        self._touch(key)
+
+    def _render_series(self, key: tuple[str, ...], state: list[Any]) -> str:
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, state):
+            cumulative += n
+            labels = _label_text(self.labels, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}\n")
+        labels = _label_text(self.labels, key, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{labels} {state[-1]}\n")
+        plain = _label_text(self.labels, key)
+        lines.append(f"{self.name}_sum{plain} {_format_value(state[-2])}\n")
+        lines.append(f"{self.name}_count{plain} {state[-1]}\n")
+        return "".join(lines)
+
+
+class MonitorMetrics:
+    """Prometheus metric families for checks and the monitor itself."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.check_up = Gauge(
+            "ops_monitor_check_up",
+            "1 if the check is up, 0 if down, NaN if unknown.",
+            ("check", "type"),
+        )
+        self.check_fail_count = Gauge(
+            "ops_monitor_check_fail_count",
+            "Consecutive failed probes for the check.",
+            ("check",),
+        )
+        self.check_latency = Histogram(
+            "ops_monitor_check_latency_seconds",
+            "Probe latency per check.",
+            ("check",),
+            buckets=LATENCY_BUCKETS_S,
+        )
+        self.check_transitions = Counter(
+            "ops_monitor_check_transitions_total",
+            "State transition events per check.",
+            ("check", "event"),
+        )
+        self.proxmox_cache_age = Gauge(
+            "ops_monitor_proxmox_cache_age_seconds",
+            "Seconds since the last proxmox-stats poll (NaN if never polled).",
+        )
+        self.cycle_duration = Histogram(
+            "ops_monitor_cycle_duration_seconds",
+            "Duration of a full runner cycle.",
+            buckets=CYCLE_BUCKETS_S,
+        )
+        self.probe_queue_depth = Gauge(
+            "ops_monitor_probe_queue_depth",
+            "Probes still pending in the current runner cycle.",
+        )
+        self.sqlite_write = Histogram(
+            "ops_monitor_sqlite_write_seconds",
+            "Latency of SQLite writes (commit included).",
+            ("op",),
+            buckets=SQLITE_BUCKETS_S,
+        )
+        self.notifier_backlog = Gauge(
+            "ops_monitor_notifier_backlog",
+            "Notifications waiting to be delivered, per sink.",
+            ("sink",),
+        )
+        self.notifier_delivery = Histogram(
+            "ops_monitor_notifier_delivery_seconds",
+            "Time from enqueueing a notification to its successful delivery.",
+            ("sink",),
+            buckets=DELIVERY_BUCKETS_S,
+        )
+        self.notifier_attempts = Counter(
+            "ops_monitor_notifier_attempts_total",
+            "Notification delivery attempts by result (ok, error, dropped).",
+            ("sink", "result"),
+        )
+        self.notifier_circuit_open = Gauge(
+            "ops_monitor_notifier_circuit_open",
+            "1 while a sink's circuit breaker is open and deliveries are paused.",
+            ("sink",),
+        )
+        self._families: tuple[_Family, ...] = (
+            self.check_up,
+            self.check_fail_count,
+            self.check_latency,
+            self.check_transitions,
+            self.proxmox_cache_age,
+            self.cycle_duration,
+            self.probe_queue_depth,
+            self.sqlite_write,
+            self.notifier_backlog,
+            self.notifier_delivery,
+            self.notifier_attempts,
+            self.notifier_circuit_open,
+        )
+
+    def observe_store_change(self, kind: str, data: dict[str, Any]) -> None:
+        """``StateStore`` listener keeping per-check series in sync."""
+        with self._lock:
+            if kind == "transition":
+                self.check_transitions.inc(data["id"], data["event"])
+                return
+            if kind != "state":
+                return
+            check_id = data["id"]
+            state = data["state"]
+            if state is None:
+                for family in (self.check_up, self.check_fail_count, self.check_transitions):
+                    for key in [k for k in family._series if k[0] == check_id]:
+                        family.remove(*key)
+                self.check_latency.remove(check_id)
+                return
+            ok = state["ok"]
+            up = math.nan if ok is None else (1.0 if ok else 0.0)
+            self.check_up.set(check_id, state["type"], value=up)
+            self.check_fail_count.set(check_id, value=state["fail_count"])
+
+    def observe_probe(self, check_id: str, latency_ms: int) -> None:
+        with self._lock:
+            self.check_latency.observe(check_id, value=latency_ms / 1000)
+
+    def observe_cycle(self, duration_s: float) -> None:
+        with self._lock:
+            self.cycle_duration.observe(value=duration_s)
+
+    def set_probe_queue_depth(self, depth: int) -> None:
+        with self._lock:
+            self.probe_queue_depth.set(value=depth)
+
+    def observe_sqlite_write(self, op: str, duration_s: float) -> None:
+        with self._lock:
+            self.sqlite_write.observe(op, value=duration_s)
+
+    def set_notifier_backlog(self, sink: str, backlog: int) -> None:
+        with self._lock:
+            self.notifier_backlog.set(sink, value=backlog)
+
+    def observe_notification(
+        self, sink: str, result: str, delivery_s: float | None = None
+    ) -> None:
+        with self._lock:
+            self.notifier_attempts.inc(sink, result)
+            if delivery_s is not None:
+                self.notifier_delivery.observe(sink, value=delivery_s)
+
+    def set_notifier_circuit(self, sink: str, open_: bool) -> None:
+        with self._lock:
+            self.notifier_circuit_open.set(sink, value=1.0 if open_ else 0.0)
+
+    def set_proxmox_cache_age(self, age_s: float | None) -> None:
+        with self._lock:
+            self.proxmox_cache_age.set(value=math.nan if age_s is None else age_s)
+
+    def render(self) -> str:
+        with self._lock:
+            return "".join(family.render() for family in self._families)
+
+
+metrics = MonitorMetrics()
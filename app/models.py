@@ -3,12 +3,30 @@ from __future__ import annotations
 from typing import Literal, Optional, List, Dict
 from pydantic import BaseModel, Field, AnyHttpUrl
 
-CheckType = Literal["http", "tcp"]
+CheckType = Literal["http", "tcp", "container"]
+
+class AnomalyConfig(BaseModel):
+    """Latency anomaly sensitivity (EWMA z-score) for DEGRADED/RECOVERED events."""
+    enabled: bool = True
+    alpha: float = Field(default=0.05, gt=0, le=1)
+    z_threshold: float = Field(default=4.0, gt=0)
+    min_delta_ms: int = Field(default=50, ge=0)
+    min_samples: int = Field(default=20, ge=1)
+    consecutive: int = Field(default=3, ge=1)
+
+class FlapConfig(BaseModel):
+    """Flap detection: FLAPPING suppresses UP/DOWN until the rate settles."""
+    enabled: bool = True
+    window: int = Field(default=10, ge=2)
+    high_threshold: float = Field(default=0.5, gt=0, le=1)
+    low_threshold: float = Field(default=0.25, ge=0, le=1)
 
 class Defaults(BaseModel):
     interval_s: int = 30
     timeout_s: int = 3
     retries: int = 1
+    anomaly: AnomalyConfig = AnomalyConfig()
+    flap: FlapConfig = FlapConfig()
 
 class BaseCheck(BaseModel):
     id: str = Field(..., min_length=1)
@@ -19,6 +37,9 @@ class BaseCheck(BaseModel):
     connect_timeout_override: Optional[float] = None
     retries: Optional[int] = None
     down_threshold: Optional[int] = Field(default=None, ge=1)
+    depends_on: Optional[str] = None
+    anomaly: Optional[AnomalyConfig] = None
+    flap: Optional[FlapConfig] = None
 
 class HttpCheck(BaseCheck):
     type: Literal["http"]
@@ -29,8 +50,42 @@ class TcpCheck(BaseCheck):
     host: str
     port: int = Field(..., ge=1, le=65535)
 
-Check = HttpCheck | TcpCheck
+class ContainerCheck(BaseCheck):
+    """Resolved against the Portainer cache; no probe is sent."""
+    type: Literal["container"]
+    container: str = Field(..., min_length=1)
+    # Portainer environment name; unset matches the container on any of them.
+    endpoint: Optional[str] = None
+
+Check = HttpCheck | TcpCheck | ContainerCheck
+
+class BaseSinkConfig(BaseModel):
+    """A notification destination. ``checks``/``tags`` select what it gets (empty = all)."""
+    name: str = Field(..., min_length=1)
+    type: Literal["ntfy", "webhook", "file"]
+    checks: List[str] = Field(default_factory=list)
+    tags: List[str] = Field(default_factory=list)
+    timeout_s: float = Field(default=5.0, gt=0)
+    failure_threshold: int = Field(default=5, ge=1)
+    reset_s: float = Field(default=30.0, gt=0)
+
+class NtfySinkConfig(BaseSinkConfig):
+    type: Literal["ntfy"]
+    base_url: AnyHttpUrl
+    topic: str = Field(..., min_length=1)
+
+class WebhookSinkConfig(BaseSinkConfig):
+    type: Literal["webhook"]
+    url: AnyHttpUrl
+    headers: Dict[str, str] = Field(default_factory=dict)
+
+class FileSinkConfig(BaseSinkConfig):
+    type: Literal["file"]
+    path: str = Field(..., min_length=1)
+
+SinkConfig = NtfySinkConfig | WebhookSinkConfig | FileSinkConfig
 
 class Registry(BaseModel):
     defaults: Defaults = Defaults()
     checks: List[Check]
+    sinks: List[SinkConfig] = Field(default_factory=list)
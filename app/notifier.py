@@ -12,11 +12,16 @@ class NtfyConfig:
     topic: str
     priority_down: int = 4
     priority_up: int = 2
+    priority_degraded: int = 3
+    priority_flapping: int = 3
+    timeout_s: float = 5.0
 
 
 class NtfyNotifier:
     def __init__(self, cfg: NtfyConfig) -> None:
         self.cfg = cfg
+        # Keep-alive connections to the ntfy server across notifications.
+        self._session = requests.Session()
 
     def _post(
         self, title: str, message: str, priority: int, tags: Optional[str] = None
@@ -29,7 +34,10 @@ class NtfyNotifier:
         if tags:
             headers["Tags"] = tags  # comma-separated emoji or tag words
         # Keep it simple: plain text message body
-        requests.post(url, data=message.encode("utf-8"), headers=headers, timeout=5)
+        resp = self._session.post(
+            url, data=message.encode("utf-8"), headers=headers, timeout=self.cfg.timeout_s
+        )
+        resp.raise_for_status()
 
     def send_down(self, title: str, message: str) -> None:
         self._post(
@@ -40,3 +48,18 @@ class NtfyNotifier:
         self._post(
             title, message, priority=self.cfg.priority_up, tags="white_check_mark,up"
         )
+
+    def send_degraded(self, title: str, message: str) -> None:
+        self._post(
+            title, message, priority=self.cfg.priority_degraded, tags="warning,degraded"
+        )
+
+    def send_recovered(self, title: str, message: str) -> None:
+        self._post(
+            title, message, priority=self.cfg.priority_up, tags="white_check_mark,recovered"
+        )
+
+    def send_flapping(self, title: str, message: str) -> None:
+        self._post(
+            title, message, priority=self.cfg.priority_flapping, tags="warning,flapping"
+        )
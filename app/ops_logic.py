@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterable
 
 
 def serialize_ts(dt: datetime | None) -> str | None:
@@ -51,6 +51,23 @@ def summarize_checks(
     return up, down, down_list, core_down, non_core_down
 
 
+def split_down_by_core(
+    down_ids: Iterable[str],
+    core_check_ids: set[str],
+) -> tuple[bool, bool]:
+    """Return ``(core_down, non_core_down)`` in O(len(down_ids))."""
+    core_down = False
+    non_core_down = False
+    for check_id in down_ids:
+        if check_id in core_check_ids:
+            core_down = True
+        else:
+            non_core_down = True
+        if core_down and non_core_down:
+            break
+    return core_down, non_core_down
+
+
 def is_fresh(
     last_fetch_ts: datetime | None,
     poll_seconds: int,
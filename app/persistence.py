@@ -1,15 +1,107 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+from dataclasses import dataclass
+import json
 from pathlib import Path
+import queue
 import sqlite3
 import threading
-from typing import Any
+import time
+from typing import Any, Iterator
+
+from app.metrics import metrics
+
+
+@dataclass
+class ReadConnectionStats:
+    name: str
+    acquisitions: int = 0
+    wait_total_s: float = 0.0
+    wait_max_s: float = 0.0
+
+    def record_wait(self, wait_s: float) -> None:
+        self.acquisitions += 1
+        self.wait_total_s += wait_s
+        if wait_s > self.wait_max_s:
+            self.wait_max_s = wait_s
+
+    def to_dict(self) -> dict[str, Any]:
+        avg_ms = (
+            (self.wait_total_s / self.acquisitions) * 1000 if self.acquisitions else 0.0
+        )
+        return {
+            "name": self.name,
+            "acquisitions": self.acquisitions,
+            "wait_total_ms": round(self.wait_total_s * 1000, 3),
+            "wait_avg_ms": round(avg_ms, 3),
+            "wait_max_ms": round(self.wait_max_s * 1000, 3),
+        }
+
+
+class SQLiteReadPool:
+    """Small pool of read-only connections for API/history queries.
+
+    Under WAL, readers never block the writer connection (and vice versa), so
+    keeping reads off the writer lock means a slow query cannot stall the
+    runner's persistence calls.
+    """
+
+    def __init__(self, db_path: Path, size: int = 4) -> None:
+        self._size = max(1, int(size))
+        self._idle: queue.LifoQueue[tuple[sqlite3.Connection, ReadConnectionStats]] = (
+            queue.LifoQueue()
+        )
+        self._stats: list[ReadConnectionStats] = []
+        self._stats_lock = threading.Lock()
+        self._conns: list[sqlite3.Connection] = []
+
+        uri = f"{db_path.as_uri()}?mode=ro"
+        for i in range(self._size):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=ON")
+            stats = ReadConnectionStats(name=f"reader-{i}")
+            self._conns.append(conn)
+            self._stats.append(stats)
+            self._idle.put((conn, stats))
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        start = time.perf_counter()
+        conn, stats = self._idle.get()
+        wait_s = time.perf_counter() - start
+        with self._stats_lock:
+            stats.record_wait(wait_s)
+        try:
+            yield conn
+        finally:
+            # Drop any implicit read transaction so the WAL can checkpoint.
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put((conn, stats))
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._stats_lock:
+            return [s.to_dict() for s in self._stats]
+
+    def close(self) -> None:
+        for conn in self._conns:
+            conn.close()
 
 
 class SQLitePersistence:
-    def __init__(self, db_path: str, max_events: int = 500) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        max_events: int = 500,
+        read_pool_size: int = 4,
+        latency_retention_s: int = 86400,
+    ) -> None:
         self._db_path = self._resolve_db_path(db_path)
         self._max_events = max_events
+        self._latency_retention_us = latency_retention_s * 1_000_000
+        self._latency_inserts = 0
         self._lock = threading.Lock()
 
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -21,6 +113,10 @@ class SQLitePersistence:
             self._conn.execute("PRAGMA synchronous=NORMAL")
             self._init_schema()
 
+        # Read-only connections need the database file (and WAL) to exist,
+        # so the pool is opened after the writer has initialized the schema.
+        self._readers = SQLiteReadPool(self._db_path, size=read_pool_size)
+
     @staticmethod
     def _resolve_db_path(raw_path: str) -> Path:
         p = Path(raw_path).expanduser()
@@ -60,6 +156,62 @@ class SQLitePersistence:
             )
             """
         )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS latency_samples (
+                ts_us INTEGER NOT NULL,
+                check_id TEXT NOT NULL,
+                latency_ms INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_latency_samples_ts ON latency_samples (ts_us)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS availability_days (
+                check_id TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                up_s REAL NOT NULL DEFAULT 0,
+                down_s REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (check_id, day)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS incidents (
+                id INTEGER PRIMARY KEY,
+                started_us INTEGER NOT NULL,
+                last_down_us INTEGER NOT NULL,
+                ended_us INTEGER,
+                checks TEXT NOT NULL,
+                keys TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS notification_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_us INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                title TEXT NOT NULL,
+                message TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS proxmox_open_issues (
+                key TEXT PRIMARY KEY,
+                issue TEXT NOT NULL,
+                since_us INTEGER NOT NULL
+            )
+            """
+        )
         self._add_column_if_missing(
             table="check_states",
             column="fail_count",
@@ -70,6 +222,17 @@ class SQLitePersistence:
             column="down_threshold",
             ddl="INTEGER NOT NULL DEFAULT 1",
         )
+        self._add_column_if_missing(
+            table="check_states",
+            column="flapping",
+            ddl="INTEGER NOT NULL DEFAULT 0",
+        )
+        self._add_column_if_missing(table="events", column="detail", ddl="TEXT")
+        self._add_column_if_missing(
+            table="notification_outbox",
+            column="sink",
+            ddl="TEXT NOT NULL DEFAULT 'ntfy'",
+        )
         self._conn.commit()
 
     def _add_column_if_missing(self, table: str, column: str, ddl: str) -> None:
@@ -93,12 +256,13 @@ class SQLitePersistence:
 
     def upsert_check_state(self, check_state: dict[str, Any]) -> None:
         with self._lock:
+            start = time.perf_counter()
             self._conn.execute(
                 """
                 INSERT INTO check_states (
                     id, type, ok, fail_count, down_threshold, last_run, last_ok, last_change,
-                    latency_ms, status_code, error
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    latency_ms, status_code, error, flapping
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(id) DO UPDATE SET
                     type=excluded.type,
                     ok=excluded.ok,
@@ -109,7 +273,8 @@ class SQLitePersistence:
                     last_change=excluded.last_change,
                     latency_ms=excluded.latency_ms,
                     status_code=excluded.status_code,
-                    error=excluded.error
+                    error=excluded.error,
+                    flapping=excluded.flapping
                 """,
                 (
                     check_state["id"],
@@ -123,17 +288,20 @@ class SQLitePersistence:
                     check_state.get("latency_ms"),
                     check_state.get("status_code"),
                     check_state.get("error"),
+                    1 if check_state.get("flapping") else 0,
                 ),
             )
             self._conn.commit()
+            metrics.observe_sqlite_write("upsert_check_state", time.perf_counter() - start)
 
     def insert_event(self, event: dict[str, Any]) -> None:
         with self._lock:
+            start = time.perf_counter()
             self._conn.execute(
                 """
                 INSERT INTO events (
-                    ts, check_id, event, ok, latency_ms, status_code, error
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ts, check_id, event, ok, latency_ms, status_code, error, detail
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     event["ts"],
@@ -143,10 +311,12 @@ class SQLitePersistence:
                     event.get("latency_ms"),
                     event.get("status_code"),
                     event.get("error"),
+                    event.get("detail"),
                 ),
             )
             self._trim_events_locked()
             self._conn.commit()
+            metrics.observe_sqlite_write("insert_event", time.perf_counter() - start)
 
     def _trim_events_locked(self) -> None:
         self._conn.execute(
@@ -159,12 +329,207 @@ class SQLitePersistence:
             (self._max_events,),
         )
 
-    def load_all_check_states(self) -> dict[str, dict[str, Any]]:
+    def write_probe_data(
+        self,
+        samples: list[tuple[str, int, int]],
+        days: list[tuple[str, int, float, float]],
+    ) -> None:
+        """Insert ``(check_id, ts_us, latency_ms)`` samples and upsert
+        ``(check_id, day, up_s, down_s)`` availability rows in one transaction."""
+        with self._lock:
+            start = time.perf_counter()
+            if samples:
+                self._conn.executemany(
+                    "INSERT INTO latency_samples (check_id, ts_us, latency_ms) VALUES (?, ?, ?)",
+                    samples,
+                )
+                before = self._latency_inserts
+                self._latency_inserts += len(samples)
+                if self._latency_inserts // 256 != before // 256:
+                    self._conn.execute(
+                        "DELETE FROM latency_samples WHERE ts_us < ?",
+                        (samples[-1][1] - self._latency_retention_us,),
+                    )
+            if days:
+                self._conn.executemany(
+                    """
+                    INSERT INTO availability_days (check_id, day, up_s, down_s)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(check_id, day) DO UPDATE SET
+                        up_s=excluded.up_s,
+                        down_s=excluded.down_s
+                    """,
+                    days,
+                )
+            self._conn.commit()
+            metrics.observe_sqlite_write("write_probe_data", time.perf_counter() - start)
+
+    def load_latency_samples(self, since_us: int) -> Iterator[tuple[str, int, int]]:
+        """Yield ``(check_id, ts_us, latency_ms)`` newer than ``since_us``, oldest first."""
+        with self._readers.connection() as conn:
+            cursor = conn.execute(
+                """
+                SELECT check_id, ts_us, latency_ms FROM latency_samples
+                WHERE ts_us >= ?
+                ORDER BY ts_us
+                """,
+                (since_us,),
+            )
+            for row in cursor:
+                yield row["check_id"], row["ts_us"], row["latency_ms"]
+
+    def load_availability_days(self, since_day: int) -> list[tuple[str, int, float, float]]:
+        with self._readers.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT check_id, day, up_s, down_s FROM availability_days
+                WHERE day >= ?
+                """,
+                (since_day,),
+            ).fetchall()
+        return [(r["check_id"], r["day"], r["up_s"], r["down_s"]) for r in rows]
+
+    def upsert_incident(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            start = time.perf_counter()
+            self._conn.execute(
+                """
+                INSERT INTO incidents (id, started_us, last_down_us, ended_us, checks, keys)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    last_down_us=excluded.last_down_us,
+                    ended_us=excluded.ended_us,
+                    checks=excluded.checks,
+                    keys=excluded.keys
+                """,
+                (
+                    record["id"],
+                    record["started_us"],
+                    record["last_down_us"],
+                    record["ended_us"],
+                    json.dumps(record["checks"]),
+                    json.dumps(record["keys"]),
+                ),
+            )
+            self._conn.commit()
+            metrics.observe_sqlite_write("upsert_incident", time.perf_counter() - start)
+
+    def load_incidents(self, limit: int) -> list[dict[str, Any]]:
+        """Open incidents plus the ``limit`` most recent ones, oldest first."""
+        with self._readers.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, started_us, last_down_us, ended_us, checks, keys
+                FROM incidents
+                WHERE ended_us IS NULL
+                   OR id IN (SELECT id FROM incidents ORDER BY id DESC LIMIT ?)
+                ORDER BY id
+                """,
+                (limit,),
+            ).fetchall()
+        return [
+            {
+                "id": r["id"],
+                "started_us": r["started_us"],
+                "last_down_us": r["last_down_us"],
+                "ended_us": r["ended_us"],
+                "checks": json.loads(r["checks"]),
+                "keys": json.loads(r["keys"]),
+            }
+            for r in rows
+        ]
+
+    def upsert_open_issue(self, key: str, issue: Any, since_us: int) -> None:
+        with self._lock:
+            start = time.perf_counter()
+            self._conn.execute(
+                """
+                INSERT INTO proxmox_open_issues (key, issue, since_us)
+                VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    issue=excluded.issue,
+                    since_us=excluded.since_us
+                """,
+                (key, json.dumps(issue, default=str), since_us),
+            )
+            self._conn.commit()
+            metrics.observe_sqlite_write("upsert_open_issue", time.perf_counter() - start)
+
+    def delete_open_issue(self, key: str) -> None:
+        with self._lock:
+            start = time.perf_counter()
+            self._conn.execute("DELETE FROM proxmox_open_issues WHERE key = ?", (key,))
+            self._conn.commit()
+            metrics.observe_sqlite_write("delete_open_issue", time.perf_counter() - start)
+
+    def load_open_issues(self) -> list[dict[str, Any]]:
+        with self._readers.connection() as conn:
+            rows = conn.execute(
+                "SELECT key, issue, since_us FROM proxmox_open_issues ORDER BY since_us"
+            ).fetchall()
+        return [
+            {"key": r["key"], "issue": json.loads(r["issue"]), "since_us": r["since_us"]}
+            for r in rows
+        ]
+
+    def add_outbox_item(
+        self, created_us: int, kind: str, title: str, message: str, sink: str = "ntfy"
+    ) -> int:
         with self._lock:
-            rows = self._conn.execute(
+            start = time.perf_counter()
+            cur = self._conn.execute(
+                """
+                INSERT INTO notification_outbox (created_us, kind, title, message, sink)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (created_us, kind, title, message, sink),
+            )
+            self._conn.commit()
+            metrics.observe_sqlite_write("add_outbox_item", time.perf_counter() - start)
+            return int(cur.lastrowid)
+
+    def update_outbox_attempts(self, item_id: int, attempts: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE notification_outbox SET attempts = ? WHERE id = ?",
+                (attempts, item_id),
+            )
+            self._conn.commit()
+
+    def delete_outbox_item(self, item_id: int) -> None:
+        with self._lock:
+            start = time.perf_counter()
+            self._conn.execute("DELETE FROM notification_outbox WHERE id = ?", (item_id,))
+            self._conn.commit()
+            metrics.observe_sqlite_write("delete_outbox_item", time.perf_counter() - start)
+
+    def load_outbox(self, sink: str | None = None) -> list[dict[str, Any]]:
+        """Undelivered notifications (optionally for one sink), oldest first."""
+        with self._readers.connection() as conn:
+            if sink is None:
+                rows = conn.execute(
+                    """
+                    SELECT id, created_us, kind, title, message, attempts, sink
+                    FROM notification_outbox ORDER BY id
+                    """
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    """
+                    SELECT id, created_us, kind, title, message, attempts, sink
+                    FROM notification_outbox WHERE sink = ? ORDER BY id
+                    """,
+                    (sink,),
+                ).fetchall()
+        return [dict(r) for r in rows]
+
+    def load_all_check_states(self) -> dict[str, dict[str, Any]]:
+        with self._readers.connection() as conn:
+            rows = conn.execute(
                 """
                 SELECT id, type, ok, last_run, last_ok, last_change,
-                       fail_count, down_threshold, latency_ms, status_code, error
+                       fail_count, down_threshold, latency_ms, status_code, error,
+                       flapping
                 FROM check_states
                 """
             ).fetchall()
@@ -185,14 +550,27 @@ class SQLitePersistence:
                 "latency_ms": r["latency_ms"],
                 "status_code": r["status_code"],
                 "error": r["error"],
+                "flapping": bool(r["flapping"]),
             }
         return out
 
+    def _event_from_row(self, r: sqlite3.Row) -> dict[str, Any]:
+        return {
+            "ts": r["ts"],
+            "id": r["check_id"],
+            "event": r["event"],
+            "ok": self._from_db_bool(r["ok"]),
+            "latency_ms": r["latency_ms"],
+            "status_code": r["status_code"],
+            "error": r["error"],
+            "detail": r["detail"],
+        }
+
     def load_recent_events(self, limit: int) -> list[dict[str, Any]]:
-        with self._lock:
-            rows = self._conn.execute(
+        with self._readers.connection() as conn:
+            rows = conn.execute(
                 """
-                SELECT ts, check_id, event, ok, latency_ms, status_code, error
+                SELECT ts, check_id, event, ok, latency_ms, status_code, error, detail
                 FROM events
                 ORDER BY row_id DESC
                 LIMIT ?
@@ -200,22 +578,15 @@ class SQLitePersistence:
                 (limit,),
             ).fetchall()
 
-        events = [
-            {
-                "ts": r["ts"],
-                "id": r["check_id"],
-                "event": r["event"],
-                "ok": self._from_db_bool(r["ok"]),
-                "latency_ms": r["latency_ms"],
-                "status_code": r["status_code"],
-                "error": r["error"],
-            }
-            for r in rows
-        ]
+        events = [self._event_from_row(r) for r in rows]
         # StateStore keeps events oldest->newest and reverses on read.
         events.reverse()
         return events
 
+    def read_pool_stats(self) -> list[dict[str, Any]]:
+        return self._readers.stats()
+
     def close(self) -> None:
+        self._readers.close()
         with self._lock:
             self._conn.close()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable
+
+from app.breaker import CircuitBreaker
+from app.timing import timings
+
+
+def fetch_failed(result: Any) -> bool:
+    # Same failure test as apply_proxmox_fetch_result/apply_portainer_fetch_result.
+    if not isinstance(result, dict):
+        return True
+    return bool(result.get("error")) or result.get("status") == "unavailable"
+
+
+class CachePoller:
+    """Feeds an upstream into a store cache on its own thread and schedule.
+
+    A slow or unreachable upstream never delays the probe cycle. After a
+    failed poll the next one waits ``interval_s * 2**(failures - 1)``, capped
+    at ``backoff_max_s``. ``failure_threshold`` consecutive failures open the
+    circuit: no requests are made until ``backoff_max_s`` has passed, then a
+    single poll decides whether to resume the normal interval. Polls skipped
+    while the circuit is open leave the cache untouched and it goes stale.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Any],
+        update: Callable[[Any], None],
+        interval_s: float,
+        backoff_max_s: float = 300.0,
+        failure_threshold: int = 3,
+        name: str = "poll",
+        thread_name: str = "ops-monitor-poller",
+    ) -> None:
+        self._fetch = fetch
+        self._update = update
+        self.interval_s = interval_s
+        self.backoff_max_s = max(backoff_max_s, interval_s)
+        self.breaker = CircuitBreaker(failure_threshold, reset_s=self.backoff_max_s)
+        self.failures = 0
+        self._timing_name = f"{name}.poll"
+        self._thread_name = thread_name
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def poll_once(self) -> float:
+        """Poll unless the circuit is open; return seconds until the next poll."""
+        wait_s = self.breaker.retry_in()
+        if wait_s > 0:
+            return wait_s
+
+        with timings.time(self._timing_name):
+            result = self._fetch()
+        self._update(result)
+
+        if not fetch_failed(result):
+            self.failures = 0
+            self.breaker.record_success()
+            return self.interval_s
+        self.failures += 1
+        self.breaker.record_failure()
+        backoff_s = min(self.backoff_max_s, self.interval_s * 2 ** (self.failures - 1))
+        return max(backoff_s, self.breaker.retry_in())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "interval_s": self.interval_s,
+            "consecutive_failures": self.failures,
+            "circuit": self.breaker.state,
+        }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=self._thread_name, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                wait_s = self.poll_once()
+            except Exception:
+                # Never let the poller thread die; try again next interval.
+                wait_s = self.interval_s
+            self._stop.wait(wait_s)
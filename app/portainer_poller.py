@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from app.clients.portainer import PortainerClient
+from app.poller import CachePoller
+from app.state import StateStore
+
+POLLER_THREAD_NAME = "ops-monitor-portainer"
+
+
+class PortainerPoller(CachePoller):
+    """Pulls container state from Portainer on its own thread and schedule.
+
+    Every ``type: container`` check resolves against the resulting
+    ``StateStore.portainer_snapshot()``, so Portainer sees one bulk poll per
+    interval regardless of how many checks there are.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        interval_s: float,
+        backoff_max_s: float = 300.0,
+        failure_threshold: int = 3,
+        fetch: Callable[[], Any] | None = None,
+    ) -> None:
+        super().__init__(
+            fetch=fetch or PortainerClient().fetch_containers,
+            update=store.update_portainer,
+            interval_s=interval_s,
+            backoff_max_s=backoff_max_s,
+            failure_threshold=failure_threshold,
+            name="portainer",
+            thread_name=POLLER_THREAD_NAME,
+        )
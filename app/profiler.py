@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any
+
+MAX_DURATION_S = 60.0
+MIN_INTERVAL_S = 0.001
+MAX_STACK_DEPTH = 128
+RUNNER_THREAD_NAME = "ops-monitor-runner"
+
+# Frame key: (function, file, first line of the function).
+FrameKey = tuple[str, str, int]
+
+_session_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    pass
+
+
+@dataclass
+class Profile:
+    duration_s: float
+    interval_s: float
+    samples_taken: int = 0
+    # (thread name, stack root->leaf) -> sample count
+    stacks: Counter[tuple[str, tuple[FrameKey, ...]]] = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format (one ``stack count`` per line)."""
+        lines = []
+        for (thread_name, stack), count in sorted(self.stacks.items()):
+            frames = [thread_name.replace(";", "_")]
+            frames.extend(f"{name} ({file}:{line})" for name, file, line in stack)
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self) -> dict[str, Any]:
+        frame_index: dict[FrameKey, int] = {}
+        frames: list[dict[str, Any]] = []
+        per_thread: dict[str, tuple[list[list[int]], list[float]]] = {}
+
+        for (thread_name, stack), count in self.stacks.items():
+            indexes = []
+            for key in stack:
+                idx = frame_index.get(key)
+                if idx is None:
+                    idx = frame_index[key] = len(frames)
+                    frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                indexes.append(idx)
+            samples, weights = per_thread.setdefault(thread_name, ([], []))
+            samples.append(indexes)
+            weights.append(count * self.interval_s)
+
+        profiles = [
+            {
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration_s,
+                "samples": samples,
+                "weights": weights,
+            }
+            for thread_name, (samples, weights) in sorted(per_thread.items())
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "ops-monitor",
+            "exporter": "ops-monitor",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+def _stack(frame: FrameType | None) -> tuple[FrameKey, ...]:
+    out: list[FrameKey] = []
+    while frame is not None and len(out) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        out.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    out.reverse()
+    return tuple(out)
+
+
+def sample_threads(
+    duration_s: float,
+    interval_s: float,
+    target: str = "all",
+) -> Profile:
+    """Sample other threads' stacks with ``sys._current_frames``.
+
+    Runs in the calling thread (which is excluded from the samples) and
+    allows a single session at a time; raises ``ProfilerBusyError`` otherwise.
+    Overhead is bounded by the interval floor and the stack depth cap.
+    """
+    duration_s = min(max(duration_s, 0.0), MAX_DURATION_S)
+    interval_s = max(interval_s, MIN_INTERVAL_S)
+
+    if not _session_lock.acquire(blocking=False):
+        raise ProfilerBusyError("a profiling session is already running")
+    try:
+        profile = Profile(duration_s=duration_s, interval_s=interval_s)
+        own_id = threading.get_ident()
+        deadline = time.perf_counter() + duration_s
+        while True:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                name = names.get(thread_id, f"thread-{thread_id}")
+                if target == "runner" and name != RUNNER_THREAD_NAME:
+                    continue
+                profile.stacks[(name, _stack(frame))] += 1
+            profile.samples_taken += 1
+            if time.perf_counter() + interval_s > deadline:
+                break
+            time.sleep(interval_s)
+        return profile
+    finally:
+        _session_lock.release()
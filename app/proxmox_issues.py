@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Iterable
+
+# Event ids for proxmox issues are ``proxmox/<issue key>``.
+EVENT_PREFIX = "proxmox/"
+_MAX_HISTORY = 200
+# Fields naming what an issue is about. Measurements (usage_percent), display
+# names and free-form text change between polls and must not change the
+# issue's identity.
+_IDENTITY_FIELDS = ("node", "vmid", "storage", "type", "id")
+
+
+def issue_key(issue: Any) -> str:
+    """Stable identity of a proxmox-stats issue across polls."""
+    if not isinstance(issue, dict):
+        return str(issue)
+    kind_field = "kind" if issue.get("kind") else "type"
+    kind = issue.get(kind_field) or "issue"
+    ident = [
+        f"{field}={issue[field]}"
+        for field in _IDENTITY_FIELDS
+        if field != kind_field and issue.get(field) not in (None, "")
+    ]
+    if not ident:
+        return str(kind)
+    return f"{kind}:{','.join(ident)}"
+
+
+def describe_issue(issue: Any) -> str:
+    if not isinstance(issue, dict):
+        return str(issue)
+    return " ".join(f"{k}={v}" for k, v in issue.items())
+
+
+class ProxmoxIssueTracker:
+    """Open proxmox issues and their APPEARED/RESOLVED history.
+
+    Only the set of issue keys is compared, so a payload whose measurements
+    changed but whose issues did not produces no changes.
+    """
+
+    def __init__(self, max_history: int = _MAX_HISTORY) -> None:
+        # key -> {"key", "issue", "since_us"}
+        self._open: dict[str, dict[str, Any]] = {}
+        self._history: deque[dict[str, Any]] = deque(maxlen=max_history)
+
+    def load(
+        self,
+        open_issues: Iterable[dict[str, Any]],
+        events: Iterable[dict[str, Any]],
+        to_us: Callable[[str], int | None],
+    ) -> None:
+        """Restore open issues (``key``/``issue``/``since_us`` records) and
+        rebuild the change history from persisted issue events, oldest first.
+
+        Open issues are persisted on their own: the event ring is shared with
+        check transitions, so an old APPEARED event may have been trimmed.
+        """
+        for event in events:
+            if not event["id"].startswith(EVENT_PREFIX):
+                continue
+            key = event["id"][len(EVENT_PREFIX) :]
+            ts_us = to_us(event["ts"])
+            if ts_us is not None:
+                self._apply(event["event"], key, event.get("detail"), ts_us)
+        self._open = {
+            entry["key"]: {
+                "key": entry["key"],
+                "issue": entry["issue"],
+                "since_us": entry["since_us"],
+            }
+            for entry in open_issues
+        }
+
+    def observe(self, issues: Iterable[Any], ts_us: int) -> list[tuple[str, str, Any]]:
+        """Diff the current issues; return ``(change, key, issue)`` tuples."""
+        current: dict[str, Any] = {}
+        for issue in issues:
+            current.setdefault(issue_key(issue), issue)
+
+        changes: list[tuple[str, str, Any]] = []
+        for key, issue in current.items():
+            entry = self._open.get(key)
+            if entry is None:
+                changes.append(("APPEARED", key, issue))
+                self._apply("APPEARED", key, issue, ts_us)
+            else:
+                entry["issue"] = issue
+        for key in [k for k in self._open if k not in current]:
+            issue = self._open[key]["issue"]
+            changes.append(("RESOLVED", key, issue))
+            self._apply("RESOLVED", key, issue, ts_us)
+        return changes
+
+    def _apply(self, change: str, key: str, issue: Any, ts_us: int) -> None:
+        entry: dict[str, Any] = {"ts_us": ts_us, "change": change, "key": key, "issue": issue}
+        if change == "APPEARED":
+            self._open[key] = {"key": key, "issue": issue, "since_us": ts_us}
+        elif change == "RESOLVED":
+            opened = self._open.pop(key, None)
+            if opened is not None:
+                entry["duration_s"] = round((ts_us - opened["since_us"]) / 1_000_000, 3)
+        else:
+            return
+        self._history.append(entry)
+
+    def open_issues(self) -> list[dict[str, Any]]:
+        """Currently open issues, oldest first."""
+        return sorted(self._open.values(), key=lambda entry: entry["since_us"])
+
+    def history(self, limit: int) -> list[dict[str, Any]]:
+        """Recent changes, newest first."""
+        out = []
+        for entry in reversed(self._history):
+            out.append(entry)
+            if len(out) >= limit:
+                break
+        return out
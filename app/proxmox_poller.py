@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from app.clients.proxmox_stats import ProxmoxStatsClient
+from app.poller import CachePoller
+from app.state import StateStore
+
+POLLER_THREAD_NAME = "ops-monitor-proxmox"
+
+
+class ProxmoxPoller(CachePoller):
+    """Polls proxmox-stats on its own thread and schedule.
+
+    Results go through ``StateStore.update_proxmox_stats``, so the cache keeps
+    ``apply_proxmox_fetch_result`` semantics. Backoff and circuit behaviour
+    are those of ``CachePoller``.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        interval_s: float,
+        backoff_max_s: float = 300.0,
+        failure_threshold: int = 3,
+        fetch: Callable[[], Any] | None = None,
+    ) -> None:
+        super().__init__(
+            # A long-lived client keeps the validators for conditional GETs.
+            fetch=fetch or ProxmoxStatsClient().get_health_summary,
+            update=store.update_proxmox_stats,
+            interval_s=interval_s,
+            backoff_max_s=backoff_max_s,
+            failure_threshold=failure_threshold,
+            name="proxmox",
+            thread_name=POLLER_THREAD_NAME,
+        )
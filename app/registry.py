@@ -25,6 +25,12 @@ def load_registry(path: Path = REGISTRY_PATH) -> Registry:
             raise ValueError(f"Duplicate check id: {c.id}")
         seen.add(c.id)
 
+    names = set()
+    for s in reg.sinks:
+        if s.name in names:
+            raise ValueError(f"Duplicate sink name: {s.name}")
+        names.add(s.name)
+
     return reg
 
 def apply_defaults(reg: Registry) -> dict[str, dict]:
@@ -41,6 +47,13 @@ def apply_defaults(reg: Registry) -> dict[str, dict]:
         cd["timeout_s"] = cd["timeout_s"] or d.timeout_s
         cd["retries"] = cd["retries"] or d.retries
         cd["down_threshold"] = cd.get("down_threshold") or 1
+        # Per-check anomaly/flap keys override the defaults block key by key.
+        for block in ("anomaly", "flap"):
+            override = getattr(c, block)
+            cd[block] = {
+                **getattr(d, block).model_dump(),
+                **(override.model_dump(exclude_unset=True) if override else {}),
+            }
         out[c.id] = cd
 
     return out
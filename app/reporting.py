@@ -10,6 +10,8 @@ from app.ops_logic import serialize_ts
 
 
 REPORT_EVENTS_LIMIT = 200
+# Transitions already summarized by incidents; left out of the report facts.
+INCIDENT_EVENT_TYPES = frozenset({"UP", "DOWN"})
 MAX_ITEMS = 20
 MAX_TEXT_LEN = 500
 MAX_HEADLINE_LEN = 200
@@ -34,10 +36,18 @@ def build_facts_payload(
     proxmox_payload: dict[str, Any],
     generated_at: str,
     range_minutes: int,
+    incidents_payload: list[dict[str, Any]] | None = None,
 ) -> dict[str, Any]:
+    if incidents_payload is not None:
+        events_payload = [
+            event
+            for event in events_payload
+            if event.get("event") not in INCIDENT_EVENT_TYPES
+        ]
     return {
         "ops_summary": ops_summary_payload,
         "status_summary": status_summary_payload,
+        "incidents": incidents_payload or [],
         "events": events_payload,
         "proxmox": proxmox_payload,
         "generated_at": generated_at,
@@ -67,6 +77,7 @@ def build_report_prompt(*, facts: dict[str, Any]) -> str:
         "Generate a concise operations report from provided facts only.\n"
         "Output a single JSON object.\n"
         "ONLY these top-level keys: headline, notable_events, current_issues, recommendations.\n"
+        "Each item in facts.incidents is one outage; report it as one notable event.\n"
         "If unknown, use empty arrays/empty strings.\n"
         "No additional keys. No prose.\n"
         "Example output:\n"
@@ -402,6 +413,8 @@ def render_report_markdown(
     lines.append(f"- ops_summary: {'yes' if sources_info.get('ops_summary_included') else 'no'}")
     lines.append(f"- status_summary: {'yes' if sources_info.get('status_summary_included') else 'no'}")
     lines.append(f"- events_limit: {sources_info.get('events_limit', 0)}")
+    if "incidents_count" in sources_info:
+        lines.append(f"- incidents: {sources_info['incidents_count']}")
     lines.append(f"- proxmox: {'yes' if sources_info.get('proxmox_included') else 'no'}")
     return "\n".join(lines)
 
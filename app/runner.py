@@ -1,17 +1,30 @@
 from __future__ import annotations
 
 import time
+from typing import Callable
 
+from app.breaker import CircuitBreaker
+from app.checks.container_check import run_container
 from app.checks.http_check import run_http
 from app.checks.results import CheckResult
 from app.checks.tcp_check import run_tcp
-from app.clients.proxmox_stats import get_health_summary
+from app.coalescer import NotificationCoalescer, event_kind
 from app.config import settings
+from app.dispatcher import NotificationDispatcher, NotificationFanout, SinkRoute
 from app.formatting import format_transition
+from app.metrics import metrics
+from app.timing import timings
 from app.notifier import NtfyConfig, NtfyNotifier
+from app.models import SinkConfig
 from app.registry import apply_defaults, load_registry
+from app.sinks import build_sink
 from app.state import StateStore
 
+# Anything with the NtfyNotifier send_* methods; the dispatcher only enqueues,
+# the fanout also takes the sinks to route to and the coalescer takes whole
+# events.
+Notifier = NtfyNotifier | NotificationDispatcher | NotificationFanout | NotificationCoalescer
+
 
 def _connect_timeout_override(check_id: str, check: dict) -> float | None:
     explicit = check.get("connect_timeout_override")
@@ -23,22 +36,29 @@ def _connect_timeout_override(check_id: str, check: dict) -> float | None:
 
 
 def _notify_transition(
-    notifier: NtfyNotifier | None,
+    notifier: Notifier | None,
     event: dict | None,
     check: dict,
     state: dict,
 ) -> None:
     if notifier is None or event is None:
         return
-    if event["event"] not in {"UP", "DOWN"}:
+    kind = event_kind(event)
+    if kind is None:
         return
 
     title, message = format_transition(event=event, check=check, state=state)
+    tags = check.get("tags") or ()
     try:
-        if event["event"] == "DOWN":
-            notifier.send_down(title=title, message=message)
-        else:
-            notifier.send_up(title=title, message=message)
+        with timings.time("runner.notify"):
+            if isinstance(notifier, NotificationCoalescer):
+                notifier.submit(event, title=title, message=message, tags=tags)
+            elif isinstance(notifier, NotificationFanout):
+                getattr(notifier, f"send_{kind}")(
+                    title=title, message=message, sinks=notifier.route(event["id"], tags)
+                )
+            else:
+                getattr(notifier, f"send_{kind}")(title=title, message=message)
     except Exception:
         # Notification errors should never stop the check loop.
         return
@@ -49,16 +69,21 @@ def _update_store_from_result(
     check_id: str,
     check: dict,
     res: CheckResult,
-    notifier: NtfyNotifier | None,
+    notifier: Notifier | None,
 ) -> None:
-    event = store.update(
-        check_id,
-        ok=res.ok,
-        latency_ms=res.latency_ms,
-        status_code=res.status_code,
-        error=res.error,
-        down_threshold=int(check.get("down_threshold", 1)),
-    )
+    if res.latency_ms is not None:
+        metrics.observe_probe(check_id, res.latency_ms)
+    with timings.time("runner.store_update"):
+        event = store.update(
+            check_id,
+            ok=res.ok,
+            latency_ms=res.latency_ms,
+            status_code=res.status_code,
+            error=res.error,
+            down_threshold=int(check.get("down_threshold", 1)),
+            anomaly=check.get("anomaly"),
+            flap=check.get("flap"),
+        )
     _notify_transition(notifier, event, check, store.check_state(check_id))
 
 
@@ -70,44 +95,147 @@ def build_notifier() -> NtfyNotifier | None:
     )
 
 
-def run_once(store: StateStore, notifier: NtfyNotifier | None = None) -> None:
-    reg = load_registry()
-    checks = apply_defaults(reg)
-    active_ids = set(checks.keys())
-    store.prune(active_ids)
-
-    for check_id, c in checks.items():
-        store.ensure_check(
-            check_id,
-            c["type"],
-            down_threshold=int(c.get("down_threshold", 1)),
+def _configured_sinks() -> list[SinkConfig]:
+    try:
+        return list(load_registry().sinks)
+    except Exception:
+        # A broken checks.yml is reported by the runner cycle; fall back to ntfy.
+        return []
+
+
+def build_dispatcher(
+    store: StateStore, sinks: list[SinkConfig] | None = None
+) -> NotificationFanout | None:
+    """Start one dispatcher per notification sink, off the probe path.
+
+    ``sinks`` defaults to the ``sinks`` section of checks.yml. The ntfy
+    notifier from ``NTFY_URL``/``NTFY_TOPIC`` is added as sink ``ntfy`` for
+    every check unless a sink of that name is configured.
+    """
+    if sinks is None:
+        sinks = _configured_sinks()
+    dispatchers: dict[str, NotificationDispatcher] = {}
+    routes: list[SinkRoute] = []
+    notifier = build_notifier()
+    if notifier is not None and all(cfg.name != "ntfy" for cfg in sinks):
+        dispatchers["ntfy"] = NotificationDispatcher(
+            notifier, outbox=store.persistence, sink="ntfy", breaker=CircuitBreaker()
+        )
+    for cfg in sinks:
+        dispatchers[cfg.name] = NotificationDispatcher(
+            build_sink(cfg),
+            outbox=store.persistence,
+            sink=cfg.name,
+            breaker=CircuitBreaker(cfg.failure_threshold, cfg.reset_s),
+        )
+        routes.append(
+            SinkRoute(cfg.name, checks=frozenset(cfg.checks), tags=frozenset(cfg.tags))
         )
+    if not dispatchers:
+        return None
+    fanout = NotificationFanout(dispatchers, routes)
+    fanout.start()
+    return fanout
+
+
+def build_coalescer(
+    target: NotificationFanout | None,
+) -> NotificationCoalescer | NotificationFanout | None:
+    """Wrap ``target`` in a started digest coalescer unless disabled (window 0)."""
+    if target is None or settings.OPS_NOTIFY_COALESCE_S <= 0:
+        return target
+    coalescer = NotificationCoalescer(
+        target,
+        window_s=settings.OPS_NOTIFY_COALESCE_S,
+        cooldown_s=settings.OPS_NOTIFY_COOLDOWN_S,
+        core_ids=settings.OPS_CORE_CHECK_IDS,
+        route=target.route,
+    )
+    coalescer.start()
+    return coalescer
 
-    for check_id, c in checks.items():
-        timeout_s = int(c["timeout_s"])
-        connect_timeout_s = _connect_timeout_override(check_id, c)
 
-        if c["type"] == "http":
-            res = run_http(
-                c["url"],
-                timeout_s=timeout_s,
-                connect_timeout_s=connect_timeout_s,
-            )
-            _update_store_from_result(store, check_id, c, res, notifier)
-        elif c["type"] == "tcp":
-            res = run_tcp(c["host"], c["port"], timeout_s=timeout_s)
-            _update_store_from_result(store, check_id, c, res, notifier)
+def run_once(store: StateStore, notifier: Notifier | None = None) -> None:
+    with timings.time("runner.run_once"):
+        _run_once(store, notifier)
 
-    # Keep proxmox-stats in cache on the same cadence as monitor checks.
-    proxmox_summary = get_health_summary()
-    store.update_proxmox_stats(proxmox_summary)
 
+def _run_once(store: StateStore, notifier: Notifier | None) -> None:
+    with timings.time("runner.load_registry"):
+        reg = load_registry()
+        checks = apply_defaults(reg)
+    active_ids = set(checks.keys())
 
-def loop_forever(store: StateStore, interval_s: int) -> None:
-    notifier = build_notifier()
+    # Registry sync publishes a single snapshot instead of one per check.
+    with store.batch():
+        with timings.time("runner.prune"):
+            store.prune(active_ids)
+        with timings.time("runner.ensure_checks"):
+            for check_id, c in checks.items():
+                store.ensure_check(
+                    check_id,
+                    c["type"],
+                    down_threshold=int(c.get("down_threshold", 1)),
+                    tags=c.get("tags") or (),
+                    depends_on=c.get("depends_on"),
+                )
+
+    portainer = store.portainer_snapshot()
+    pending = len(checks)
+    # One snapshot per cycle (or per publish interval), not one per probe.
+    with store.batch():
+        for check_id, c in checks.items():
+            metrics.set_probe_queue_depth(pending)
+            pending -= 1
+            timeout_s = int(c["timeout_s"])
+            connect_timeout_s = _connect_timeout_override(check_id, c)
+
+            if c["type"] == "http":
+                with timings.time("runner.probe.http"):
+                    res = run_http(
+                        c["url"],
+                        timeout_s=timeout_s,
+                        connect_timeout_s=connect_timeout_s,
+                    )
+                _update_store_from_result(store, check_id, c, res, notifier)
+            elif c["type"] == "tcp":
+                with timings.time("runner.probe.tcp"):
+                    res = run_tcp(c["host"], c["port"], timeout_s=timeout_s)
+                _update_store_from_result(store, check_id, c, res, notifier)
+            elif c["type"] == "container":
+                res = run_container(
+                    portainer,
+                    c["container"],
+                    c.get("endpoint"),
+                    poll_seconds=settings.PORTAINER_INTERVAL_S,
+                )
+                if res is None:
+                    # No fresh Portainer data: the last result cannot be trusted.
+                    store.mark_unknown(check_id, error="no fresh portainer data")
+                else:
+                    _update_store_from_result(store, check_id, c, res, notifier)
+    metrics.set_probe_queue_depth(0)
+
+
+def loop_forever(
+    store: StateStore,
+    interval_s: int,
+    after_cycle: Callable[[], None] | None = None,
+    notifier: Notifier | None = None,
+) -> None:
+    if notifier is None:
+        notifier = build_coalescer(build_dispatcher(store))
     while True:
         start = time.perf_counter()
         run_once(store, notifier=notifier)
+        metrics.observe_cycle(time.perf_counter() - start)
+        if after_cycle is not None:
+            try:
+                with timings.time("runner.after_cycle"):
+                    after_cycle()
+            except Exception:
+                # Materializing read views must never stop the check loop.
+                pass
         elapsed = time.perf_counter() - start
         sleep_s = max(0.0, interval_s - elapsed)
         time.sleep(sleep_s)
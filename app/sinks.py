@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from app.fastjson import dumps
+from app.models import FileSinkConfig, NtfySinkConfig, SinkConfig, WebhookSinkConfig
+from app.notifier import NtfyConfig, NtfyNotifier
+from app.ops_logic import utcnow_iso
+
+
+class _KindSink(ABC):
+    """Maps the notifier ``send_*`` methods onto one ``send(kind, ...)``."""
+
+    @abstractmethod
+    def send(self, kind: str, title: str, message: str) -> None:
+        """Deliver one notification; raise on failure so it is retried."""
+
+    def send_down(self, title: str, message: str) -> None:
+        self.send("down", title, message)
+
+    def send_up(self, title: str, message: str) -> None:
+        self.send("up", title, message)
+
+    def send_degraded(self, title: str, message: str) -> None:
+        self.send("degraded", title, message)
+
+    def send_recovered(self, title: str, message: str) -> None:
+        self.send("recovered", title, message)
+
+    def send_flapping(self, title: str, message: str) -> None:
+        self.send("flapping", title, message)
+
+
+class WebhookSink(_KindSink):
+    """POSTs each notification as a JSON object to ``url``."""
+
+    def __init__(
+        self, url: str, timeout_s: float = 5.0, headers: dict[str, str] | None = None
+    ) -> None:
+        self.url = url
+        self.timeout_s = timeout_s
+        self._session = requests.Session()
+        self._session.headers.update({"Content-Type": "application/json"})
+        self._session.headers.update(headers or {})
+
+    def send(self, kind: str, title: str, message: str) -> None:
+        body = {"kind": kind, "title": title, "message": message, "sent_at": utcnow_iso()}
+        resp = self._session.post(self.url, data=dumps(body), timeout=self.timeout_s)
+        resp.raise_for_status()
+
+
+class FileSink(_KindSink):
+    """Appends each notification as one JSON line to ``path``."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def send(self, kind: str, title: str, message: str) -> None:
+        body = {"kind": kind, "title": title, "message": message, "sent_at": utcnow_iso()}
+        line = dumps(body) + b"\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as fh:
+                fh.write(line)
+
+
+def build_sink(cfg: SinkConfig) -> Any:
+    if isinstance(cfg, NtfySinkConfig):
+        return NtfyNotifier(
+            NtfyConfig(base_url=str(cfg.base_url), topic=cfg.topic, timeout_s=cfg.timeout_s)
+        )
+    if isinstance(cfg, WebhookSinkConfig):
+        return WebhookSink(str(cfg.url), timeout_s=cfg.timeout_s, headers=cfg.headers)
+    if isinstance(cfg, FileSinkConfig):
+        return FileSink(cfg.path)
+    raise ValueError(f"Unknown sink type: {cfg.type}")
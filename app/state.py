@@ -1,33 +1,190 @@
 from __future__ import annotations
 
+import bisect
+import math
+import secrets
 import threading
-from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
-from typing import Any
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Iterator, Mapping
 
+from app.anomaly import AnomalySettings, LatencyBaseline
+from app.availability import AvailabilityTracker, day_of
+from app.flapping import FlapSettings, FlapTracker
+from app.incidents import DEFAULT_WINDOW_S, Incident, IncidentTracker, correlation_keys
+from app.latency import MAX_WINDOW_S, CheckLatencyHistograms
 from app.persistence import SQLitePersistence
+from app.proxmox_issues import EVENT_PREFIX, ProxmoxIssueTracker, describe_issue
+from app.timing import timings
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_INTERN_MAX = 4096
+_MAX_TOMBSTONES = 1024
+# Inside a batch, a snapshot is still published this often so readers see
+# progress during a long probe cycle without paying O(N) per update.
+_BATCH_PUBLISH_INTERVAL_S = 0.5
+_interned: dict[str, str] = {}
 
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-@dataclass
+def now_us() -> int:
+    return time.time_ns() // 1000
+
+
+def us_to_iso(us: int | None) -> str | None:
+    if us is None:
+        return None
+    return (_EPOCH + timedelta(microseconds=us)).isoformat()
+
+
+def iso_to_us(ts: str | None) -> int | None:
+    if not ts:
+        return None
+    try:
+        dt = datetime.fromisoformat(ts)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def intern_str(value: str | None) -> str | None:
+    """Share identical type/error strings between checks.
+
+    Uses a bounded table rather than ``sys.intern`` so that free-form error
+    text (which may embed addresses or ports) cannot grow it without limit.
+    """
+    if value is None:
+        return None
+    shared = _interned.get(value)
+    if shared is not None:
+        return shared
+    if len(_interned) >= _INTERN_MAX:
+        _interned.clear()
+    _interned[value] = value
+    return value
+
+
+@dataclass(slots=True)
 class CheckState:
+    """Per-check runtime state.
+
+    Timestamps are kept as integer microseconds since the epoch and only
+    converted to ISO strings in ``to_dict``.
+    """
+
     id: str
     type: str
     ok: bool | None = None
     fail_count: int = 0
     down_threshold: int = 1
-    last_run: str | None = None
-    last_ok: str | None = None
-    last_change: str | None = None
+    last_run_us: int | None = None
+    last_ok_us: int | None = None
+    last_change_us: int | None = None
     latency_ms: int | None = None
     status_code: int | None = None
     error: str | None = None
+    flapping: bool = False
+
+    def __post_init__(self) -> None:
+        self.type = intern_str(self.type)
+        self.error = intern_str(self.error)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CheckState:
+        return cls(
+            id=data["id"],
+            type=data["type"],
+            ok=data.get("ok"),
+            fail_count=data.get("fail_count", 0),
+            down_threshold=data.get("down_threshold", 1),
+            last_run_us=iso_to_us(data.get("last_run")),
+            last_ok_us=iso_to_us(data.get("last_ok")),
+            last_change_us=iso_to_us(data.get("last_change")),
+            latency_ms=data.get("latency_ms"),
+            status_code=data.get("status_code"),
+            error=data.get("error"),
+            flapping=bool(data.get("flapping", False)),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "type": self.type,
+            "ok": self.ok,
+            "fail_count": self.fail_count,
+            "down_threshold": self.down_threshold,
+            "last_run": us_to_iso(self.last_run_us),
+            "last_ok": us_to_iso(self.last_ok_us),
+            "last_change": us_to_iso(self.last_change_us),
+            "latency_ms": self.latency_ms,
+            "status_code": self.status_code,
+            "error": self.error,
+            "flapping": self.flapping,
+        }
+
+
+_STATUS_KEYS: dict[bool | None, str] = {True: "up", False: "down", None: "unknown"}
+
+
+@dataclass(frozen=True)
+class StatusAggregates:
+    """Status counts maintained incrementally by ``StateStore``.
+
+    ``down_ids`` is ordered by when each check went down. ``tag_counts`` maps
+    tag to ``{"total", "up", "down", "unknown"}`` counts.
+    """
+
+    up: int = 0
+    down: int = 0
+    unknown: int = 0
+    down_ids: tuple[str, ...] = ()
+    tag_counts: Mapping[str, Mapping[str, int]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    # p95 of the latest latency_ms across each tag's checks (nearest rank).
+    tag_latency_p95: Mapping[str, int | None] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    @property
+    def total(self) -> int:
+        return self.up + self.down + self.unknown
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Immutable view of all check states published by ``StateStore``.
+
+    ``checks`` maps check id to an already-serialized state dict. The dicts are
+    shared between readers and must be treated as read-only.
+    """
+
+    generation: int
+    checks: Mapping[str, dict[str, Any]]
+    aggregates: StatusAggregates = field(default_factory=StatusAggregates)
+    # Append-only ``(generation, check_id)`` log shared between snapshots;
+    # only its first ``change_log_len`` entries belong to this snapshot.
+    change_log: list[tuple[int, str]] = field(default_factory=list)
+    change_log_len: int = 0
+    # (check_id, generation) of recent removals, and the oldest generation a
+    # delta can still be computed from.
+    removed: tuple[tuple[str, int], ...] = ()
+    delta_floor: int = 0
+    # Tag -> check ids carrying it (from registry ``tags``).
+    tag_index: Mapping[str, tuple[str, ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
 
 
 @dataclass(frozen=True)
@@ -50,6 +207,21 @@ def apply_proxmox_fetch_result(
         )
 
     status = fetch_result.get("status")
+    if status == "not_modified":
+        # Conditional GET / unchanged body: the upstream is reachable and the
+        # cached payload is still current.
+        if current.last_payload is None:
+            return ProxmoxStatsCache(
+                last_payload=None,
+                last_fetch_ts=fetch_ts,
+                last_error="proxmox-stats reported no change but nothing is cached",
+            )
+        return ProxmoxStatsCache(
+            last_payload=current.last_payload,
+            last_fetch_ts=fetch_ts,
+            last_error=None,
+        )
+
     error = fetch_result.get("error")
     failed = bool(error) or status == "unavailable"
 
@@ -67,13 +239,105 @@ def apply_proxmox_fetch_result(
     )
 
 
+@dataclass(frozen=True)
+class PortainerCache:
+    last_payload: dict[str, Any] | None = None
+    last_fetch_ts: datetime | None = None
+    # When ``last_payload`` was fetched; container checks judge freshness by it.
+    last_success_ts: datetime | None = None
+    last_error: str | None = None
+    # Container name -> its entries in ``last_payload`` (one per environment).
+    containers: Mapping[str, tuple[dict[str, Any], ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+
+def apply_portainer_fetch_result(
+    current: PortainerCache,
+    fetch_result: dict[str, Any] | None,
+    fetch_ts: datetime,
+) -> PortainerCache:
+    if not isinstance(fetch_result, dict) or not isinstance(
+        fetch_result.get("containers", []), list
+    ):
+        return replace(current, last_fetch_ts=fetch_ts, last_error="invalid portainer payload")
+
+    error = fetch_result.get("error")
+    if error or fetch_result.get("status") == "unavailable":
+        return replace(
+            current,
+            last_fetch_ts=fetch_ts,
+            last_error=str(error) if error else "portainer unavailable",
+        )
+
+    by_name: dict[str, list[dict[str, Any]]] = {}
+    for container in fetch_result.get("containers", []):
+        if isinstance(container, dict) and container.get("name"):
+            by_name.setdefault(container["name"], []).append(container)
+    return PortainerCache(
+        last_payload=fetch_result,
+        last_fetch_ts=fetch_ts,
+        last_success_ts=fetch_ts,
+        last_error=None,
+        containers=MappingProxyType({k: tuple(v) for k, v in by_name.items()}),
+    )
+
+
 class StateStore:
-    def __init__(self, db_path: str | None = None, max_events: int = 500) -> None:
+    def __init__(
+        self,
+        db_path: str | None = None,
+        max_events: int = 500,
+        availability_max_gap_s: float = 300.0,
+        incident_window_s: float = DEFAULT_WINDOW_S,
+    ) -> None:
         self._checks: dict[str, CheckState] = {}
         self._events: list[dict[str, Any]] = []
         self._max_events = max_events
         self._lock = threading.Lock()
+        # Generations are seeded from the wall clock so they keep increasing
+        # across restarts; instance_id additionally scopes cache validators.
+        self.instance_id = secrets.token_hex(4)
+        self._generation = now_us()
+        self._proxmox_generation = 0
+        self._portainer_generation = 0
+        self._events_generation = 0
+        self._change_log: list[tuple[int, str]] = []
+        self._tombstones: deque[tuple[str, int]] = deque(maxlen=_MAX_TOMBSTONES)
+        self._delta_floor = self._generation
+        self._published = StateSnapshot(
+            generation=self._generation,
+            checks=MappingProxyType({}),
+            delta_floor=self._delta_floor,
+        )
+        self._pending: dict[str, dict[str, Any] | None] = {}
+        self._batch_depth = 0
+        self._published_at = time.monotonic()
+        self._tags: dict[str, tuple[str, ...]] = {}
+        self._tag_index: dict[str, dict[str, None]] = {}
+        self._tag_index_dirty = False
+        self._agg_keys: dict[str, tuple[str, tuple[str, ...]]] = {}
+        self._status_counts = {"up": 0, "down": 0, "unknown": 0}
+        self._down_ids: dict[str, None] = {}
+        self._tag_counts: dict[str, dict[str, int]] = {}
+        self._latency_keys: dict[str, tuple[int, tuple[str, ...]]] = {}
+        self._tag_latencies: dict[str, list[int]] = {}
+        self._tag_p95: dict[str, int | None] = {}
+        self._latency_dirty_tags: set[str] = set()
+        self._latency_hists: dict[str, CheckLatencyHistograms] = {}
+        self._baselines: dict[str, LatencyBaseline] = {}
+        self._flaps: dict[str, FlapTracker] = {}
+        self._parents: dict[str, str] = {}
+        self._incidents = IncidentTracker(window_s=incident_window_s)
+        self._availability = AvailabilityTracker(max_gap_s=availability_max_gap_s)
         self._proxmox_stats = ProxmoxStatsCache()
+        self._portainer = PortainerCache()
+        self._proxmox_issues = ProxmoxIssueTracker()
+        self._listeners: list[Callable[[str, dict[str, Any]], None]] = []
+        # Latency samples and availability day rows waiting for ``flush``.
+        self._pending_samples: list[tuple[str, int, int]] = []
+        self._dirty_days: dict[tuple[str, int], tuple[float, float]] = {}
+        self._flush_lock = threading.Lock()
         self._persistence = (
             SQLitePersistence(db_path, max_events=max_events) if db_path else None
         )
@@ -86,10 +350,356 @@ class StateStore:
 
         persisted = self._persistence.load_all_check_states()
         self._checks = {
-            check_id: CheckState(**state_dict)
+            check_id: CheckState.from_dict(state_dict)
             for check_id, state_dict in persisted.items()
         }
         self._events = self._persistence.load_recent_events(self._max_events)
+        self._proxmox_issues.load(
+            self._persistence.load_open_issues(), self._events, iso_to_us
+        )
+        since_us = now_us() - MAX_WINDOW_S * 1_000_000
+        for check_id, ts_us, latency_ms in self._persistence.load_latency_samples(since_us):
+            if check_id in self._checks:
+                self._record_latency_locked(check_id, latency_ms, ts_us)
+        self._availability.load(
+            self._persistence.load_availability_days(
+                day_of(now_us()) - self._availability.retention_days
+            )
+        )
+        self._incidents.load(
+            Incident.from_record(record)
+            for record in self._persistence.load_incidents(limit=200)
+        )
+        with self.batch():
+            for check_id in self._checks:
+                self._mark_dirty_locked(check_id)
+
+    def _mark_dirty_locked(self, check_id: str) -> dict[str, Any] | None:
+        """Record a state change and return the check's new serialized view."""
+        self._generation += 1
+        cs = self._checks.get(check_id)
+        view = cs.to_dict() if cs is not None else None
+        self._pending[check_id] = view
+        self._aggregate_locked(check_id, cs)
+        self._track_latency_locked(check_id, cs)
+
+        if cs is not None:
+            self._change_log.append((self._generation, check_id))
+        else:
+            if len(self._tombstones) == self._tombstones.maxlen:
+                self._delta_floor = self._tombstones[0][1]
+            self._tombstones.append((check_id, self._generation))
+
+        if self._listeners:
+            self._emit_locked(
+                "state",
+                {"generation": self._generation, "id": check_id, "state": view},
+            )
+        if (
+            self._batch_depth == 0
+            or time.monotonic() - self._published_at >= _BATCH_PUBLISH_INTERVAL_S
+        ):
+            self._publish_locked()
+        return view
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        start = time.perf_counter()
+        self._lock.acquire()
+        timings.record("store.lock_wait", time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def add_listener(self, listener: Callable[[str, dict[str, Any]], None]) -> None:
+        """Register a callback for ``state`` and ``transition`` changes.
+
+        Listeners run on the writer's thread while the store lock is held, so
+        they must only hand the change off (e.g. to a queue) and return.
+        """
+        with self._locked():
+            self._listeners.append(listener)
+
+    def _emit_locked(self, kind: str, data: dict[str, Any]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(kind, data)
+            except Exception:
+                # A broken subscriber must never fail a store update.
+                continue
+
+    def _set_tags_locked(self, check_id: str, tags: Iterable[str]) -> bool:
+        new_tags = tuple(dict.fromkeys(tags))
+        old_tags = self._tags.get(check_id, ())
+        if old_tags == new_tags:
+            return False
+
+        for tag in old_tags:
+            members = self._tag_index.get(tag)
+            if members is not None:
+                members.pop(check_id, None)
+                if not members:
+                    del self._tag_index[tag]
+        for tag in new_tags:
+            self._tag_index.setdefault(tag, {})[check_id] = None
+
+        if new_tags:
+            self._tags[check_id] = new_tags
+        else:
+            self._tags.pop(check_id, None)
+        self._tag_index_dirty = True
+        return True
+
+    def _track_latency_locked(self, check_id: str, cs: CheckState | None) -> None:
+        old = self._latency_keys.get(check_id)
+        new = None
+        if cs is not None and cs.latency_ms is not None:
+            new = (cs.latency_ms, self._tags.get(check_id, ()))
+        if old == new:
+            return
+
+        if old is not None:
+            old_latency, old_tags = old
+            for tag in old_tags:
+                values = self._tag_latencies[tag]
+                del values[bisect.bisect_left(values, old_latency)]
+                if not values:
+                    del self._tag_latencies[tag]
+                self._latency_dirty_tags.add(tag)
+        if new is None:
+            self._latency_keys.pop(check_id, None)
+            return
+
+        new_latency, new_tags = new
+        self._latency_keys[check_id] = new
+        for tag in new_tags:
+            bisect.insort(self._tag_latencies.setdefault(tag, []), new_latency)
+            self._latency_dirty_tags.add(tag)
+
+    def _record_latency_locked(self, check_id: str, latency_ms: int, ts_us: int) -> None:
+        hists = self._latency_hists.get(check_id)
+        if hists is None:
+            hists = self._latency_hists[check_id] = CheckLatencyHistograms()
+        hists.record(latency_ms, ts_us / 1_000_000)
+
+    def _observe_anomaly_locked(
+        self,
+        check_id: str,
+        raw_ok: bool,
+        effective_ok: bool | None,
+        latency_ms: int | None,
+        anomaly: Mapping[str, Any] | None,
+    ) -> str | None:
+        cfg = AnomalySettings.from_dict(anomaly)
+        if not cfg.enabled:
+            self._baselines.pop(check_id, None)
+            return None
+        baseline = self._baselines.get(check_id)
+        if baseline is None:
+            baseline = self._baselines[check_id] = LatencyBaseline()
+        if effective_ok is not True:
+            # DOWN/unknown supersedes DEGRADED; no RECOVERED is sent for it.
+            baseline.reset_state()
+            return None
+        if not raw_ok or latency_ms is None:
+            return None
+        return baseline.observe(latency_ms, cfg)
+
+    def _observe_flap_locked(
+        self,
+        cs: CheckState,
+        changed: bool,
+        run_us: int,
+        flap: Mapping[str, Any] | None,
+    ) -> tuple[str | None, str | None]:
+        """Update flap tracking; return ``(FLAPPING|STABLE|None, detail)``."""
+        cfg = FlapSettings.from_dict(flap)
+        if not cfg.enabled:
+            self._flaps.pop(cs.id, None)
+            cs.flapping = False
+            return None, None
+        tracker = self._flaps.get(cs.id)
+        if tracker is None:
+            tracker = self._flaps[cs.id] = FlapTracker()
+            if cs.flapping:
+                tracker.resume(cfg, cs.last_change_us)
+
+        edge = tracker.record(changed, run_us, cfg)
+        cs.flapping = tracker.flapping
+        if edge == "FLAPPING":
+            return edge, (
+                f"state changed on {tracker.rate:.0%} of recent probes; "
+                "UP/DOWN notifications suppressed"
+            )
+        if edge == "STABLE":
+            minutes = (run_us - (tracker.since_us or run_us)) / 60_000_000
+            return edge, (
+                f"settled {_STATUS_KEYS[cs.ok].upper()} after "
+                f"{tracker.transitions} transitions over {minutes:.0f}m"
+            )
+        return None, None
+
+    def _correlate_locked(self, check_id: str, event: dict[str, Any], ts_us: int) -> None:
+        """Feed a DOWN/UP-like event to the incident tracker and persist it."""
+        name = event["event"]
+        if name in {"DOWN", "INIT", "STABLE"} and event["ok"] is False:
+            keys = correlation_keys(
+                check_id, self._tags.get(check_id, ()), self._parents.get(check_id)
+            )
+            incident: Incident | None = self._incidents.on_down(check_id, ts_us, keys)
+        elif name in {"UP", "STABLE"} and event["ok"] is True:
+            incident = self._incidents.on_up(check_id, ts_us)
+        else:
+            return
+        if incident is not None and self._persistence:
+            with timings.time("store.persist.upsert_incident"):
+                self._persistence.upsert_incident(incident.to_record())
+
+    def _aggregate_locked(self, check_id: str, cs: CheckState | None) -> None:
+        old = self._agg_keys.get(check_id)
+        new = None
+        if cs is not None:
+            new = (_STATUS_KEYS[cs.ok], self._tags.get(check_id, ()))
+        if old == new:
+            return
+
+        if old is not None:
+            old_key, old_tags = old
+            self._status_counts[old_key] -= 1
+            for tag in old_tags:
+                counts = self._tag_counts[tag]
+                counts[old_key] -= 1
+                counts["total"] -= 1
+                if counts["total"] == 0:
+                    del self._tag_counts[tag]
+            if old_key == "down" and (new is None or new[0] != "down"):
+                del self._down_ids[check_id]
+
+        if new is None:
+            del self._agg_keys[check_id]
+            return
+
+        new_key, new_tags = new
+        self._agg_keys[check_id] = new
+        self._status_counts[new_key] += 1
+        for tag in new_tags:
+            counts = self._tag_counts.setdefault(
+                tag, {"total": 0, "up": 0, "down": 0, "unknown": 0}
+            )
+            counts[new_key] += 1
+            counts["total"] += 1
+        if new_key == "down":
+            self._down_ids[check_id] = None
+
+    def _publish_locked(self) -> None:
+        if not self._pending:
+            return
+        self._published_at = time.monotonic()
+        checks = dict(self._published.checks)
+        for check_id, view in self._pending.items():
+            if view is None:
+                checks.pop(check_id, None)
+            else:
+                checks[check_id] = view
+        self._pending = {}
+        for tag in self._latency_dirty_tags:
+            values = self._tag_latencies.get(tag)
+            if values:
+                self._tag_p95[tag] = values[max(0, math.ceil(0.95 * len(values)) - 1)]
+            else:
+                self._tag_p95.pop(tag, None)
+        self._latency_dirty_tags.clear()
+        if len(self._change_log) > 2 * len(self._checks) + _MAX_TOMBSTONES:
+            self._compact_change_log_locked()
+
+        aggregates = StatusAggregates(
+            up=self._status_counts["up"],
+            down=self._status_counts["down"],
+            unknown=self._status_counts["unknown"],
+            down_ids=tuple(self._down_ids),
+            tag_counts=MappingProxyType(
+                {tag: MappingProxyType(dict(c)) for tag, c in self._tag_counts.items()}
+            ),
+            tag_latency_p95=MappingProxyType(dict(self._tag_p95)),
+        )
+        tag_index = self._published.tag_index
+        if self._tag_index_dirty:
+            tag_index = MappingProxyType(
+                {tag: tuple(ids) for tag, ids in self._tag_index.items()}
+            )
+            self._tag_index_dirty = False
+        self._published = StateSnapshot(
+            generation=self._generation,
+            checks=MappingProxyType(checks),
+            aggregates=aggregates,
+            tag_index=tag_index,
+            change_log=self._change_log,
+            change_log_len=len(self._change_log),
+            removed=tuple(self._tombstones),
+            delta_floor=self._delta_floor,
+        )
+
+    def _compact_change_log_locked(self) -> None:
+        """Keep only the newest entry per live check, in a fresh list.
+
+        Published snapshots keep the old list, so they are unaffected.
+        """
+        latest: dict[str, int] = {}
+        for gen, check_id in self._change_log:
+            latest[check_id] = gen
+        self._change_log = sorted(
+            (gen, check_id) for check_id, gen in latest.items() if check_id in self._checks
+        )
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer publishing until the outermost batch exits.
+
+        Long batches still publish every ``_BATCH_PUBLISH_INTERVAL_S``.
+        """
+        with self._locked():
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._locked():
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+                if outermost:
+                    self._publish_locked()
+            if outermost:
+                self.flush()
+
+    def _buffer_days_locked(
+        self, check_id: str, touched_days: list[tuple[int, float, float]]
+    ) -> None:
+        if self._persistence is None:
+            return
+        for day, up_s, down_s in touched_days:
+            self._dirty_days[(check_id, day)] = (up_s, down_s)
+
+    def flush(self) -> None:
+        """Write buffered latency samples and availability days.
+
+        One SQLite transaction per call, made after the store lock is
+        released. Called when the outermost ``batch`` exits (once per probe
+        cycle) or after an update made outside a batch.
+        """
+        if self._persistence is None:
+            return
+        # Serializes flushes so day rows (absolute totals) land in order.
+        with self._flush_lock:
+            with self._locked():
+                samples, self._pending_samples = self._pending_samples, []
+                days, self._dirty_days = self._dirty_days, {}
+            if not samples and not days:
+                return
+            with timings.time("store.persist.write_probe_data"):
+                self._persistence.write_probe_data(
+                    samples,
+                    [(cid, day, up_s, down_s) for (cid, day), (up_s, down_s) in days.items()],
+                )
 
     def _build_event(
         self,
@@ -97,9 +707,10 @@ class StateStore:
         check_id: str,
         event_name: str,
         ok: bool,
-        latency_ms: int,
+        latency_ms: int | None,
         status_code: int | None,
         error: str | None,
+        detail: str | None = None,
     ) -> dict[str, Any]:
         return {
             "ts": ts,
@@ -109,6 +720,7 @@ class StateStore:
             "latency_ms": latency_ms,
             "status_code": status_code,
             "error": error,
+            "detail": detail,
         }
 
     def ensure_check(
@@ -116,34 +728,60 @@ class StateStore:
         check_id: str,
         check_type: str,
         down_threshold: int = 1,
+        tags: Iterable[str] | None = None,
+        depends_on: str | None = None,
     ) -> None:
-        with self._lock:
-            if check_id not in self._checks:
+        threshold = max(1, int(down_threshold))
+        with self._locked():
+            if depends_on:
+                self._parents[check_id] = depends_on
+            else:
+                self._parents.pop(check_id, None)
+            tags_changed = False
+            if tags is not None:
+                tags_changed = self._set_tags_locked(check_id, tags)
+
+            cs = self._checks.get(check_id)
+            if cs is None:
                 cs = CheckState(
                     id=check_id,
                     type=check_type,
-                    down_threshold=max(1, int(down_threshold)),
+                    down_threshold=threshold,
                 )
                 self._checks[check_id] = cs
+            elif cs.down_threshold != threshold:
+                cs.down_threshold = threshold
+            elif tags_changed:
+                self._mark_dirty_locked(check_id)
+                return
             else:
-                cs = self._checks[check_id]
-                cs.down_threshold = max(1, int(down_threshold))
+                return
 
+            view = self._mark_dirty_locked(check_id)
             if self._persistence:
-                self._persistence.upsert_check_state(cs.to_dict())
+                with timings.time("store.persist.upsert_check_state"):
+                    self._persistence.upsert_check_state(view)
 
     def update(
         self,
         check_id: str,
         ok: bool,
-        latency_ms: int,
+        latency_ms: int | None,
         status_code: int | None = None,
         error: str | None = None,
         down_threshold: int = 1,
+        anomaly: Mapping[str, Any] | None = None,
+        flap: Mapping[str, Any] | None = None,
     ) -> dict[str, Any] | None:
-        with self._lock:
+        """Record a probe result and return the event it produced, if any.
+
+        Events are INIT/UP/DOWN, DEGRADED/RECOVERED (latency anomalies) and
+        FLAPPING/STABLE. UP/DOWN are suppressed while the check is flapping.
+        ``anomaly`` and ``flap`` hold the check's normalized settings.
+        """
+        with self._locked():
             cs = self._checks[check_id]
-            is_first_observation = cs.last_run is None
+            is_first_observation = cs.last_run_us is None
             prev_ok = cs.ok
 
             cs.down_threshold = max(1, int(down_threshold))
@@ -159,20 +797,37 @@ class StateStore:
                 else:
                     effective_ok = prev_ok
 
+            run_us = now_us()
+            run_ts = us_to_iso(run_us)
+            touched_days = self._availability.accrue(
+                check_id, prev_ok, cs.last_run_us, run_us
+            )
+            self._buffer_days_locked(check_id, touched_days)
             cs.ok = effective_ok
-            cs.last_run = now_iso()
+            cs.last_run_us = run_us
             cs.latency_ms = latency_ms
             cs.status_code = status_code
-            cs.error = error
+            cs.error = intern_str(error)
 
             if effective_ok is True:
-                cs.last_ok = cs.last_run
+                cs.last_ok_us = run_us
+            if latency_ms is not None:
+                self._record_latency_locked(check_id, latency_ms, run_us)
+                if self._persistence:
+                    self._pending_samples.append((check_id, run_us, latency_ms))
+
+            changed = prev_ok != effective_ok
+            flap_event, flap_detail = (None, None)
+            if not is_first_observation:
+                flap_event, flap_detail = self._observe_flap_locked(
+                    cs, changed, run_us, flap
+                )
 
             event: dict[str, Any] | None = None
             if is_first_observation:
-                cs.last_change = cs.last_run
+                cs.last_change_us = run_us
                 event = self._build_event(
-                    ts=cs.last_run,
+                    ts=run_ts,
                     check_id=check_id,
                     event_name="INIT",
                     ok=effective_ok,
@@ -180,57 +835,278 @@ class StateStore:
                     status_code=status_code,
                     error=error,
                 )
-            elif prev_ok != effective_ok:
-                cs.last_change = cs.last_run
+            elif flap_event is not None:
+                if changed:
+                    cs.last_change_us = run_us
                 event = self._build_event(
-                    ts=cs.last_run,
+                    ts=run_ts,
                     check_id=check_id,
-                    event_name="UP" if effective_ok else "DOWN",
+                    event_name=flap_event,
                     ok=effective_ok,
                     latency_ms=latency_ms,
                     status_code=status_code,
                     error=error,
+                    detail=flap_detail,
+                )
+            elif changed:
+                cs.last_change_us = run_us
+                if not cs.flapping:
+                    event = self._build_event(
+                        ts=run_ts,
+                        check_id=check_id,
+                        event_name="UP" if effective_ok else "DOWN",
+                        ok=effective_ok,
+                        latency_ms=latency_ms,
+                        status_code=status_code,
+                        error=error,
+                    )
+            elif not cs.flapping:
+                anomaly_event = self._observe_anomaly_locked(
+                    check_id, ok, effective_ok, latency_ms, anomaly
                 )
+                if anomaly_event is not None:
+                    event = self._build_event(
+                        ts=run_ts,
+                        check_id=check_id,
+                        event_name=anomaly_event,
+                        ok=effective_ok,
+                        latency_ms=latency_ms,
+                        status_code=status_code,
+                        error=error,
+                    )
+            if changed and effective_ok is not True:
+                baseline = self._baselines.get(check_id)
+                if baseline is not None:
+                    baseline.reset_state()
 
             if event is not None:
-                self._events.append(event)
-                if self._persistence:
-                    self._persistence.insert_event(event)
+                self._correlate_locked(check_id, event, run_us)
+                self._append_event_locked(event)
+
+            view = self._mark_dirty_locked(check_id)
+            if self._persistence:
+                with timings.time("store.persist.upsert_check_state"):
+                    self._persistence.upsert_check_state(view)
+
+        if self._batch_depth == 0:
+            self.flush()
+        return event
 
-            if len(self._events) > self._max_events:
-                self._events = self._events[-self._max_events :]
+    def mark_unknown(self, check_id: str, error: str) -> None:
+        """Age a check to unknown when there is nothing to judge it by.
 
+        Used for container checks whose Portainer data went stale. No event
+        is recorded; the time since the last result counts towards the state
+        the check had.
+        """
+        with self._locked():
+            cs = self._checks[check_id]
+            if cs.ok is None and cs.error == error:
+                return
+            run_us = now_us()
+            touched_days = self._availability.accrue(
+                check_id, cs.ok, cs.last_run_us, run_us
+            )
+            self._buffer_days_locked(check_id, touched_days)
+            cs.ok = None
+            cs.fail_count = 0
+            cs.last_run_us = run_us
+            cs.latency_ms = None
+            cs.status_code = None
+            cs.error = intern_str(error)
+
+            view = self._mark_dirty_locked(check_id)
             if self._persistence:
-                self._persistence.upsert_check_state(cs.to_dict())
+                with timings.time("store.persist.upsert_check_state"):
+                    self._persistence.upsert_check_state(view)
+        if self._batch_depth == 0:
+            self.flush()
+
+    def _append_event_locked(self, event: dict[str, Any], kind: str = "transition") -> None:
+        self._events.append(event)
+        self._events_generation += 1
+        if self._listeners:
+            self._emit_locked(kind, event)
+        if self._persistence:
+            with timings.time("store.persist.insert_event"):
+                self._persistence.insert_event(event)
+        if len(self._events) > self._max_events:
+            self._events = self._events[-self._max_events :]
+
+    def published(self) -> StateSnapshot:
+        """Latest published snapshot; lock-free, returns a shared reference."""
+        return self._published
 
-            return event
+    @property
+    def generation(self) -> int:
+        """Generation of the latest published check snapshot."""
+        return self._published.generation
+
+    @property
+    def events_generation(self) -> int:
+        """Bumped on every appended event, check transition or not."""
+        return self._events_generation
+
+    @property
+    def proxmox_generation(self) -> int:
+        return self._proxmox_generation
+
+    @property
+    def portainer_generation(self) -> int:
+        return self._portainer_generation
+
+    @property
+    def portainer_last_success_ts(self) -> datetime | None:
+        """Lock-free: the cache is replaced, never mutated."""
+        return self._portainer.last_success_ts
 
     def snapshot(self) -> dict[str, Any]:
-        with self._lock:
-            return {k: v.to_dict() for k, v in self._checks.items()}
+        return dict(self._published.checks)
+
+    def select_checks(
+        self,
+        ids: Iterable[str] | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        """Check views filtered by id and/or tag (any of ``tags``).
+
+        Cost is proportional to the ids/tagged checks selected, not the total
+        number of checks.
+        """
+        snap = self._published
+        if tags is not None:
+            candidates: Iterable[str] = dict.fromkeys(
+                check_id for tag in tags for check_id in snap.tag_index.get(tag, ())
+            )
+            if ids is not None:
+                wanted = set(ids)
+                candidates = [cid for cid in candidates if cid in wanted]
+        elif ids is not None:
+            candidates = ids
+        else:
+            return dict(snap.checks)
+        return {cid: snap.checks[cid] for cid in candidates if cid in snap.checks}
+
+    def tag_members(self, tags: Iterable[str]) -> set[str]:
+        index = self._published.tag_index
+        return {check_id for tag in tags for check_id in index.get(tag, ())}
+
+    def changes_since(self, since: int) -> dict[str, Any]:
+        """Checks modified and ids removed after generation ``since``.
+
+        Falls back to a full resync (``full: True``) when ``since`` predates
+        the retained removal history or this process.
+        """
+        snap = self._published
+        if since < snap.delta_floor or since > snap.generation:
+            return {
+                "generation": snap.generation,
+                "full": True,
+                "changed": dict(snap.checks),
+                "removed": [],
+            }
+
+        # Walk back from the newest change; ids end up newest change first.
+        newest_first: dict[str, None] = {}
+        log = snap.change_log
+        for i in range(snap.change_log_len - 1, -1, -1):
+            gen, check_id = log[i]
+            if gen <= since:
+                break
+            newest_first.setdefault(check_id, None)
+        changed_ids = [cid for cid in reversed(newest_first) if cid in snap.checks]
+
+        removed = list(
+            dict.fromkeys(
+                check_id
+                for check_id, gen in snap.removed
+                if gen > since and check_id not in snap.checks
+            )
+        )
+        return {
+            "generation": snap.generation,
+            "full": False,
+            "changed": {cid: snap.checks[cid] for cid in changed_ids},
+            "removed": removed,
+        }
 
     def check_state(self, check_id: str) -> dict[str, Any]:
-        with self._lock:
+        with self._locked():
             return self._checks[check_id].to_dict()
 
-    def summary(self) -> dict[str, Any]:
-        snap = self.snapshot()
-        total = len(snap)
-        up = sum(1 for v in snap.values() if v["ok"] is True)
-        down = sum(1 for v in snap.values() if v["ok"] is False)
-        unknown = sum(1 for v in snap.values() if v["ok"] is None)
-        down_checks = [v for v in snap.values() if v["ok"] is False]
+    def latency_percentiles(self, check_id: str) -> dict[str, dict[str, Any]]:
+        """p50/p90/p99 per sliding window (5m, 1h, 24h) for one check.
+
+        Raises ``KeyError`` for unknown checks.
+        """
+        with self._locked():
+            if check_id not in self._checks:
+                raise KeyError(check_id)
+            hists = self._latency_hists.get(check_id) or CheckLatencyHistograms()
+            return hists.summary(time.time())
 
+    def availability(self, check_id: str, first_day: int, last_day: int) -> dict[str, Any]:
+        """Up/down/no-data seconds over UTC days ``first_day..last_day``.
+
+        Raises ``KeyError`` for unknown checks.
+        """
+        with self._locked():
+            if check_id not in self._checks:
+                raise KeyError(check_id)
+            return self._availability.availability(
+                check_id, first_day, last_day, now_us()
+            )
+
+    def incidents(self, limit: int = 50, status: str = "all") -> list[dict[str, Any]]:
+        """Recent incidents, newest first (``open``, ``resolved`` or ``all``)."""
+        with self._locked():
+            return self._incidents.recent(limit, status=status)
+
+    def incident(self, incident_id: int) -> dict[str, Any] | None:
+        with self._locked():
+            incident = self._incidents.get(incident_id)
+            return incident.to_dict() if incident is not None else None
+
+    def incidents_since(self, start_us: int) -> list[dict[str, Any]]:
+        """Incidents still open or resolved after ``start_us``, oldest first."""
+        with self._locked():
+            return self._incidents.overlapping(start_us)
+
+    def summary(self) -> dict[str, Any]:
+        snap = self._published
+        agg = snap.aggregates
         return {
-            "total": total,
-            "up": up,
-            "down": down,
-            "unknown": unknown,
-            "down_checks": down_checks,
+            "total": agg.total,
+            "up": agg.up,
+            "down": agg.down,
+            "unknown": agg.unknown,
+            "down_checks": [snap.checks[cid] for cid in agg.down_ids],
         }
 
+    def tag_summaries(self) -> dict[str, dict[str, Any]]:
+        """Per-tag counts, worst status and p95 latency from the aggregates."""
+        agg = self._published.aggregates
+        out: dict[str, dict[str, Any]] = {}
+        for tag, counts in agg.tag_counts.items():
+            if counts["down"]:
+                worst = "down"
+            elif counts["unknown"]:
+                worst = "unknown"
+            else:
+                worst = "up"
+            out[tag] = {
+                "tag": tag,
+                "total": counts["total"],
+                "up": counts["up"],
+                "down": counts["down"],
+                "unknown": counts["unknown"],
+                "worst": worst,
+                "latency_p95_ms": agg.tag_latency_p95.get(tag),
+            }
+        return out
+
     def events(self, limit: int = 50) -> list[dict[str, Any]]:
-        with self._lock:
+        with self._locked():
             return list(reversed(self._events[-limit:]))
 
     def update_proxmox_stats(
@@ -239,26 +1115,117 @@ class StateStore:
         fetch_ts: datetime | None = None,
     ) -> None:
         ts = fetch_ts or datetime.now(timezone.utc)
-        with self._lock:
+        with self._locked():
+            previous = self._proxmox_stats.last_payload
             self._proxmox_stats = apply_proxmox_fetch_result(
                 current=self._proxmox_stats,
                 fetch_result=fetch_result,
                 fetch_ts=ts,
             )
+            self._proxmox_generation += 1
+            payload = self._proxmox_stats.last_payload
+            if payload is not previous and isinstance(payload, dict):
+                self._diff_proxmox_issues_locked(payload, ts)
 
-    def proxmox_stats_snapshot(self) -> ProxmoxStatsCache:
-        with self._lock:
-            payload = None
-            if isinstance(self._proxmox_stats.last_payload, dict):
-                payload = dict(self._proxmox_stats.last_payload)
-            return ProxmoxStatsCache(
-                last_payload=payload,
-                last_fetch_ts=self._proxmox_stats.last_fetch_ts,
-                last_error=self._proxmox_stats.last_error,
+    def update_portainer(
+        self,
+        fetch_result: dict[str, Any] | None,
+        fetch_ts: datetime | None = None,
+    ) -> None:
+        ts = fetch_ts or datetime.now(timezone.utc)
+        with self._locked():
+            self._portainer = apply_portainer_fetch_result(
+                current=self._portainer,
+                fetch_result=fetch_result,
+                fetch_ts=ts,
             )
+            self._portainer_generation += 1
+
+    def _diff_proxmox_issues_locked(self, payload: dict[str, Any], ts: datetime) -> None:
+        issues = payload.get("issues")
+        if not isinstance(issues, list):
+            issues = []
+        ts_us = iso_to_us(ts.isoformat()) or now_us()
+        for change, key, issue in self._proxmox_issues.observe(issues, ts_us):
+            self._append_event_locked(
+                self._build_event(
+                    ts=us_to_iso(ts_us),
+                    check_id=f"{EVENT_PREFIX}{key}",
+                    event_name=change,
+                    ok=change == "RESOLVED",
+                    latency_ms=None,
+                    status_code=None,
+                    error=None,
+                    detail=describe_issue(issue),
+                ),
+                # Not a check transition: kept out of per-check metrics.
+                kind="issue",
+            )
+            if self._persistence is None:
+                continue
+            if change == "APPEARED":
+                self._persistence.upsert_open_issue(key, issue, ts_us)
+            else:
+                self._persistence.delete_open_issue(key)
+
+    def proxmox_issues(self, limit: int = 50) -> dict[str, Any]:
+        """Open proxmox issues and their recent APPEARED/RESOLVED changes."""
+        with self._locked():
+            open_issues = self._proxmox_issues.open_issues()
+            history = self._proxmox_issues.history(limit)
+        return {
+            "open": [
+                {"key": e["key"], "issue": e["issue"], "since": us_to_iso(e["since_us"])}
+                for e in open_issues
+            ],
+            "history": [
+                {
+                    "ts": us_to_iso(e["ts_us"]),
+                    "change": e["change"],
+                    "key": e["key"],
+                    "issue": e["issue"],
+                    "duration_s": e.get("duration_s"),
+                }
+                for e in history
+            ],
+        }
+
+    @property
+    def persistence(self) -> SQLitePersistence | None:
+        """SQLite backend shared with other writers (e.g. the notification outbox)."""
+        return self._persistence
+
+    def read_pool_stats(self) -> list[dict[str, Any]]:
+        if self._persistence is None:
+            return []
+        return self._persistence.read_pool_stats()
+
+    def proxmox_stats_snapshot(self) -> ProxmoxStatsCache:
+        """The current cache; it is replaced, never mutated, so it is shared.
+
+        Callers must treat ``last_payload`` as read-only.
+        """
+        with self._locked():
+            return self._proxmox_stats
+
+    def portainer_snapshot(self) -> PortainerCache:
+        """The current Portainer cache; shared and read-only like the proxmox one."""
+        with self._locked():
+            return self._portainer
 
     def prune(self, active_ids: set[str]) -> list[str]:
-        removed = [cid for cid in self._checks.keys() if cid not in active_ids]
-        for cid in removed:
-            del self._checks[cid]
-        return removed
+        with self._locked():
+            removed = [cid for cid in self._checks.keys() if cid not in active_ids]
+            for cid in removed:
+                del self._checks[cid]
+                self._latency_hists.pop(cid, None)
+                self._availability.forget(cid)
+                self._baselines.pop(cid, None)
+                self._flaps.pop(cid, None)
+                self._parents.pop(cid, None)
+                incident = self._incidents.forget_check(cid, now_us())
+                if incident is not None and self._persistence:
+                    self._persistence.upsert_incident(incident.to_record())
+                self._set_tags_locked(cid, ())
+                self._mark_dirty_locked(cid)
+            return removed
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from app.state import now_us
+
+STREAM_HISTORY = 1000
+SUBSCRIBER_BUFFER = 256
+
+
+@dataclass(frozen=True)
+class StreamMessage:
+    id: int
+    event: str
+    payload: bytes
+
+
+def encode_sse(msg_id: int, event: str, data: dict[str, Any]) -> bytes:
+    body = json.dumps(data, separators=(",", ":"))
+    return f"id: {msg_id}\nevent: {event}\ndata: {body}\n\n".encode("utf-8")
+
+
+class StreamSubscriber:
+    """Bounded per-client buffer fed from the publisher thread.
+
+    Messages are handed to the subscriber's event loop with
+    ``call_soon_threadsafe`` so publishing never blocks. When the buffer is
+    full the subscriber is marked dropped and receives ``None``.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_buffer: int) -> None:
+        self._loop = loop
+        self._queue: asyncio.Queue[StreamMessage | None] = asyncio.Queue()
+        self._max_buffer = max_buffer
+        self.dropped = False
+
+    def offer(self, msg: StreamMessage) -> bool:
+        if self.dropped:
+            return False
+        try:
+            self._loop.call_soon_threadsafe(self._put, msg)
+        except RuntimeError:
+            # Event loop already closed.
+            self.dropped = True
+            return False
+        return True
+
+    def _put(self, msg: StreamMessage) -> None:
+        if self.dropped:
+            return
+        if self._queue.qsize() >= self._max_buffer:
+            self.dropped = True
+            self._queue.put_nowait(None)
+            return
+        self._queue.put_nowait(msg)
+
+    async def get(self) -> StreamMessage | None:
+        return await self._queue.get()
+
+
+class StreamBroker:
+    """Fan-out of state changes to SSE subscribers with a replay window."""
+
+    def __init__(
+        self,
+        history: int = STREAM_HISTORY,
+        max_buffer: int = SUBSCRIBER_BUFFER,
+    ) -> None:
+        self._lock = threading.Lock()
+        # Seeded from the wall clock so ids keep increasing across restarts.
+        self._seq = now_us()
+        self._history: deque[StreamMessage] = deque(maxlen=history)
+        self._subscribers: set[StreamSubscriber] = set()
+        self._max_buffer = max_buffer
+        self.dropped_total = 0
+
+    def publish(self, event: str, data: dict[str, Any]) -> None:
+        with self._lock:
+            self._seq += 1
+            msg = StreamMessage(self._seq, event, encode_sse(self._seq, event, data))
+            self._history.append(msg)
+            for sub in list(self._subscribers):
+                if not sub.offer(msg):
+                    self._subscribers.discard(sub)
+                    self.dropped_total += 1
+
+    def subscribe(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        last_event_id: int | None = None,
+    ) -> tuple[StreamSubscriber, list[StreamMessage] | None]:
+        """Register a subscriber and return the replay backlog.
+
+        The backlog is ``None`` when ``last_event_id`` can no longer be
+        resumed from history and the client has to resync.
+        """
+        sub = StreamSubscriber(loop, self._max_buffer)
+        with self._lock:
+            self._subscribers.add(sub)
+            if last_event_id is None:
+                return sub, []
+            oldest = self._history[0].id if self._history else self._seq + 1
+            if last_event_id > self._seq or last_event_id < oldest - 1:
+                return sub, None
+            return sub, [m for m in self._history if m.id > last_event_id]
+
+    def unsubscribe(self, sub: StreamSubscriber) -> None:
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.discard(sub)
+                if sub.dropped:
+                    self.dropped_total += 1
+
+    def current_id(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+WINDOW_SIZE = 1024
+
+
+class RollingTimer:
+    """Fixed-size ring of recent durations plus lifetime totals.
+
+    Recording is O(1) and allocation-free; percentiles are computed only
+    when the stats are read.
+    """
+
+    __slots__ = ("_samples", "_next", "_filled", "count", "total_s", "max_s")
+
+    def __init__(self, size: int = WINDOW_SIZE) -> None:
+        self._samples = [0.0] * size
+        self._next = 0
+        self._filled = 0
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._samples[self._next] = seconds
+        self._next = (self._next + 1) % len(self._samples)
+        if self._filled < len(self._samples):
+            self._filled += 1
+        self.count += 1
+        self.total_s += seconds
+        if seconds > self.max_s:
+            self.max_s = seconds
+
+    def stats(self) -> dict[str, Any]:
+        window = sorted(self._samples[: self._filled])
+
+        def pct(q: float) -> float | None:
+            if not window:
+                return None
+            idx = max(0, math.ceil(q * len(window)) - 1)
+            return round(window[idx] * 1000, 3)
+
+        return {
+            "count": self.count,
+            "window": len(window),
+            "total_ms": round(self.total_s * 1000, 3),
+            "mean_ms": round(sum(window) / len(window) * 1000, 3) if window else None,
+            "p50_ms": pct(0.50),
+            "p90_ms": pct(0.90),
+            "p99_ms": pct(0.99),
+            "window_max_ms": round(window[-1] * 1000, 3) if window else None,
+            "max_ms": round(self.max_s * 1000, 3),
+        }
+
+
+class TimingRegistry:
+    def __init__(self, window: int = WINDOW_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._window = window
+        self._timers: dict[str, RollingTimer] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = RollingTimer(self._window)
+            timer.record(seconds)
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            timers = list(self._timers.items())
+        # Percentiles are computed outside the lock; a sample recorded
+        # concurrently may or may not be included.
+        return {name: timer.stats() for name, timer in sorted(timers)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+
+
+timings = TimingRegistry()
@@ -0,0 +1,167 @@
+"""Bytes-per-check comparison for ``CheckState`` and the whole ``StateStore``.
+
+Builds N check states shaped like a template-generated registry (repeated
+types and error messages, per-check timestamps) and measures retained memory
+with ``tracemalloc`` for the previous dict-backed dataclass layout and the
+current slotted layout.
+
+The bare ``CheckState`` is only part of what a check costs. The store also
+keeps the serialized view of every check in the published snapshot, the
+delta change log, aggregates and, once a check has been probed, its latency
+histograms. The ``store`` lines measure all of that, the last one with every
+histogram slot of the 5m/1h/24h windows holding samples.
+
+    python -m benchmarks.check_state_memory --checks 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from app.state import CheckState, StateStore, now_iso, now_us
+
+
+@dataclass
+class LegacyCheckState:
+    id: str
+    type: str
+    ok: bool | None = None
+    fail_count: int = 0
+    down_threshold: int = 1
+    last_run: str | None = None
+    last_ok: str | None = None
+    last_change: str | None = None
+    latency_ms: int | None = None
+    status_code: int | None = None
+    error: str | None = None
+
+
+def _error_text(i: int) -> str | None:
+    if i % 4:
+        return None
+    # Built at runtime like str(exc), so identical messages are distinct objects.
+    return "".join(["[Errno 111] ", "Connection refused"])
+
+
+def _type_text(i: int) -> str:
+    return "".join(["ht", "tp"]) if i % 2 else "".join(["tc", "p"])
+
+
+def build_legacy(n: int) -> list[Any]:
+    out = []
+    for i in range(n):
+        ts = now_iso()
+        out.append(
+            LegacyCheckState(
+                id=f"svc-{i}",
+                type=_type_text(i),
+                ok=not i % 4 == 0,
+                last_run=ts,
+                last_ok=now_iso(),
+                last_change=now_iso(),
+                latency_ms=i % 500,
+                status_code=200,
+                error=_error_text(i),
+            )
+        )
+    return out
+
+
+def build_compact(n: int) -> list[Any]:
+    out = []
+    for i in range(n):
+        out.append(
+            CheckState(
+                id=f"svc-{i}",
+                type=_type_text(i),
+                ok=not i % 4 == 0,
+                last_run_us=now_us(),
+                last_ok_us=now_us(),
+                last_change_us=now_us(),
+                latency_ms=i % 500,
+                status_code=200,
+                error=_error_text(i),
+            )
+        )
+    return out
+
+
+def build_store(n: int, probed: bool) -> StateStore:
+    store = StateStore(db_path=None)
+    with store.batch():
+        for i in range(n):
+            store.ensure_check(f"svc-{i}", _type_text(i))
+        if probed:
+            for i in range(n):
+                store.update(
+                    f"svc-{i}",
+                    ok=not i % 4 == 0,
+                    latency_ms=i % 500,
+                    status_code=200,
+                    error=_error_text(i),
+                )
+    return store
+
+
+def build_store_registered(n: int) -> StateStore:
+    return build_store(n, probed=False)
+
+
+def build_store_probed(n: int) -> StateStore:
+    return build_store(n, probed=True)
+
+
+def build_store_day(n: int) -> StateStore:
+    """Probed store whose histograms hold a full day of samples."""
+    store = build_store(n, probed=True)
+    now = now_us()
+    offsets_s = (
+        [60 * k for k in range(1, 5)]
+        + [600 * k for k in range(1, 6)]
+        + [3600 * k for k in range(1, 24)]
+    )
+    with store._locked():
+        for i in range(n):
+            for offset_s in offsets_s:
+                ts_us = now - offset_s * 1_000_000
+                for latency_ms in (i % 500, i % 500 + 40):
+                    store._record_latency_locked(f"svc-{i}", latency_ms, ts_us)
+    return store
+
+
+def measure(build: Callable[[int], Any], n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    items = build(n)
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=10_000)
+    args = parser.parse_args()
+
+    legacy = measure(build_legacy, args.checks)
+    compact = measure(build_compact, args.checks)
+    registered = measure(build_store_registered, args.checks)
+    probed = measure(build_store_probed, args.checks)
+    day = measure(build_store_day, args.checks)
+    print(f"checks:  {args.checks}")
+    print(f"legacy:  {legacy:8.1f} bytes/check (bare state)")
+    print(f"compact: {compact:8.1f} bytes/check (bare state)")
+    print(f"saved:   {100 * (1 - compact / legacy):7.1f}% of the bare state")
+    print(f"store:   {registered:8.1f} bytes/check (registered, published snapshot)")
+    print(f"store:   {probed:8.1f} bytes/check (after one probe, incl. latency histograms)")
+    print(f"store:   {day:8.1f} bytes/check (after a day of probes)")
+
+
+if __name__ == "__main__":
+    main()
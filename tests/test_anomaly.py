@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import Mock
+
+from app.anomaly import AnomalySettings, LatencyBaseline
+from app.models import Registry
+from app.registry import apply_defaults
+from app.runner import _notify_transition
+from app.state import StateStore
+
+
+FAST = {"min_samples": 10, "consecutive": 2}
+
+
+class LatencyBaselineTests(unittest.TestCase):
+    def test_degraded_after_consecutive_slow_samples_then_recovered(self) -> None:
+        cfg = AnomalySettings(min_samples=10, consecutive=2)
+        baseline = LatencyBaseline()
+        for i in range(10):
+            self.assertIsNone(baseline.observe(20 + i % 3, cfg))
+
+        self.assertIsNone(baseline.observe(2000, cfg))
+        self.assertEqual(baseline.observe(2000, cfg), "DEGRADED")
+        self.assertIsNone(baseline.observe(2000, cfg))
+        # Slow samples were not absorbed into the baseline.
+        self.assertLess(baseline.mean, 25)
+
+        self.assertIsNone(baseline.observe(21, cfg))
+        self.assertEqual(baseline.observe(21, cfg), "RECOVERED")
+
+    def test_single_outlier_and_small_shift_do_not_trigger(self) -> None:
+        cfg = AnomalySettings(min_samples=10, consecutive=2)
+        baseline = LatencyBaseline()
+        for _ in range(10):
+            baseline.observe(20, cfg)
+        self.assertIsNone(baseline.observe(2000, cfg))
+        self.assertIsNone(baseline.observe(20, cfg))
+        # Below min_delta_ms even though the z-score is large.
+        for _ in range(5):
+            self.assertIsNone(baseline.observe(60, cfg))
+
+
+class StoreAnomalyTests(unittest.TestCase):
+    def test_store_emits_degraded_events_through_event_log(self) -> None:
+        store = StateStore()
+        store.ensure_check("svc", "http")
+        seen = []
+        store.add_listener(lambda kind, data: kind == "transition" and seen.append(data["event"]))
+
+        for _ in range(11):
+            store.update("svc", ok=True, latency_ms=20, anomaly=FAST)
+        store.update("svc", ok=True, latency_ms=1500, anomaly=FAST)
+        event = store.update("svc", ok=True, latency_ms=1500, anomaly=FAST)
+
+        self.assertEqual(event["event"], "DEGRADED")
+        self.assertTrue(event["ok"])
+        self.assertEqual(store.events(limit=1)[0]["event"], "DEGRADED")
+        self.assertEqual(seen, ["INIT", "DEGRADED"])
+
+        # DOWN supersedes DEGRADED; coming back UP starts clean.
+        self.assertEqual(store.update("svc", ok=False, latency_ms=3000, anomaly=FAST)["event"], "DOWN")
+        self.assertEqual(store.update("svc", ok=True, latency_ms=20, anomaly=FAST)["event"], "UP")
+        self.assertIsNone(store.update("svc", ok=True, latency_ms=20, anomaly=FAST))
+
+    def test_disabled_per_check(self) -> None:
+        store = StateStore()
+        store.ensure_check("svc", "http")
+        off = {**FAST, "enabled": False}
+        for _ in range(11):
+            store.update("svc", ok=True, latency_ms=20, anomaly=off)
+        for _ in range(5):
+            self.assertIsNone(store.update("svc", ok=True, latency_ms=1500, anomaly=off))
+
+
+class AnomalyConfigTests(unittest.TestCase):
+    def test_per_check_keys_override_defaults(self) -> None:
+        reg = Registry.model_validate(
+            {
+                "defaults": {"anomaly": {"z_threshold": 5}},
+                "checks": [
+                    {"id": "a", "type": "tcp", "host": "h", "port": 1},
+                    {
+                        "id": "b",
+                        "type": "tcp",
+                        "host": "h",
+                        "port": 1,
+                        "anomaly": {"min_delta_ms": 200},
+                    },
+                ],
+            }
+        )
+        checks = apply_defaults(reg)
+        self.assertEqual(checks["a"]["anomaly"]["z_threshold"], 5)
+        self.assertEqual(checks["b"]["anomaly"]["z_threshold"], 5)
+        self.assertEqual(checks["b"]["anomaly"]["min_delta_ms"], 200)
+        self.assertEqual(checks["a"]["anomaly"]["min_delta_ms"], 50)
+
+    def test_degraded_event_is_notified(self) -> None:
+        notifier = Mock()
+        check = {"id": "svc", "type": "tcp", "host": "h", "port": 1}
+        event = {"ts": "t", "id": "svc", "event": "DEGRADED", "ok": True}
+        _notify_transition(notifier, event, check, {"latency_ms": 1500})
+        notifier.send_degraded.assert_called_once()
+        self.assertEqual(notifier.send_degraded.call_args.kwargs["title"], "[DEGRADED] svc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.availability import DAY_US, AvailabilityTracker, day_of
+from app.state import StateStore, now_us
+
+S = 1_000_000
+DAY0 = day_of(now_us()) - 1  # yesterday, inside the retention window
+
+
+class AvailabilityTrackerTests(unittest.TestCase):
+    def test_interval_split_across_day_boundary(self) -> None:
+        tracker = AvailabilityTracker(max_gap_s=600)
+        end_of_day = (DAY0 + 1) * DAY_US
+        touched = tracker.accrue("svc", True, end_of_day - 60 * S, end_of_day + 30 * S)
+
+        self.assertEqual(touched, [(DAY0, 60.0, 0.0), (DAY0 + 1, 30.0, 0.0)])
+        stats = tracker.availability("svc", DAY0, DAY0 + 1, now_us=end_of_day + 30 * S)
+        self.assertEqual(stats["up_s"], 90.0)
+        self.assertEqual(stats["availability"], 1.0)
+
+    def test_monitor_gap_counts_as_no_data(self) -> None:
+        tracker = AvailabilityTracker(max_gap_s=60)
+        start = DAY0 * DAY_US
+        tracker.accrue("svc", False, start, start + 3600 * S)
+
+        stats = tracker.availability("svc", DAY0, DAY0, now_us=start + 3600 * S)
+        self.assertEqual(stats["down_s"], 60.0)
+        self.assertEqual(stats["no_data_s"], 3540.0)
+        self.assertEqual(stats["availability"], 0.0)
+
+    def test_unknown_status_is_not_credited(self) -> None:
+        tracker = AvailabilityTracker()
+        self.assertEqual(tracker.accrue("svc", None, 0, 30 * S), [])
+        stats = tracker.availability("svc", 0, 0, now_us=30 * S)
+        self.assertIsNone(stats["availability"])
+
+
+class StoreAvailabilityTests(unittest.TestCase):
+    def test_transitions_accrue_and_survive_restart(self) -> None:
+        base = DAY0 * DAY_US
+        clock = iter([base, base + 30 * S, base + 60 * S, base + 90 * S])
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "ops-monitor.sqlite3")
+            store1 = StateStore(db_path=db_path)
+            store1.ensure_check("svc", "http")
+            with patch("app.state.now_us", side_effect=lambda: next(clock)):
+                store1.update("svc", ok=True, latency_ms=5)
+                store1.update("svc", ok=False, latency_ms=5)
+                store1.update("svc", ok=False, latency_ms=5)
+                store1.update("svc", ok=True, latency_ms=5)
+
+            store2 = StateStore(db_path=db_path)
+            with patch("app.state.now_us", return_value=base + 90 * S):
+                stats = store2.availability("svc", DAY0, DAY0)
+
+        # 30s up (first interval), then 60s down.
+        self.assertEqual(stats["up_s"], 30.0)
+        self.assertEqual(stats["down_s"], 60.0)
+        self.assertAlmostEqual(stats["availability"], 1 / 3, places=5)
+        self.assertEqual(stats["no_data_s"], 0.0)
+
+    def test_unknown_check_raises(self) -> None:
+        with self.assertRaises(KeyError):
+            StateStore().availability("missing", 0, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from app.state import CheckState, iso_to_us, us_to_iso
+
+
+class CheckStateTests(unittest.TestCase):
+    def test_iso_round_trip(self) -> None:
+        ts = "2026-02-23T14:11:45.123456+00:00"
+        self.assertEqual(us_to_iso(iso_to_us(ts)), ts)
+        self.assertIsNone(iso_to_us(None))
+        self.assertIsNone(iso_to_us("not-a-timestamp"))
+
+    def test_from_dict_to_dict_round_trip(self) -> None:
+        data = {
+            "id": "svc",
+            "type": "http",
+            "ok": False,
+            "fail_count": 2,
+            "down_threshold": 2,
+            "last_run": "2026-02-23T14:11:45.500000+00:00",
+            "last_ok": None,
+            "last_change": "2026-02-23T14:10:00+00:00",
+            "latency_ms": 12,
+            "status_code": 503,
+            "error": "boom",
+            "flapping": True,
+        }
+
+        self.assertEqual(CheckState.from_dict(data).to_dict(), data)
+
+    def test_slots_and_shared_strings(self) -> None:
+        a = CheckState(id="a", type="".join(["ht", "tp"]), error="".join(["re", "fused"]))
+        b = CheckState(id="b", type="".join(["ht", "tp"]), error="".join(["re", "fused"]))
+
+        self.assertFalse(hasattr(a, "__dict__"))
+        self.assertIs(a.type, b.type)
+        self.assertIs(a.error, b.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from app.coalescer import NotificationCoalescer
+from app.runner import _notify_transition
+
+S = 1_000_000
+
+
+def _event(check_id: str, name: str, ok: bool = False) -> dict:
+    return {
+        "ts": "2026-01-01T00:00:00Z",
+        "id": check_id,
+        "event": name,
+        "ok": ok,
+        "latency_ms": None,
+        "status_code": None,
+        "error": None,
+        "detail": None,
+    }
+
+
+class CoalescerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 1_000 * S
+        patcher = patch("app.coalescer.now_us", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.target = Mock()
+        self.coalescer = NotificationCoalescer(
+            self.target, window_s=15, cooldown_s=60, core_ids=("router",)
+        )
+
+    def test_mass_outage_becomes_one_digest(self) -> None:
+        for i in range(20):
+            self.coalescer.submit(_event(f"svc-{i:02d}", "DOWN"), "t", "m")
+        self.assertEqual(self.coalescer.flush(), 0)
+        self.target.send_down.assert_not_called()
+
+        self.now += 15 * S
+        self.assertEqual(self.coalescer.flush(), 1)
+        self.target.send_down.assert_called_once()
+        kwargs = self.target.send_down.call_args.kwargs
+        self.assertEqual(kwargs["title"], "[DIGEST] 20 checks: 20 DOWN")
+        self.assertEqual(len(kwargs["message"].splitlines()), 20)
+        self.assertEqual(self.coalescer.stats(), {"pending": 0, "posts": 1, "suppressed": 0})
+
+    def test_single_transition_keeps_its_title(self) -> None:
+        self.coalescer.submit(_event("web", "DOWN"), "[DOWN] web", "detail")
+        self.now += 15 * S
+        self.coalescer.flush()
+        self.target.send_down.assert_called_once_with(title="[DOWN] web", message="detail")
+
+    def test_digest_priority_is_most_severe(self) -> None:
+        self.coalescer.submit(_event("a", "UP", ok=True), "t", "m")
+        self.coalescer.submit(_event("b", "DOWN"), "t", "m")
+        self.now += 15 * S
+        self.coalescer.flush()
+        self.target.send_down.assert_called_once()
+        self.target.send_up.assert_not_called()
+        self.assertIn("1 DOWN, 1 UP", self.target.send_down.call_args.kwargs["title"])
+
+    def test_core_check_is_sent_immediately(self) -> None:
+        self.coalescer.submit(_event("router", "DOWN"), "[DOWN] router", "m")
+        self.target.send_down.assert_called_once_with(title="[DOWN] router", message="m")
+        self.assertEqual(self.coalescer.stats()["pending"], 0)
+
+    def test_repeat_of_last_kind_is_dropped(self) -> None:
+        self.coalescer.submit(_event("web", "DOWN"), "t", "m")
+        self.now += 15 * S
+        self.coalescer.flush()
+        self.coalescer.submit(_event("web", "STABLE", ok=False), "t", "m")
+        self.assertEqual(self.coalescer.stats()["suppressed"], 1)
+        self.assertEqual(self.coalescer.stats()["pending"], 0)
+
+    def test_cooldown_defers_and_merges(self) -> None:
+        self.coalescer.submit(_event("web", "DOWN"), "t", "m")
+        self.now += 15 * S
+        self.coalescer.flush()
+
+        self.coalescer.submit(_event("web", "UP", ok=True), "t", "m")
+        self.now += 20 * S
+        self.coalescer.submit(_event("web", "DOWN"), "t", "m")
+        self.now += 20 * S
+        self.assertEqual(self.coalescer.flush(), 0)
+
+        self.now += 20 * S
+        self.assertEqual(self.coalescer.flush(), 1)
+        self.assertEqual(self.target.send_down.call_count, 2)
+        self.assertIn("UP -> DOWN  web", self.target.send_down.call_args.kwargs["message"])
+
+    def test_stop_flushes_pending(self) -> None:
+        self.coalescer.submit(_event("web", "DEGRADED"), "[DEGRADED] web", "m")
+        self.coalescer.stop()
+        self.target.send_degraded.assert_called_once_with(title="[DEGRADED] web", message="m")
+
+    def test_runner_submits_whole_events(self) -> None:
+        coalescer = Mock(spec=NotificationCoalescer)
+        event = _event("web", "DOWN")
+        check = {"id": "web", "name": "Web", "type": "http", "url": "http://web"}
+        _notify_transition(coalescer, event, check, {"id": "web", "ok": False, "fail_count": 1})
+        coalescer.submit.assert_called_once()
+        self.assertIs(coalescer.submit.call_args.args[0], event)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from app.dispatcher import NotificationDispatcher
+from app.notifier import NtfyConfig, NtfyNotifier
+from app.persistence import SQLitePersistence
+
+
+class DispatcherTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._td.name) / "ops-monitor.sqlite3")
+        self.persistence = SQLitePersistence(self.db_path)
+
+    def tearDown(self) -> None:
+        self.persistence.close()
+        self._td.cleanup()
+
+    def test_send_only_enqueues_and_delivers_in_order(self) -> None:
+        notifier = Mock()
+        dispatcher = NotificationDispatcher(notifier, outbox=self.persistence)
+        dispatcher.send_down(title="[DOWN] a", message="m1")
+        dispatcher.send_up(title="[UP] a", message="m2")
+
+        notifier.send_down.assert_not_called()
+        self.assertEqual(dispatcher.depth(), 2)
+        self.assertEqual(len(self.persistence.load_outbox()), 2)
+
+        dispatcher.process_pending()
+        notifier.send_down.assert_called_once_with(title="[DOWN] a", message="m1")
+        notifier.send_up.assert_called_once_with(title="[UP] a", message="m2")
+        self.assertEqual(dispatcher.stats(), {"queue_depth": 0, "delivered": 2, "dropped": 0})
+        self.assertEqual(self.persistence.load_outbox(), [])
+
+    def test_retries_with_backoff_then_drops(self) -> None:
+        notifier = Mock()
+        notifier.send_down.side_effect = [OSError("refused"), OSError("refused"), None]
+        dispatcher = NotificationDispatcher(
+            notifier, outbox=self.persistence, backoff_base_s=0.001
+        )
+        dispatcher.send_down(title="t", message="m")
+        dispatcher.process_pending()
+        self.assertEqual(notifier.send_down.call_count, 3)
+        self.assertEqual(dispatcher.delivered, 1)
+
+        notifier.send_up.side_effect = OSError("refused")
+        dispatcher.max_attempts = 2
+        with self.assertLogs("app.dispatcher", level="WARNING"):
+            dispatcher.send_up(title="t", message="m")
+            dispatcher.process_pending()
+        self.assertEqual(dispatcher.dropped, 1)
+        self.assertEqual(self.persistence.load_outbox(), [])
+
+    def test_outbox_survives_restart(self) -> None:
+        NotificationDispatcher(Mock(), outbox=self.persistence).send_down(
+            title="t", message="m"
+        )
+
+        notifier = Mock()
+        restored = NotificationDispatcher(notifier, outbox=self.persistence)
+        self.assertEqual(restored.depth(), 1)
+        restored.process_pending()
+        notifier.send_down.assert_called_once_with(title="t", message="m")
+
+    def test_worker_thread_delivers_without_blocking_caller(self) -> None:
+        notifier = Mock()
+        notifier.send_down.side_effect = lambda **_: time.sleep(0.2)
+        dispatcher = NotificationDispatcher(notifier)
+        dispatcher.start()
+        try:
+            start = time.perf_counter()
+            dispatcher.send_down(title="t", message="m")
+            self.assertLess(time.perf_counter() - start, 0.1)
+            deadline = time.monotonic() + 2
+            while dispatcher.delivered == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            dispatcher.stop()
+        self.assertEqual(dispatcher.delivered, 1)
+
+
+class NtfyNotifierTests(unittest.TestCase):
+    def test_posts_through_pooled_session_and_raises_on_http_error(self) -> None:
+        notifier = NtfyNotifier(NtfyConfig(base_url="http://ntfy.local/", topic="ops"))
+        response = Mock()
+        response.raise_for_status.side_effect = RuntimeError("503")
+        with patch.object(notifier._session, "post", return_value=response) as post:
+            with self.assertRaises(RuntimeError):
+                notifier.send_down(title="t", message="m")
+        self.assertEqual(post.call_args.args[0], "http://ntfy.local/ops")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import importlib
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pydantic import TypeAdapter
+
+from app import fastjson
+from app.api_schemas import (
+    CheckStateResponse,
+    StatusEventResponse,
+    StatusSummaryResponse,
+)
+from app.state import StateStore
+
+
+class FastJsonTests(unittest.TestCase):
+    def test_dumps_with_and_without_orjson(self) -> None:
+        payload = {"id": "svc", "ok": None, "error": "café"}
+        fast = fastjson.dumps(payload)
+        with patch.object(fastjson, "orjson", None):
+            slow = fastjson.dumps(payload)
+        self.assertEqual(json.loads(fast), payload)
+        self.assertEqual(json.loads(slow), payload)
+
+    def test_encoded_cache_rebuilds_only_on_new_version(self) -> None:
+        cache = fastjson.EncodedCache()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        self.assertEqual(cache.get("v1", build), b'{"n":1}')
+        self.assertEqual(cache.get("v1", build), b'{"n":1}')
+        self.assertEqual(cache.get("v2", build), b'{"n":2}')
+        self.assertEqual(len(calls), 2)
+
+    def test_fast_path_payloads_match_response_models(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["OPSMONITOR_DB_PATH"] = str(Path(td) / "test-fastjson.sqlite3")
+            main_mod = importlib.reload(importlib.import_module("app.main"))
+        main_mod.store = StateStore(db_path=None)
+        main_mod.store.ensure_check("a", "http")
+        main_mod.store.ensure_check("b", "tcp")
+        main_mod.store.update("a", ok=True, latency_ms=3, status_code=200)
+        main_mod.store.update("b", ok=False, latency_ms=9, error="refused")
+
+        checks = json.loads(main_mod.status_checks(since=None, fields=None, ids=None, tag=None).body)
+        summary = json.loads(main_mod.status_summary_route().body)
+        events = json.loads(main_mod.status_events_route(limit=10).body)
+
+        strict = {"strict": True}
+        validated = TypeAdapter(dict[str, CheckStateResponse]).validate_python(checks, **strict)
+        self.assertEqual(
+            {k: v.model_dump() for k, v in validated.items()},
+            checks,
+        )
+        self.assertEqual(
+            StatusSummaryResponse.model_validate(summary, **strict).model_dump(),
+            summary,
+        )
+        self.assertEqual(
+            [e.model_dump() for e in TypeAdapter(list[StatusEventResponse]).validate_python(events)],
+            events,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
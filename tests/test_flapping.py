@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+from app.flapping import FlapSettings, FlapTracker
+from app.runner import _notify_transition
+from app.state import StateStore
+
+
+class FlapTrackerTests(unittest.TestCase):
+    def test_alternating_starts_and_quiet_period_settles(self) -> None:
+        cfg = FlapSettings(window=6)
+        tracker = FlapTracker()
+        edges = [tracker.record(True, i, cfg) for i in range(6)]
+        self.assertEqual(edges[:5], [None] * 5)
+        self.assertEqual(edges[5], "FLAPPING")
+
+        edges = [tracker.record(False, 10 + i, cfg) for i in range(10)]
+        self.assertIn("STABLE", edges)
+        self.assertEqual(edges.count("STABLE"), 1)
+        self.assertFalse(tracker.flapping)
+
+    def test_occasional_transitions_do_not_flap(self) -> None:
+        cfg = FlapSettings(window=6)
+        tracker = FlapTracker()
+        for i in range(60):
+            self.assertIsNone(tracker.record(i % 5 == 0, i, cfg))
+
+
+class StoreFlapTests(unittest.TestCase):
+    FLAP = {"window": 4}
+
+    def _run(self, store, pattern):
+        return [
+            store.update("svc", ok=ok, latency_ms=5, flap=self.FLAP) for ok in pattern
+        ]
+
+    def test_flapping_suppresses_transitions_and_summarizes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "ops-monitor.sqlite3")
+            store = StateStore(db_path=db_path)
+            store.ensure_check("svc", "http")
+
+            events = self._run(store, [True, False, True, False, True, False, True, False])
+            names = [e["event"] if e else None for e in events]
+            self.assertEqual(names[:4], ["INIT", "DOWN", "UP", "DOWN"])
+            self.assertEqual(names[4], "FLAPPING")
+            self.assertEqual(names[5:], [None, None, None])
+            self.assertTrue(store.check_state("svc")["flapping"])
+
+            # Restart mid-flap: state and the suppression survive.
+            store = StateStore(db_path=db_path)
+            self.assertTrue(store.check_state("svc")["flapping"])
+            events = self._run(store, [False] * 10)
+            stable = [e for e in events if e]
+            self.assertEqual([e["event"] for e in stable], ["STABLE"])
+            self.assertFalse(stable[0]["ok"])
+            self.assertIn("settled DOWN", stable[0]["detail"])
+            self.assertFalse(store.check_state("svc")["flapping"])
+            self.assertEqual(store.events(limit=1)[0]["detail"], stable[0]["detail"])
+
+    def test_disabled_keeps_per_transition_events(self) -> None:
+        store = StateStore()
+        store.ensure_check("svc", "http")
+        off = {"enabled": False}
+        pattern = [True, False] * 5
+        events = [store.update("svc", ok=ok, latency_ms=5, flap=off) for ok in pattern]
+        self.assertTrue(all(e is not None for e in events))
+
+    def test_stable_down_notifies_as_down(self) -> None:
+        notifier = Mock()
+        check = {"id": "svc", "type": "tcp", "host": "h", "port": 1}
+        event = {"ts": "t", "id": "svc", "event": "STABLE", "ok": False, "detail": "settled DOWN"}
+        _notify_transition(notifier, event, check, {"latency_ms": 5})
+        notifier.send_down.assert_called_once()
+        self.assertIn("settled DOWN", notifier.send_down.call_args.kwargs["message"])
+
+
+if __name__ == "__main__":
+    unittest.main()
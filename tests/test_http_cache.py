@@ -0,0 +1,119 @@
+import asyncio
+import importlib
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.http_cache import etag_matches, make_etag
+
+
+def asgi_get(app, path: str, query: bytes = b"", headers=()) -> tuple[int, dict, bytes]:
+    messages: list[dict] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query,
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+        "server": ("testserver", 80),
+        "client": ("testclient", 1234),
+    }
+    asyncio.run(app(scope, receive, send))
+
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    resp_headers = {k.decode(): v.decode() for k, v in start["headers"]}
+    return start["status"], resp_headers, body
+
+
+class EtagHelperTests(unittest.TestCase):
+    def test_etag_matching(self) -> None:
+        etag = make_etag("abc", "1")
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertNotEqual(etag, make_etag("abc", "2"))
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches(None, etag))
+        self.assertFalse(etag_matches('"other"', etag))
+
+
+class ConditionalGetTests(unittest.TestCase):
+    def _load_main_module(self):
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["OPSMONITOR_DB_PATH"] = str(Path(td) / "test-http-cache.sqlite3")
+            mod = importlib.import_module("app.main")
+            mod = importlib.reload(mod)
+            mod.store = mod.StateStore(db_path=None)
+            return mod
+
+    def test_status_checks_returns_304_until_generation_changes(self) -> None:
+        main_mod = self._load_main_module()
+        main_mod.store.ensure_check("svc", "http")
+
+        status, headers, body = asgi_get(main_mod.app, "/api/status/checks")
+        self.assertEqual(status, 200)
+        self.assertIn("svc", json.loads(body))
+        etag = headers["etag"]
+
+        status, headers, body = asgi_get(
+            main_mod.app, "/api/status/checks", headers=[("If-None-Match", etag)]
+        )
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b"")
+        self.assertEqual(headers["etag"], etag)
+
+        main_mod.store.update("svc", ok=True, latency_ms=1)
+        status, headers, _ = asgi_get(
+            main_mod.app, "/api/status/checks", headers=[("If-None-Match", etag)]
+        )
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers["etag"], etag)
+
+    def test_ops_summary_etag_tracks_proxmox_updates_and_query(self) -> None:
+        main_mod = self._load_main_module()
+
+        _, headers, _ = asgi_get(main_mod.app, "/api/ops/summary")
+        etag = headers["etag"]
+
+        main_mod.store.update_proxmox_stats({"status": "ok", "issues": []})
+        status, _, _ = asgi_get(
+            main_mod.app, "/api/ops/summary", headers=[("If-None-Match", etag)]
+        )
+        self.assertEqual(status, 200)
+
+        _, h1, _ = asgi_get(main_mod.app, "/api/status/events", query=b"limit=5")
+        _, h2, _ = asgi_get(main_mod.app, "/api/status/events", query=b"limit=6")
+        self.assertNotEqual(h1["etag"], h2["etag"])
+
+    def test_events_etag_tracks_proxmox_issue_events(self) -> None:
+        main_mod = self._load_main_module()
+        _, headers, _ = asgi_get(main_mod.app, "/api/status/events")
+        etag = headers["etag"]
+
+        main_mod.store.update_proxmox_stats(
+            {"status": "warn", "issues": [{"kind": "node_mem_high", "node": "pve1"}]}
+        )
+        status, _, body = asgi_get(
+            main_mod.app, "/api/status/events", headers=[("If-None-Match", etag)]
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual([e["event"] for e in json.loads(body)], ["APPEARED"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,9 +51,6 @@ class HttpTimeoutOverrideTests(unittest.TestCase):
             }
             with patch("app.runner.load_registry", return_value=object()), patch(
                 "app.runner.apply_defaults", return_value=checks
-            ), patch(
-                "app.runner.get_health_summary",
-                return_value={"status": "ok", "issues": []},
             ), patch(
                 "app.runner.run_http",
                 return_value=CheckResult(ok=True, latency_ms=5, status_code=200),
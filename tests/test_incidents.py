@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.incidents import IncidentTracker, correlation_keys
+from app.reporting import build_facts_payload
+from app.state import StateStore
+
+S = 1_000_000
+
+
+class IncidentTrackerTests(unittest.TestCase):
+    def test_groups_by_shared_key_within_window(self) -> None:
+        tracker = IncidentTracker(window_s=60)
+        a = tracker.on_down("a", 0, correlation_keys("a", ["pve1"], None))
+        b = tracker.on_down("b", 10 * S, correlation_keys("b", ["pve1"], None))
+        other = tracker.on_down("c", 20 * S, correlation_keys("c", ["cloud"], None))
+        late = tracker.on_down("d", 200 * S, correlation_keys("d", ["pve1"], None))
+
+        self.assertIs(a, b)
+        self.assertIsNot(a, other)
+        self.assertIsNot(a, late)
+        self.assertEqual(list(a.checks), ["a", "b"])
+
+    def test_dependency_parent_correlates(self) -> None:
+        tracker = IncidentTracker(window_s=60)
+        parent = tracker.on_down("pve-node", 0, correlation_keys("pve-node", [], None))
+        child = tracker.on_down("wiki", 5 * S, correlation_keys("wiki", [], "pve-node"))
+        self.assertIs(parent, child)
+
+    def test_resolves_when_all_checks_recover(self) -> None:
+        tracker = IncidentTracker(window_s=60)
+        keys = correlation_keys("a", ["t"], None)
+        incident = tracker.on_down("a", 0, keys)
+        tracker.on_down("b", S, correlation_keys("b", ["t"], None))
+
+        tracker.on_up("a", 30 * S)
+        self.assertTrue(incident.open)
+        tracker.on_up("b", 90 * S)
+        self.assertFalse(incident.open)
+        view = incident.to_dict()
+        self.assertEqual(view["status"], "resolved")
+        self.assertEqual(view["duration_s"], 90.0)
+        self.assertEqual(tracker.recent(10, status="open"), [])
+
+
+class StoreIncidentTests(unittest.TestCase):
+    def test_outage_becomes_one_persisted_incident(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "ops-monitor.sqlite3")
+            store = StateStore(db_path=db_path)
+            for cid in ("a", "b", "c"):
+                store.ensure_check(cid, "http", tags=["pve1"])
+                store.update(cid, ok=True, latency_ms=5)
+            store.ensure_check("solo", "http")
+            store.update("solo", ok=True, latency_ms=5)
+
+            for cid in ("a", "b", "c", "solo"):
+                store.update(cid, ok=False, latency_ms=5)
+            open_incidents = store.incidents(status="open")
+            self.assertEqual(len(open_incidents), 2)
+            grouped = next(i for i in open_incidents if len(i["affected"]) == 3)
+
+            restarted = StateStore(db_path=db_path)
+            for cid in ("a", "b", "c"):
+                restarted.update(cid, ok=True, latency_ms=5)
+
+            resolved = restarted.incident(grouped["id"])
+            self.assertEqual(resolved["status"], "resolved")
+            self.assertEqual([c["id"] for c in resolved["affected"]], ["a", "b", "c"])
+            self.assertTrue(all(c["up_at"] for c in resolved["affected"]))
+            self.assertEqual(len(restarted.incidents(status="open")), 1)
+
+
+class ReportFactsTests(unittest.TestCase):
+    def test_facts_use_incidents_instead_of_transitions(self) -> None:
+        facts = build_facts_payload(
+            ops_summary_payload={},
+            status_summary_payload={},
+            events_payload=[{"event": "DOWN"}, {"event": "UP"}, {"event": "DEGRADED"}],
+            incidents_payload=[{"id": 1}],
+            proxmox_payload={},
+            generated_at="t",
+            range_minutes=60,
+        )
+        self.assertEqual(facts["incidents"], [{"id": 1}])
+        self.assertEqual(facts["events"], [{"event": "DEGRADED"}])
+
+    def test_report_endpoint_passes_incidents(self) -> None:
+        from app import main
+
+        with patch.object(main.store, "incidents_since", return_value=[{"id": 7}]) as since, patch.object(
+            main, "generate_json_report", return_value={"response": "{}"}
+        ), self.assertLogs("app.main", level="WARNING"):
+            response = main.reports_generate(main.ReportGenerateRequest(range_minutes=30))
+
+        since.assert_called_once()
+        self.assertEqual(response.inputs["incidents"], [{"id": 7}])
+        self.assertEqual(response.sources.incidents_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.latency import (
+    BUCKET_COUNT,
+    CheckLatencyHistograms,
+    SlidingHistogram,
+    bucket_index,
+    bucket_value,
+)
+from app.state import StateStore
+
+
+class BucketTests(unittest.TestCase):
+    def test_bucket_value_within_resolution(self) -> None:
+        for ms in (1, 7, 20, 150, 999, 2000, 30000):
+            value = bucket_value(bucket_index(ms))
+            self.assertLess(abs(value - ms) / ms, 0.11, ms)
+        self.assertEqual(bucket_index(0), 0)
+        self.assertEqual(bucket_index(10**9), BUCKET_COUNT - 1)
+
+
+class SlidingHistogramTests(unittest.TestCase):
+    def test_old_slots_fall_out_of_the_window(self) -> None:
+        hist = SlidingHistogram(width_s=60, slots=5)
+        hist.record(10, ts_s=0)
+        hist.record(20, ts_s=250)
+        self.assertEqual(sum(hist.merged(now_s=250)), 2)
+        self.assertEqual(sum(hist.merged(now_s=300)), 1)
+        # Reusing a ring position clears the stale slot first.
+        hist.record(30, ts_s=300)
+        self.assertEqual(sum(hist.merged(now_s=300)), 2)
+
+    def test_slots_are_allocated_on_first_write_and_sparse(self) -> None:
+        hist = SlidingHistogram(width_s=60, slots=5)
+        self.assertEqual(hist.counts, [None] * 5)
+        for _ in range(3):
+            hist.record(20, ts_s=0)
+        hist.record(900, ts_s=0)
+        self.assertEqual(
+            list(hist.counts[0]), [bucket_index(20), 3, bucket_index(900), 1]
+        )
+        self.assertEqual(hist.counts[1:], [None] * 4)
+
+    def test_percentiles_separate_one_outlier_from_sustained_regression(self) -> None:
+        hists = CheckLatencyHistograms()
+        for i in range(99):
+            hists.record(20, ts_s=1000 + i)
+        hists.record(2000, ts_s=1100)
+
+        stats = hists.summary(now_s=1100)["5m"]
+        self.assertEqual(stats["count"], 100)
+        self.assertAlmostEqual(stats["p50_ms"], 20, delta=2)
+        self.assertAlmostEqual(stats["p90_ms"], 20, delta=2)
+        self.assertAlmostEqual(stats["p99_ms"], 20, delta=2)
+
+        empty = CheckLatencyHistograms().summary(now_s=1100)["24h"]
+        self.assertEqual(empty, {"count": 0, "p50_ms": None, "p90_ms": None, "p99_ms": None})
+
+
+class StoreLatencyTests(unittest.TestCase):
+    def test_histograms_restore_from_samples_after_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "ops-monitor.sqlite3")
+            store1 = StateStore(db_path=db_path)
+            store1.ensure_check("svc", "http")
+            for latency in (10, 10, 10, 900):
+                store1.update("svc", ok=True, latency_ms=latency)
+            before = store1.latency_percentiles("svc")
+
+            store2 = StateStore(db_path=db_path)
+            after = store2.latency_percentiles("svc")
+
+        self.assertEqual(before["1h"]["count"], 4)
+        self.assertEqual(after, before)
+        self.assertAlmostEqual(after["24h"]["p50_ms"], 10, delta=1)
+
+    def test_batch_writes_samples_and_days_in_one_flush(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "ops-monitor.sqlite3")
+            store1 = StateStore(db_path=db_path)
+            store1.ensure_check("a", "http")
+            store1.ensure_check("b", "http")
+            persistence = store1.persistence
+            with patch.object(
+                persistence, "write_probe_data", wraps=persistence.write_probe_data
+            ) as write:
+                with store1.batch():
+                    for _ in range(3):
+                        store1.update("a", ok=True, latency_ms=10)
+                        store1.update("b", ok=False, latency_ms=20)
+                    self.assertEqual(write.call_count, 0)
+            self.assertEqual(write.call_count, 1)
+            samples, days = write.call_args.args
+            self.assertEqual(len(samples), 6)
+            self.assertEqual(len(days), 2)
+
+            store2 = StateStore(db_path=db_path)
+            self.assertEqual(store2.latency_percentiles("b")["5m"]["count"], 3)
+
+    def test_unknown_and_pruned_checks_raise(self) -> None:
+        store = StateStore()
+        store.ensure_check("svc", "http")
+        store.update("svc", ok=True, latency_ms=5)
+        store.prune(set())
+        with self.assertRaises(KeyError):
+            store.latency_percentiles("svc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.materialized import OpsSummaryView, ops_summary_version
+from app.state import StateStore
+
+
+class OpsSummaryViewTests(unittest.TestCase):
+    def test_reuses_payload_until_store_changes(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("svc", "http")
+        view = OpsSummaryView()
+
+        payload1, body1 = view.current(store)
+        payload2, body2 = view.current(store)
+        self.assertIs(payload1, payload2)
+        self.assertIs(body1, body2)
+
+        store.update("svc", ok=False, latency_ms=3, error="down")
+        payload3, body3 = view.current(store)
+        self.assertIsNot(payload3, payload1)
+        self.assertEqual(payload3["services"]["down_list"], ["svc"])
+        self.assertEqual(json.loads(body3)["services"], payload3["services"])
+
+    def test_proxmox_and_core_ids_invalidate(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("core-api", "http")
+        store.update("core-api", ok=False, latency_ms=3)
+        view = OpsSummaryView()
+
+        self.assertEqual(view.current(store)[0]["overall"], "warn")
+
+        with patch("app.materialized.settings.OPS_CORE_CHECK_IDS", ("core-api",)):
+            self.assertEqual(view.current(store)[0]["overall"], "crit")
+
+        store.update_proxmox_stats({"status": "warn", "issues": [{"kind": "x"}]})
+        payload, body = view.current(store)
+        self.assertEqual(payload["proxmox"]["status"], "warn")
+        self.assertEqual(json.loads(body)["proxmox"]["issues"], [{"kind": "x"}])
+
+    def test_stale_portainer_data_invalidates(self) -> None:
+        store = StateStore(db_path=None)
+        store.update_portainer(
+            {"status": "ok", "endpoints": [], "containers": []},
+            fetch_ts=datetime.now(timezone.utc),
+        )
+        view = OpsSummaryView()
+
+        with patch("app.materialized.settings.PORTAINER_BASE_URL", "http://portainer"):
+            self.assertEqual(view.current(store)[0]["docker"]["status"], "ok")
+            version = ops_summary_version(store)
+
+            later = datetime.now(timezone.utc) + timedelta(hours=1)
+            with patch("app.ops_logic.datetime") as fake:
+                fake.now.return_value = later
+                self.assertNotEqual(ops_summary_version(store), version)
+                payload, _ = view.current(store)
+        self.assertEqual(payload["docker"]["note"], "stale portainer data")
+
+    def test_version_is_read_without_the_store_lock(self) -> None:
+        store = StateStore(db_path=None)
+        store.update_portainer({"status": "ok", "endpoints": [], "containers": []})
+
+        with patch(
+            "app.materialized.settings.PORTAINER_BASE_URL", "http://portainer"
+        ), patch.object(store, "_locked", side_effect=AssertionError("store lock taken")):
+            self.assertTrue(ops_summary_version(store).endswith(":fresh:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from app.metrics import Histogram, MonitorMetrics
+from app.state import StateStore
+
+
+class MetricsExpositionTests(unittest.TestCase):
+    def test_store_changes_drive_check_series(self) -> None:
+        m = MonitorMetrics()
+        store = StateStore(db_path=None)
+        store.add_listener(m.observe_store_change)
+
+        store.ensure_check("wiki", "http")
+        text = m.render()
+        self.assertIn('ops_monitor_check_up{check="wiki",type="http"} NaN', text)
+
+        store.update("wiki", ok=True, latency_ms=5)
+        store.update("wiki", ok=False, latency_ms=5, error="x")
+        text = m.render()
+        self.assertIn('ops_monitor_check_up{check="wiki",type="http"} 0', text)
+        self.assertIn('ops_monitor_check_fail_count{check="wiki"} 1', text)
+        self.assertIn('ops_monitor_check_transitions_total{check="wiki",event="DOWN"} 1', text)
+        self.assertIn("# TYPE ops_monitor_check_up gauge", text)
+
+        store.prune(set())
+        text = m.render()
+        self.assertNotIn('check="wiki"', text)
+        self.assertIn("# TYPE ops_monitor_check_transitions_total counter", text)
+
+    def test_histogram_is_cumulative(self) -> None:
+        h = Histogram("lat", "Latency.", ("check",), buckets=(0.1, 1.0))
+        h.observe("a", value=0.05)
+        h.observe("a", value=0.5)
+        h.observe("a", value=3.0)
+
+        text = h.render()
+        self.assertIn('lat_bucket{check="a",le="0.1"} 1', text)
+        self.assertIn('lat_bucket{check="a",le="1"} 2', text)
+        self.assertIn('lat_bucket{check="a",le="+Inf"} 3', text)
+        self.assertIn('lat_count{check="a"} 3', text)
+        self.assertIn('lat_sum{check="a"} 3.55', text)
+
+    def test_render_reuses_cached_text_until_change(self) -> None:
+        m = MonitorMetrics()
+        m.observe_probe("a", 20)
+        first = m.check_latency.render()
+        self.assertIs(m.check_latency.render(), first)
+
+        m.observe_probe("b", 20)
+        second = m.check_latency.render()
+        self.assertIsNot(second, first)
+        self.assertIn('check="b"', second)
+
+    def test_label_values_are_escaped(self) -> None:
+        m = MonitorMetrics()
+        m.check_fail_count.set('we"ird\\id', value=2)
+        self.assertIn('check="we\\"ird\\\\id"', m.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,12 @@
 from datetime import datetime, timedelta, timezone
 import unittest
 
-from app.ops_logic import compute_overall_status, is_fresh, summarize_checks
+from app.ops_logic import (
+    compute_overall_status,
+    is_fresh,
+    split_down_by_core,
+    summarize_checks,
+)
 
 
 class OpsLogicTests(unittest.TestCase):
@@ -44,6 +49,15 @@ class OpsLogicTests(unittest.TestCase):
         self.assertTrue(core_down)
         self.assertTrue(non_core_down)
 
+    def test_split_down_by_core(self) -> None:
+        self.assertEqual(split_down_by_core([], {"core-api"}), (False, False))
+        self.assertEqual(split_down_by_core(["core-api"], {"core-api"}), (True, False))
+        self.assertEqual(split_down_by_core(["wiki"], {"core-api"}), (False, True))
+        self.assertEqual(
+            split_down_by_core(["wiki", "core-api"], {"core-api"}),
+            (True, True),
+        )
+
     def test_is_fresh(self) -> None:
         now = datetime(2026, 2, 24, 12, 0, tzinfo=timezone.utc)
 
@@ -0,0 +1,61 @@
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from app.persistence import SQLitePersistence
+
+
+class SQLiteReadPoolTests(unittest.TestCase):
+    def test_reads_do_not_wait_on_writer_lock(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = SQLitePersistence(str(Path(td) / "pool.sqlite3"), read_pool_size=2)
+            p.upsert_check_state({"id": "svc", "type": "http", "ok": True})
+
+            result: dict = {}
+
+            def read() -> None:
+                result["states"] = p.load_all_check_states()
+
+            # Hold the writer lock for the duration of the read.
+            with p._lock:
+                t = threading.Thread(target=read)
+                t.start()
+                t.join(timeout=2)
+
+            self.assertFalse(t.is_alive())
+            self.assertEqual(result["states"]["svc"]["ok"], True)
+            p.close()
+
+    def test_reader_connections_are_query_only(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = SQLitePersistence(str(Path(td) / "pool.sqlite3"), read_pool_size=1)
+
+            with p._readers.connection() as conn:
+                with self.assertRaises(sqlite3.DatabaseError):
+                    conn.execute("DELETE FROM events")
+            p.close()
+
+    def test_recent_events_and_wait_stats(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = SQLitePersistence(str(Path(td) / "pool.sqlite3"), read_pool_size=2)
+            for name in ("INIT", "DOWN", "UP"):
+                p.insert_event({"ts": "t", "id": "svc", "event": name, "ok": True})
+            p.insert_event({"ts": "t", "id": "other", "event": "INIT", "ok": True})
+
+            events = p.load_recent_events(limit=3)
+            self.assertEqual(
+                [(e["id"], e["event"]) for e in events],
+                [("svc", "DOWN"), ("svc", "UP"), ("other", "INIT")],
+            )
+
+            stats = p.read_pool_stats()
+            self.assertEqual(len(stats), 2)
+            self.assertEqual(sum(s["acquisitions"] for s in stats), 1)
+            self.assertIn("wait_max_ms", stats[0])
+            p.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import json
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from app import materialized
+from app.checks.container_check import run_container
+from app.clients.portainer import PortainerClient
+from app.portainer_poller import PortainerPoller
+from app.state import StateStore
+
+ENDPOINTS = [
+    {"Id": 1, "Name": "local", "Type": 1, "Status": 1},
+    {"Id": 2, "Name": "edge", "Type": 2, "Status": 1},
+    {"Id": 3, "Name": "k8s", "Type": 5, "Status": 1},
+]
+CONTAINERS = {
+    1: [
+        {"Names": ["/grafana"], "State": "running", "Status": "Up 2 hours (healthy)"},
+        {"Names": ["/loki"], "State": "running", "Status": "Up 2 hours (unhealthy)"},
+        {"Names": ["/backup"], "State": "exited", "Status": "Exited (1) 5 minutes ago"},
+    ],
+    2: [
+        {"Names": ["/grafana"], "State": "running", "Status": "Up 3 days"},
+    ],
+}
+
+
+class _PortainerHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        srv = self.server
+        srv.requests.append((self.path, self.headers.get("X-API-Key")))
+        path = self.path.split("?")[0]
+        if path == "/api/endpoints":
+            body = ENDPOINTS
+        elif path.endswith("/docker/containers/json"):
+            endpoint_id = int(path.split("/")[3])
+            if endpoint_id in srv.failing:
+                self._reply(502, {"message": "agent unreachable"})
+                return
+            body = CONTAINERS[endpoint_id]
+        else:
+            self._reply(404, {"message": "not found"})
+            return
+        self._reply(200, body)
+
+    def _reply(self, code: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class PortainerStubTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _PortainerHandler)
+        self.server.requests = []
+        self.server.failing = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = PortainerClient(
+            base_url=f"http://127.0.0.1:{self.server.server_port}", api_key="k", timeout_s=2
+        )
+        self.store = StateStore(db_path=None)
+
+    def test_one_listing_per_docker_environment(self) -> None:
+        payload = self.client.fetch_containers()
+
+        self.assertEqual(payload["status"], "ok")
+        self.assertEqual([e["name"] for e in payload["endpoints"]], ["local", "edge"])
+        self.assertEqual(len(payload["containers"]), 4)
+        loki = next(c for c in payload["containers"] if c["name"] == "loki")
+        self.assertEqual((loki["endpoint"], loki["health"]), ("local", "unhealthy"))
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertTrue(all(key == "k" for _, key in self.server.requests))
+
+    def test_container_checks_resolve_against_cache(self) -> None:
+        poller = PortainerPoller(self.store, interval_s=30, fetch=self.client.fetch_containers)
+        self.assertEqual(poller.poll_once(), 30)
+        cache = self.store.portainer_snapshot()
+
+        self.assertTrue(run_container(cache, "grafana", None, 30).ok)
+        self.assertFalse(run_container(cache, "loki", "local", 30).ok)
+        backup = run_container(cache, "backup", None, 30)
+        self.assertEqual(backup.error, "local: Exited (1) 5 minutes ago")
+        missing = run_container(cache, "grafana", "nowhere", 30)
+        self.assertEqual(missing.error, "container not found on nowhere")
+
+        later = datetime.now(timezone.utc) + timedelta(hours=1)
+        self.assertIsNone(run_container(cache, "grafana", None, 30, now=later))
+
+    def test_failed_environment_fails_missing_containers_with_its_error(self) -> None:
+        self.server.failing = {2}
+        self.store.update_portainer(self.client.fetch_containers())
+        cache = self.store.portainer_snapshot()
+
+        res = run_container(cache, "only-on-edge", "edge", 30)
+        self.assertFalse(res.ok)
+        self.assertIn("edge: portainer returned HTTP 502", res.error)
+        self.assertIsNone(res.latency_ms)
+        with patch.object(materialized.settings, "PORTAINER_BASE_URL", "http://portainer"):
+            docker = materialized.build_docker_summary(self.store)
+        self.assertEqual(docker["status"], "warn")
+        self.assertEqual(len(docker["failed_endpoints"]), 1)
+
+        self.server.failing = {1, 2}
+        self.store.update_portainer(self.client.fetch_containers())
+        cache = self.store.portainer_snapshot()
+        self.assertIn("HTTP 502", cache.last_error)
+        self.assertEqual(len(cache.containers["grafana"]), 1)
+        with patch.object(materialized.settings, "PORTAINER_BASE_URL", "http://portainer"):
+            self.assertEqual(materialized.build_docker_summary(self.store)["status"], "unavailable")
+
+    def test_stale_data_ages_check_to_unknown_without_latency(self) -> None:
+        self.store.update_portainer(self.client.fetch_containers())
+        self.store.ensure_check("grafana", "container")
+        self.store.update("grafana", ok=True, latency_ms=None)
+        self.assertIsNone(self.store.check_state("grafana")["latency_ms"])
+        self.assertEqual(self.store.latency_percentiles("grafana")["5m"]["count"], 0)
+
+        self.store.mark_unknown("grafana", error="no fresh portainer data")
+
+        state = self.store.check_state("grafana")
+        self.assertIsNone(state["ok"])
+        self.assertEqual(state["error"], "no fresh portainer data")
+        self.assertEqual(self.store.summary()["unknown"], 1)
+
+    def test_docker_summary(self) -> None:
+        self.store.update_portainer(self.client.fetch_containers())
+        self.store.ensure_check("backup", "container")
+        self.store.update("backup", ok=False, latency_ms=None, error="local: exited")
+
+        with patch.object(materialized.settings, "PORTAINER_BASE_URL", "http://portainer"):
+            docker = materialized.build_docker_summary(self.store)
+
+        self.assertEqual(docker["status"], "warn")
+        self.assertEqual((docker["containers_total"], docker["containers_running"]), (4, 3))
+        self.assertEqual(docker["unhealthy"], ["local/loki"])
+        self.assertEqual(docker["down_checks"], ["backup"])
+
+
+if __name__ == "__main__":
+    unittest.main()
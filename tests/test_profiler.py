@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+from app import profiler
+from app.profiler import ProfilerBusyError, sample_threads
+
+
+def _busy_wait(stop: threading.Event) -> None:
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+class SamplingProfilerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stop = threading.Event()
+        self.thread = threading.Thread(
+            target=_busy_wait,
+            args=(self.stop,),
+            name=profiler.RUNNER_THREAD_NAME,
+            daemon=True,
+        )
+        self.thread.start()
+
+    def tearDown(self) -> None:
+        self.stop.set()
+        self.thread.join()
+
+    def test_collapsed_stacks_include_runner_frames(self) -> None:
+        profile = sample_threads(0.05, 0.005, target="runner")
+
+        self.assertGreater(profile.samples_taken, 1)
+        lines = profile.collapsed().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith(profiler.RUNNER_THREAD_NAME + ";"))
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any("_busy_wait" in line for line in lines))
+
+    def test_sampler_excludes_its_own_thread(self) -> None:
+        profile = sample_threads(0.02, 0.005)
+        own = threading.current_thread().name
+        self.assertNotIn(own, {name for name, _ in profile.stacks})
+
+    def test_speedscope_document_shape(self) -> None:
+        doc = sample_threads(0.02, 0.005, target="runner").speedscope()
+        json.dumps(doc)
+
+        frames = doc["shared"]["frames"]
+        self.assertEqual(len(doc["profiles"]), 1)
+        prof = doc["profiles"][0]
+        self.assertEqual(prof["type"], "sampled")
+        self.assertEqual(len(prof["samples"]), len(prof["weights"]))
+        for sample in prof["samples"]:
+            self.assertTrue(all(0 <= idx < len(frames) for idx in sample))
+
+    def test_only_one_session_at_a_time(self) -> None:
+        with profiler._session_lock:
+            with self.assertRaises(ProfilerBusyError):
+                sample_threads(0.01, 0.005)
+
+
+class ProfileEndpointTests(unittest.TestCase):
+    def test_disabled_by_default_and_busy_maps_to_409(self) -> None:
+        from app import main
+
+        with patch.object(main.settings, "OPS_PROFILER_ENABLED", False):
+            with self.assertRaises(HTTPException) as ctx:
+                main.ops_profile(seconds=0.01, interval_ms=5, format="collapsed", target="all")
+            self.assertEqual(ctx.exception.status_code, 403)
+
+        with patch.object(main.settings, "OPS_PROFILER_ENABLED", True):
+            resp = main.ops_profile(seconds=0.01, interval_ms=5, format="speedscope", target="all")
+            self.assertEqual(resp.media_type, "application/json")
+            self.assertIn("profiles", json.loads(resp.body))
+
+            with profiler._session_lock:
+                with self.assertRaises(HTTPException) as ctx:
+                    main.ops_profile(seconds=0.01, interval_ms=5, format="collapsed", target="all")
+            self.assertEqual(ctx.exception.status_code, 409)
+
+
+if __name__ == "__main__":
+    unittest.main()
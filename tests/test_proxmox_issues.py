@@ -0,0 +1,201 @@
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from app.clients import proxmox_stats
+from app.clients.proxmox_stats import NOT_MODIFIED, ProxmoxStatsClient
+from app.proxmox_issues import ProxmoxIssueTracker, issue_key
+from app.state import StateStore
+
+DISK = {"kind": "ct_disk_high", "vmid": 111, "name": "dashboards", "usage_percent": 91.6}
+MEM = {"kind": "node_mem_high", "node": "pve1", "usage_percent": 95.0}
+T0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        srv = self.server
+        srv.requests.append(dict(self.headers))
+        if srv.etag and self.headers.get("If-None-Match") == srv.etag:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(srv.body)))
+        if srv.etag:
+            self.send_header("ETag", srv.etag)
+        self.end_headers()
+        self.wfile.write(srv.body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class ProxmoxClientTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.requests = []
+        self.server.etag = None
+        self.server.body = b'{"status": "ok", "issues": []}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        patcher = patch.object(
+            proxmox_stats.settings,
+            "PROXMOX_STATS_BASE_URL",
+            f"http://127.0.0.1:{self.server.server_port}",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sends_if_none_match_and_handles_304(self) -> None:
+        self.server.etag = '"v1"'
+        client = ProxmoxStatsClient()
+        self.assertEqual(client.get_health_summary()["status"], "ok")
+        self.assertIs(client.get_health_summary(), NOT_MODIFIED)
+        self.assertEqual(self.server.requests[1]["If-None-Match"], '"v1"')
+
+        self.server.etag = '"v2"'
+        self.server.body = b'{"status": "warn", "issues": []}'
+        self.assertEqual(client.get_health_summary()["status"], "warn")
+
+    def test_identical_body_without_validators_is_skipped(self) -> None:
+        client = ProxmoxStatsClient()
+        self.assertEqual(client.get_health_summary()["status"], "ok")
+        self.assertIs(client.get_health_summary(), NOT_MODIFIED)
+        self.assertNotIn("If-None-Match", self.server.requests[1])
+
+    def test_repeated_failure_payload_is_not_skipped(self) -> None:
+        self.server.etag = '"v1"'
+        client = ProxmoxStatsClient()
+        store = StateStore(db_path=None)
+        store.update_proxmox_stats(client.get_health_summary(), fetch_ts=T0)
+
+        self.server.etag = '"down"'
+        self.server.body = b'{"status": "unavailable", "error": "pve api down"}'
+        for _ in range(2):
+            store.update_proxmox_stats(client.get_health_summary(), fetch_ts=T0)
+            cache = store.proxmox_stats_snapshot()
+            self.assertEqual(cache.last_payload["status"], "ok")
+            self.assertEqual(cache.last_error, "pve api down")
+        self.assertNotIn("If-None-Match", self.server.requests[-1])
+
+    def test_one_off_fetch_always_returns_payload(self) -> None:
+        self.assertEqual(proxmox_stats.get_health_summary()["status"], "ok")
+        self.assertEqual(proxmox_stats.get_health_summary()["status"], "ok")
+
+
+class ProxmoxIssueTrackerTests(unittest.TestCase):
+    def test_key_ignores_measurements(self) -> None:
+        self.assertEqual(issue_key(DISK), issue_key({**DISK, "usage_percent": 97.0}))
+        self.assertEqual(issue_key(DISK), issue_key({**DISK, "name": "renamed"}))
+        self.assertEqual(issue_key(DISK), "ct_disk_high:vmid=111")
+        self.assertEqual(issue_key("Disk high"), "Disk high")
+
+    def test_key_without_identity_fields_ignores_detail_text(self) -> None:
+        issue = {"kind": "cluster_quorum", "message": "2/3 votes"}
+        self.assertEqual(issue_key(issue), "cluster_quorum")
+        self.assertEqual(issue_key(issue), issue_key({**issue, "message": "1/3 votes"}))
+        self.assertEqual(
+            issue_key({"type": "storage_full", "storage": "local-lvm"}),
+            "storage_full:storage=local-lvm",
+        )
+
+    def test_appeared_and_resolved(self) -> None:
+        tracker = ProxmoxIssueTracker()
+        self.assertEqual([c[0] for c in tracker.observe([DISK], 0)], ["APPEARED"])
+        changes = tracker.observe([{**DISK, "usage_percent": 92.0}, MEM], 1)
+        self.assertEqual(changes, [("APPEARED", issue_key(MEM), MEM)])
+        changes = tracker.observe([MEM], 5_000_000)
+        self.assertEqual([(c[0], c[1]) for c in changes], [("RESOLVED", issue_key(DISK))])
+        self.assertEqual(tracker.history(1)[0]["duration_s"], 5.0)
+        self.assertEqual([e["key"] for e in tracker.open_issues()], [issue_key(MEM)])
+
+
+class StoreIssueEventTests(unittest.TestCase):
+    def test_issue_transitions_become_events(self) -> None:
+        store = StateStore(db_path=None)
+        store.update_proxmox_stats({"status": "warn", "issues": [DISK]}, fetch_ts=T0)
+        store.update_proxmox_stats(NOT_MODIFIED, fetch_ts=T0 + timedelta(seconds=30))
+        store.update_proxmox_stats(
+            {"status": "warn", "issues": [{**DISK, "usage_percent": 93.0}]},
+            fetch_ts=T0 + timedelta(seconds=60),
+        )
+        store.update_proxmox_stats(
+            {"status": "ok", "issues": []}, fetch_ts=T0 + timedelta(seconds=90)
+        )
+
+        events = store.events(limit=10)
+        self.assertEqual([e["event"] for e in events], ["RESOLVED", "APPEARED"])
+        self.assertEqual(events[0]["id"], "proxmox/ct_disk_high:vmid=111")
+        self.assertTrue(events[0]["ok"])
+        self.assertEqual(store.proxmox_issues()["history"][0]["duration_s"], 90.0)
+
+    def test_issue_events_bump_events_generation_not_transition_metric(self) -> None:
+        store = StateStore(db_path=None)
+        kinds = []
+        store.add_listener(lambda kind, data: kinds.append(kind))
+        before = store.events_generation
+
+        store.update_proxmox_stats({"status": "warn", "issues": [DISK]}, fetch_ts=T0)
+
+        self.assertEqual(store.events_generation, before + 1)
+        self.assertEqual(kinds, ["issue"])
+
+    def test_not_modified_keeps_payload_and_clears_error(self) -> None:
+        store = StateStore(db_path=None)
+        store.update_proxmox_stats({"status": "ok", "issues": []}, fetch_ts=T0)
+        payload = store.proxmox_stats_snapshot().last_payload
+        store.update_proxmox_stats({"status": "unavailable", "error": "timeout"})
+        store.update_proxmox_stats(NOT_MODIFIED)
+
+        cache = store.proxmox_stats_snapshot()
+        self.assertIs(cache.last_payload, payload)
+        self.assertIsNone(cache.last_error)
+
+    def test_open_issues_survive_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "issues.sqlite3")
+            store = StateStore(db_path=db_path)
+            store.update_proxmox_stats({"status": "warn", "issues": [DISK]}, fetch_ts=T0)
+
+            restored = StateStore(db_path=db_path)
+            restored.update_proxmox_stats({"status": "warn", "issues": [DISK]})
+            self.assertEqual(len(restored.events(limit=10)), 1)
+            self.assertEqual(len(restored.proxmox_issues()["open"]), 1)
+
+    def test_open_issue_survives_restart_after_its_event_left_the_ring(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "issues.sqlite3")
+            store = StateStore(db_path=db_path, max_events=2)
+            store.update_proxmox_stats({"status": "warn", "issues": [DISK]}, fetch_ts=T0)
+            store.ensure_check("web", "http")
+            store.update("web", ok=False, latency_ms=None, error="down")
+            store.update("web", ok=True, latency_ms=12)
+            self.assertNotIn("APPEARED", [e["event"] for e in store.events(limit=10)])
+
+            restored = StateStore(db_path=db_path, max_events=2)
+            restored.update_proxmox_stats(
+                {"status": "warn", "issues": [DISK]}, fetch_ts=T0 + timedelta(hours=1)
+            )
+            self.assertNotIn("APPEARED", [e["event"] for e in restored.events(limit=10)])
+            (entry,) = restored.proxmox_issues()["open"]
+            self.assertTrue(entry["since"].startswith("2026-03-01T00:00:00"))
+
+            restored.update_proxmox_stats(
+                {"status": "ok", "issues": []}, fetch_ts=T0 + timedelta(hours=2)
+            )
+            again = StateStore(db_path=db_path, max_events=2)
+            self.assertEqual(again.proxmox_issues()["open"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
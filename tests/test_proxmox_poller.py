@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+from app.clients import proxmox_stats
+from app.proxmox_poller import ProxmoxPoller
+from app.state import StateStore
+
+
+class ProxmoxPollerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.store = StateStore(db_path=None)
+
+    def test_success_keeps_interval_and_updates_cache(self) -> None:
+        fetch = Mock(return_value={"status": "ok", "issues": []})
+        poller = ProxmoxPoller(self.store, interval_s=30, fetch=fetch)
+
+        self.assertEqual(poller.poll_once(), 30)
+        cache = self.store.proxmox_stats_snapshot()
+        self.assertEqual(cache.last_payload, {"status": "ok", "issues": []})
+        self.assertIsNone(cache.last_error)
+
+    def test_failures_back_off_then_open_circuit(self) -> None:
+        fetch = Mock(return_value={"status": "unavailable", "error": "refused"})
+        poller = ProxmoxPoller(
+            self.store, interval_s=10, backoff_max_s=300, failure_threshold=3, fetch=fetch
+        )
+
+        self.assertEqual(poller.poll_once(), 10)
+        self.assertEqual(poller.poll_once(), 20)
+        self.assertAlmostEqual(poller.poll_once(), 300, delta=1)
+        self.assertEqual(poller.stats()["circuit"], "open")
+
+        # While open, no requests are made and the cache is left alone.
+        before = self.store.proxmox_stats_snapshot()
+        self.assertGreater(poller.poll_once(), 0)
+        self.assertEqual(fetch.call_count, 3)
+        self.assertEqual(self.store.proxmox_stats_snapshot(), before)
+        self.assertEqual(before.last_error, "refused")
+
+    def test_failure_keeps_last_good_payload(self) -> None:
+        fetch = Mock(
+            side_effect=[{"status": "ok"}, {"status": "unavailable", "error": "timeout"}]
+        )
+        poller = ProxmoxPoller(self.store, interval_s=5, fetch=fetch)
+        poller.poll_once()
+        poller.poll_once()
+
+        cache = self.store.proxmox_stats_snapshot()
+        self.assertEqual(cache.last_payload, {"status": "ok"})
+        self.assertEqual(cache.last_error, "timeout")
+
+    def test_slow_poll_runs_off_the_caller_thread(self) -> None:
+        done = threading.Event()
+
+        def fetch() -> dict:
+            time.sleep(0.3)
+            done.set()
+            return {"status": "ok"}
+
+        poller = ProxmoxPoller(self.store, interval_s=60, fetch=fetch)
+        start = time.perf_counter()
+        poller.start()
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertTrue(done.wait(2))
+        poller.stop()
+
+
+class _SummaryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.server.ports.add(self.client_address[1])
+        body = b'{"status": "ok", "issues": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class ProxmoxSessionTests(unittest.TestCase):
+    def test_polls_reuse_one_connection(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _SummaryHandler)
+        server.ports = set()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        with patch.object(proxmox_stats.settings, "PROXMOX_STATS_BASE_URL", base_url):
+            for _ in range(3):
+                payload = proxmox_stats.get_health_summary()
+                self.assertEqual(payload["status"], "ok")
+
+        self.assertEqual(len(server.ports), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,19 +8,20 @@ from app.clients import proxmox_stats
 
 class ProxmoxStatsClientTests(unittest.TestCase):
     def test_get_health_summary_success(self) -> None:
-        response = Mock(status_code=200)
+        response = Mock(status_code=200, content=b'{"status": "ok", "issues": []}', headers={})
         response.json.return_value = {"status": "ok", "issues": []}
 
         with patch.object(
             proxmox_stats.settings, "PROXMOX_STATS_BASE_URL", "http://proxmox-stats.local"
         ), patch.object(proxmox_stats.settings, "PROXMOX_STATS_TIMEOUT_SECONDS", 2.5), patch(
-            "app.clients.proxmox_stats.requests.get", return_value=response
+            "app.clients.proxmox_stats._session.get", return_value=response
         ) as mock_get:
             payload = proxmox_stats.get_health_summary()
 
         self.assertEqual(payload, {"status": "ok", "issues": []})
         mock_get.assert_called_once_with(
-            "http://proxmox-stats.local/api/health/summary",
+            "http://proxmox-stats.local/api/metrics/health-summary",
+            headers={},
             timeout=2.5,
         )
 
@@ -28,7 +29,7 @@ class ProxmoxStatsClientTests(unittest.TestCase):
         with patch.object(
             proxmox_stats.settings, "PROXMOX_STATS_BASE_URL", "http://proxmox-stats.local"
         ), patch.object(proxmox_stats.settings, "PROXMOX_STATS_TIMEOUT_SECONDS", 2.5), patch(
-            "app.clients.proxmox_stats.requests.get",
+            "app.clients.proxmox_stats._session.get",
             side_effect=requests.Timeout("timed out"),
         ):
             payload = proxmox_stats.get_health_summary()
@@ -42,7 +43,7 @@ class ProxmoxStatsClientTests(unittest.TestCase):
         with patch.object(
             proxmox_stats.settings, "PROXMOX_STATS_BASE_URL", "http://proxmox-stats.local"
         ), patch.object(proxmox_stats.settings, "PROXMOX_STATS_TIMEOUT_SECONDS", 2.5), patch(
-            "app.clients.proxmox_stats.requests.get", return_value=response
+            "app.clients.proxmox_stats._session.get", return_value=response
         ):
             payload = proxmox_stats.get_health_summary()
 
@@ -50,13 +51,13 @@ class ProxmoxStatsClientTests(unittest.TestCase):
         self.assertIn("503", payload["error"])
 
     def test_get_health_summary_invalid_json_returns_unavailable(self) -> None:
-        response = Mock(status_code=200)
+        response = Mock(status_code=200, content=b"not json", headers={})
         response.json.side_effect = ValueError("no json object could be decoded")
 
         with patch.object(
             proxmox_stats.settings, "PROXMOX_STATS_BASE_URL", "http://proxmox-stats.local"
         ), patch.object(proxmox_stats.settings, "PROXMOX_STATS_TIMEOUT_SECONDS", 2.5), patch(
-            "app.clients.proxmox_stats.requests.get", return_value=response
+            "app.clients.proxmox_stats._session.get", return_value=response
         ):
             payload = proxmox_stats.get_health_summary()
 
@@ -24,53 +24,49 @@ class RunnerNotificationTests(unittest.TestCase):
                 }
             }
 
-            with patch(
-                "app.runner.get_health_summary",
-                return_value={"status": "unavailable", "error": "disabled in test"},
+            with patch("app.runner.load_registry", return_value=object()), patch(
+                "app.runner.apply_defaults", return_value=checks
+            ), patch(
+                "app.runner.run_http",
+                return_value=CheckResult(ok=False, latency_ms=10, status_code=503),
             ):
-                with patch("app.runner.load_registry", return_value=object()), patch(
-                    "app.runner.apply_defaults", return_value=checks
-                ), patch(
-                    "app.runner.run_http",
-                    return_value=CheckResult(ok=False, latency_ms=10, status_code=503),
-                ):
-                    run_once(store, notifier=notifier)
+                run_once(store, notifier=notifier)
 
-                notifier.send_down.assert_not_called()  # INIT only
-                notifier.send_up.assert_not_called()
+            notifier.send_down.assert_not_called()  # INIT only
+            notifier.send_up.assert_not_called()
 
-                with patch("app.runner.load_registry", return_value=object()), patch(
-                    "app.runner.apply_defaults", return_value=checks
-                ), patch(
-                    "app.runner.run_http",
-                    return_value=CheckResult(ok=False, latency_ms=8, status_code=503),
-                ):
-                    run_once(store, notifier=notifier)
+            with patch("app.runner.load_registry", return_value=object()), patch(
+                "app.runner.apply_defaults", return_value=checks
+            ), patch(
+                "app.runner.run_http",
+                return_value=CheckResult(ok=False, latency_ms=8, status_code=503),
+            ):
+                run_once(store, notifier=notifier)
 
-                notifier.send_down.assert_not_called()  # still down, no transition
-                notifier.send_up.assert_not_called()
+            notifier.send_down.assert_not_called()  # still down, no transition
+            notifier.send_up.assert_not_called()
 
-                with patch("app.runner.load_registry", return_value=object()), patch(
-                    "app.runner.apply_defaults", return_value=checks
-                ), patch(
-                    "app.runner.run_http",
-                    return_value=CheckResult(ok=True, latency_ms=5, status_code=200),
-                ):
-                    run_once(store, notifier=notifier)
+            with patch("app.runner.load_registry", return_value=object()), patch(
+                "app.runner.apply_defaults", return_value=checks
+            ), patch(
+                "app.runner.run_http",
+                return_value=CheckResult(ok=True, latency_ms=5, status_code=200),
+            ):
+                run_once(store, notifier=notifier)
 
-                notifier.send_up.assert_called_once()
+            notifier.send_up.assert_called_once()
 
-                with patch("app.runner.load_registry", return_value=object()), patch(
-                    "app.runner.apply_defaults", return_value=checks
-                ), patch(
-                    "app.runner.run_http",
-                    return_value=CheckResult(
-                        ok=False, latency_ms=12, status_code=503, error="down"
-                    ),
-                ):
-                    run_once(store, notifier=notifier)
+            with patch("app.runner.load_registry", return_value=object()), patch(
+                "app.runner.apply_defaults", return_value=checks
+            ), patch(
+                "app.runner.run_http",
+                return_value=CheckResult(
+                    ok=False, latency_ms=12, status_code=503, error="down"
+                ),
+            ):
+                run_once(store, notifier=notifier)
 
-                notifier.send_down.assert_called_once()
+            notifier.send_down.assert_called_once()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import Mock
+
+from app.breaker import CircuitBreaker
+from app.coalescer import NotificationCoalescer
+from app.dispatcher import NotificationDispatcher, NotificationFanout, SinkRoute
+from app.models import Registry
+from app.sinks import FileSink, WebhookSink
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.server.received.append((dict(self.headers), self.rfile.read(length)))
+        time.sleep(self.server.delay_s)
+        self.send_response(self.server.status)
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _Stub:
+    def __init__(self, status: int = 200, delay_s: float = 0.0) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.received = []
+        self.server.status = status
+        self.server.delay_s = delay_s
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _wait_for(predicate, timeout_s: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class SinkTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.addCleanup(self._td.cleanup)
+
+    def test_webhook_posts_json(self) -> None:
+        stub = _Stub()
+        self.addCleanup(stub.close)
+        WebhookSink(stub.url, headers={"X-Token": "abc"}).send_down(title="t", message="m")
+
+        headers, body = stub.server.received[0]
+        self.assertEqual(headers["X-Token"], "abc")
+        payload = json.loads(body)
+        self.assertEqual(
+            (payload["kind"], payload["title"], payload["message"]), ("down", "t", "m")
+        )
+
+    def test_webhook_raises_on_http_error(self) -> None:
+        stub = _Stub(status=500)
+        self.addCleanup(stub.close)
+        with self.assertRaises(Exception):
+            WebhookSink(stub.url).send_up(title="t", message="m")
+
+    def test_file_sink_appends_ndjson(self) -> None:
+        path = Path(self._td.name) / "out" / "notifications.ndjson"
+        sink = FileSink(path)
+        sink.send_down(title="a", message="1")
+        sink.send_up(title="b", message="2")
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual([line["kind"] for line in lines], ["down", "up"])
+
+    def test_slow_sink_does_not_delay_others(self) -> None:
+        slow = _Stub(delay_s=1.0)
+        self.addCleanup(slow.close)
+        path = Path(self._td.name) / "fast.ndjson"
+        fanout = NotificationFanout(
+            {
+                "slow": NotificationDispatcher(WebhookSink(slow.url), sink="slow"),
+                "file": NotificationDispatcher(FileSink(path), sink="file"),
+            }
+        )
+        fanout.start()
+        try:
+            start = time.perf_counter()
+            fanout.send_down(title="t", message="m")
+            self.assertTrue(_wait_for(path.exists))
+            self.assertLess(time.perf_counter() - start, 0.8)
+            self.assertEqual(fanout.stats()["sinks"]["slow"]["queue_depth"], 1)
+            self.assertTrue(_wait_for(lambda: fanout.stats()["delivered"] == 2))
+        finally:
+            fanout.stop()
+
+    def test_per_sink_timeout(self) -> None:
+        slow = _Stub(delay_s=1.0)
+        self.addCleanup(slow.close)
+        start = time.perf_counter()
+        with self.assertRaises(Exception):
+            WebhookSink(slow.url, timeout_s=0.2).send_down(title="t", message="m")
+        self.assertLess(time.perf_counter() - start, 0.8)
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_opens_half_opens_and_closes(self) -> None:
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_s=10, clock=lambda: now[0])
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "closed")
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertEqual(breaker.retry_in(), 10)
+
+        now[0] = 10.0
+        self.assertEqual(breaker.state, "half_open")
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+        now[0] = 20.0
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.retry_in(), 0)
+
+    def test_open_circuit_pauses_delivery(self) -> None:
+        notifier = Mock()
+        notifier.send_down.side_effect = OSError("refused")
+        dispatcher = NotificationDispatcher(
+            notifier,
+            backoff_base_s=0.001,
+            sink="hook",
+            breaker=CircuitBreaker(failure_threshold=2, reset_s=60),
+        )
+        dispatcher.start()
+        try:
+            dispatcher.send_down(title="t", message="m")
+            self.assertTrue(_wait_for(lambda: dispatcher.stats()["circuit"] == "open"))
+            time.sleep(0.1)
+        finally:
+            dispatcher.stop()
+        self.assertEqual(notifier.send_down.call_count, 2)
+        self.assertEqual(dispatcher.dropped, 0)
+
+
+class RoutingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ntfy = NotificationDispatcher(Mock(), sink="ntfy")
+        self.ai = NotificationDispatcher(Mock(), sink="ai")
+        self.fanout = NotificationFanout(
+            {"ntfy": self.ntfy, "ai": self.ai},
+            [SinkRoute("ai", checks=frozenset({"router"}), tags=frozenset({"ai"}))],
+        )
+
+    def test_route_by_check_and_tag(self) -> None:
+        self.assertEqual(self.fanout.route("ollama", ["ai", "api"]), {"ntfy", "ai"})
+        self.assertEqual(self.fanout.route("router", []), {"ntfy", "ai"})
+        self.assertEqual(self.fanout.route("nas", ["storage"]), {"ntfy"})
+
+    def test_send_only_enqueues_for_routed_sinks(self) -> None:
+        self.fanout.send_down(title="t", message="m", sinks={"ntfy"})
+        self.assertEqual((self.ntfy.depth(), self.ai.depth()), (1, 0))
+        self.fanout.send_up(title="t", message="m")
+        self.assertEqual((self.ntfy.depth(), self.ai.depth()), (2, 1))
+
+    def test_coalescer_digests_per_sink_set(self) -> None:
+        target = Mock()
+        coalescer = NotificationCoalescer(target, window_s=0, route=self.fanout.route)
+        for check_id, tags in (("ollama", ["ai"]), ("nas", []), ("web", [])):
+            event = {"ts": "2026-01-01T00:00:00Z", "id": check_id, "event": "DOWN", "ok": False}
+            coalescer.submit(event, title=f"[DOWN] {check_id}", message="m", tags=tags)
+
+        self.assertEqual(coalescer.flush(force=True), 2)
+        sent = {
+            call.kwargs["sinks"]: call.kwargs["title"]
+            for call in target.send_down.call_args_list
+        }
+        self.assertEqual(sent[frozenset({"ntfy", "ai"})], "[DOWN] ollama")
+        self.assertTrue(sent[frozenset({"ntfy"})].startswith("[DIGEST] 2 checks"))
+
+    def test_registry_parses_sinks(self) -> None:
+        reg = Registry.model_validate(
+            {
+                "checks": [],
+                "sinks": [
+                    {"name": "hook", "type": "webhook", "url": "http://hooks.local/x"},
+                    {"name": "log", "type": "file", "path": "/tmp/n.ndjson", "tags": ["ai"]},
+                ],
+            }
+        )
+        self.assertEqual([s.type for s in reg.sinks], ["webhook", "file"])
+        self.assertEqual(reg.sinks[1].tags, ["ai"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.state import StateStore
+
+
+class StatusAggregateTests(unittest.TestCase):
+    def test_counts_and_down_ids_follow_updates(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("a", "http", tags=["media"])
+        store.ensure_check("b", "http", tags=["media", "ai"])
+        store.ensure_check("c", "tcp")
+
+        agg = store.published().aggregates
+        self.assertEqual((agg.up, agg.down, agg.unknown), (0, 0, 3))
+
+        store.update("a", ok=True, latency_ms=1)
+        store.update("b", ok=False, latency_ms=1, error="x")
+        store.update("c", ok=False, latency_ms=1, error="y")
+
+        agg = store.published().aggregates
+        self.assertEqual((agg.up, agg.down, agg.unknown), (1, 2, 0))
+        self.assertEqual(agg.down_ids, ("b", "c"))
+        self.assertEqual(
+            dict(agg.tag_counts["media"]),
+            {"total": 2, "up": 1, "down": 1, "unknown": 0},
+        )
+        self.assertEqual(agg.tag_counts["ai"]["down"], 1)
+
+        store.update("b", ok=True, latency_ms=1)
+        agg = store.published().aggregates
+        self.assertEqual(agg.down_ids, ("c",))
+        self.assertEqual(agg.tag_counts["media"]["up"], 2)
+
+        summary = store.summary()
+        self.assertEqual(summary["total"], 3)
+        self.assertEqual([c["id"] for c in summary["down_checks"]], ["c"])
+
+    def test_prune_and_retag_adjust_aggregates(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("a", "http", tags=["media"])
+        store.ensure_check("b", "http", tags=["media"])
+        store.update("a", ok=False, latency_ms=1)
+
+        store.ensure_check("b", "http", tags=["ai"])
+        store.prune({"b"})
+
+        agg = store.published().aggregates
+        self.assertEqual(agg.total, 1)
+        self.assertEqual(agg.down_ids, ())
+        self.assertNotIn("media", agg.tag_counts)
+        self.assertEqual(agg.tag_counts["ai"]["unknown"], 1)
+
+    def test_aggregates_restored_from_db(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "agg.sqlite3")
+            store1 = StateStore(db_path=db_path)
+            store1.ensure_check("up", "http")
+            store1.ensure_check("down", "http")
+            store1.update("up", ok=True, latency_ms=1)
+            store1.update("down", ok=False, latency_ms=1)
+
+            store2 = StateStore(db_path=db_path)
+            agg = store2.published().aggregates
+
+            self.assertEqual((agg.up, agg.down, agg.unknown), (1, 1, 0))
+            self.assertEqual(agg.down_ids, ("down",))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+from app import state
+from app.state import StateStore
+
+
+class StateSnapshotTests(unittest.TestCase):
+    def test_update_publishes_new_snapshot_and_keeps_old_one_intact(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("svc", "http")
+        before = store.published()
+
+        store.update("svc", ok=True, latency_ms=5, status_code=200)
+        after = store.published()
+
+        self.assertIsNot(before, after)
+        self.assertGreater(after.generation, before.generation)
+        self.assertIsNone(before.checks["svc"]["ok"])
+        self.assertEqual(after.checks["svc"]["ok"], True)
+        with self.assertRaises(TypeError):
+            after.checks["other"] = {}  # type: ignore[index]
+
+    def test_batch_publishes_once_on_exit(self) -> None:
+        store = StateStore(db_path=None)
+        start = store.published()
+
+        with store.batch():
+            store.ensure_check("a", "http")
+            store.ensure_check("b", "tcp")
+            self.assertIs(store.published(), start)
+
+        snap = store.published()
+        self.assertEqual(set(snap.checks), {"a", "b"})
+        self.assertEqual(snap.generation, start.generation + 2)
+
+    def test_long_batch_still_publishes_on_interval(self) -> None:
+        store = StateStore(db_path=None)
+        start = store.published()
+
+        with patch.object(state, "_BATCH_PUBLISH_INTERVAL_S", 0.0), store.batch():
+            store.ensure_check("a", "http")
+            self.assertIn("a", store.published().checks)
+        self.assertIsNot(store.published(), start)
+
+    def test_unchanged_ensure_check_does_not_publish(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("svc", "http", down_threshold=2)
+        snap = store.published()
+
+        store.ensure_check("svc", "http", down_threshold=2)
+
+        self.assertIs(store.published(), snap)
+
+    def test_prune_removes_check_from_published_snapshot(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("keep", "http")
+        store.ensure_check("drop", "http")
+
+        removed = store.prune({"keep"})
+
+        self.assertEqual(removed, ["drop"])
+        self.assertEqual(list(store.published().checks), ["keep"])
+        self.assertEqual(store.summary()["total"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
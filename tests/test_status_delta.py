@@ -0,0 +1,91 @@
+import importlib
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.state import StateStore
+
+
+class StatusDeltaTests(unittest.TestCase):
+    def test_changes_since_returns_only_modified_and_removed(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("a", "http")
+        store.ensure_check("b", "http")
+        store.ensure_check("c", "tcp")
+        base = store.generation
+
+        store.update("b", ok=True, latency_ms=3)
+        store.prune({"a", "b"})
+
+        delta = store.changes_since(base)
+        self.assertFalse(delta["full"])
+        self.assertEqual(list(delta["changed"]), ["b"])
+        self.assertEqual(delta["changed"]["b"]["ok"], True)
+        self.assertEqual(delta["removed"], ["c"])
+        self.assertEqual(delta["generation"], store.generation)
+
+        again = store.changes_since(delta["generation"])
+        self.assertEqual(again["changed"], {})
+        self.assertEqual(again["removed"], [])
+
+    def test_delta_survives_change_log_compaction(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("a", "http")
+        store.ensure_check("b", "http")
+        old = store.published()
+        base = store.generation
+
+        for i in range(3000):
+            store.update("a", ok=i % 2 == 0, latency_ms=3)
+        store.update("b", ok=True, latency_ms=3)
+
+        self.assertLess(len(store.published().change_log), 3000)
+        self.assertEqual(list(store.changes_since(base)["changed"]), ["a", "b"])
+        self.assertEqual(old.change_log[old.change_log_len - 1][1], "b")
+
+    def test_readded_check_is_changed_not_removed(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("a", "http")
+        base = store.generation
+
+        store.prune(set())
+        store.ensure_check("a", "http")
+
+        delta = store.changes_since(base)
+        self.assertEqual(list(delta["changed"]), ["a"])
+        self.assertEqual(delta["removed"], [])
+
+    def test_stale_or_unknown_generation_forces_full_resync(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("a", "http")
+        store.ensure_check("b", "http")
+
+        for since in (0, store.generation + 1):
+            delta = store.changes_since(since)
+            self.assertTrue(delta["full"])
+            self.assertEqual(set(delta["changed"]), {"a", "b"})
+
+    def test_endpoint_with_and_without_since(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["OPSMONITOR_DB_PATH"] = str(Path(td) / "test-delta.sqlite3")
+            main_mod = importlib.reload(importlib.import_module("app.main"))
+        main_mod.store = StateStore(db_path=None)
+        main_mod.store.ensure_check("svc", "http")
+
+        def get(since):
+            return json.loads(main_mod.status_checks(since=since, fields=None, ids=None, tag=None).body)
+
+        self.assertIn("svc", get(None))
+
+        bootstrap = get(0)
+        self.assertTrue(bootstrap["full"])
+        main_mod.store.update("svc", ok=False, latency_ms=1, error="x")
+        delta = get(bootstrap["generation"])
+        self.assertFalse(delta["full"])
+        self.assertEqual(delta["changed"]["svc"]["ok"], False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import importlib
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from app.state import StateStore
+
+
+class StatusQueryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["OPSMONITOR_DB_PATH"] = str(Path(td) / "test-query.sqlite3")
+            self.main_mod = importlib.reload(importlib.import_module("app.main"))
+        store = StateStore(db_path=None)
+        store.ensure_check("plex", "http", tags=["media"])
+        store.ensure_check("jellyfin", "http", tags=["media", "ui"])
+        store.ensure_check("ollama", "http", tags=["ai"])
+        store.update("plex", ok=True, latency_ms=12, status_code=200)
+        self.main_mod.store = store
+
+    def _get(self, **params):
+        query = {"since": None, "fields": None, "ids": None, "tag": None, **params}
+        return json.loads(self.main_mod.status_checks(**query).body)
+
+    def test_tag_index_tracks_registry_tags(self) -> None:
+        store = self.main_mod.store
+        self.assertEqual(store.published().tag_index["media"], ("plex", "jellyfin"))
+
+        store.ensure_check("jellyfin", "http", tags=["ui"])
+        store.prune({"plex", "jellyfin"})
+        index = store.published().tag_index
+        self.assertEqual(index["media"], ("plex",))
+        self.assertNotIn("ai", index)
+
+    def test_fields_projection(self) -> None:
+        payload = self._get(fields="ok,latency_ms")
+        self.assertEqual(payload["plex"], {"id": "plex", "ok": True, "latency_ms": 12})
+        self.assertEqual(len(payload), 3)
+
+    def test_unknown_field_is_rejected(self) -> None:
+        with self.assertRaises(HTTPException) as ctx:
+            self._get(fields="ok,bogus")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_ids_and_tag_filters(self) -> None:
+        self.assertEqual(list(self._get(ids="ollama,missing")), ["ollama"])
+        self.assertEqual(list(self._get(tag="media")), ["plex", "jellyfin"])
+        self.assertEqual(list(self._get(tag="media,ai", ids="ollama,plex")), ["plex", "ollama"])
+
+    def test_filters_apply_to_delta(self) -> None:
+        base = self.main_mod.store.generation
+        self.main_mod.store.update("ollama", ok=False, latency_ms=5)
+        self.main_mod.store.update("jellyfin", ok=True, latency_ms=5)
+
+        delta = self._get(since=base, tag="media", fields="ok")
+        self.assertEqual(delta["changed"], {"jellyfin": {"id": "jellyfin", "ok": True}})
+
+
+if __name__ == "__main__":
+    unittest.main()
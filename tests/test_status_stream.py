@@ -0,0 +1,87 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from app.state import StateStore
+from app.streaming import StreamBroker
+
+
+def _decode(payload: bytes) -> tuple[int, str, dict]:
+    lines = payload.decode().strip().split("\n")
+    fields = dict(line.split(": ", 1) for line in lines)
+    return int(fields["id"]), fields["event"], json.loads(fields["data"])
+
+
+class StreamBrokerTests(unittest.TestCase):
+    def test_store_updates_reach_subscriber_from_another_thread(self) -> None:
+        store = StateStore(db_path=None)
+        broker = StreamBroker()
+        store.add_listener(broker.publish)
+        store.ensure_check("svc", "http")
+
+        async def scenario() -> list:
+            sub, backlog = broker.subscribe(asyncio.get_running_loop())
+            self.assertEqual(backlog, [])
+            t = threading.Thread(
+                target=store.update, args=("svc",), kwargs={"ok": False, "latency_ms": 4}
+            )
+            t.start()
+            t.join()
+            first = await asyncio.wait_for(sub.get(), timeout=1)
+            second = await asyncio.wait_for(sub.get(), timeout=1)
+            broker.unsubscribe(sub)
+            return [_decode(first.payload), _decode(second.payload)]
+
+        (id1, ev1, data1), (id2, ev2, data2) = asyncio.run(scenario())
+        self.assertEqual(ev1, "transition")
+        self.assertEqual(data1["event"], "INIT")
+        self.assertEqual(ev2, "state")
+        self.assertEqual(data2["id"], "svc")
+        self.assertEqual(data2["generation"], store.generation)
+        self.assertEqual(id2, id1 + 1)
+
+    def test_resume_from_last_event_id_and_resync_when_too_old(self) -> None:
+        broker = StreamBroker(history=3)
+        for i in range(5):
+            broker.publish("state", {"n": i})
+        last = broker.current_id()
+
+        async def scenario() -> tuple:
+            loop = asyncio.get_running_loop()
+            _, resumed = broker.subscribe(loop, last_event_id=last - 2)
+            _, too_old = broker.subscribe(loop, last_event_id=last - 10)
+            _, future = broker.subscribe(loop, last_event_id=last + 5)
+            return resumed, too_old, future
+
+        resumed, too_old, future = asyncio.run(scenario())
+        self.assertEqual([_decode(m.payload)[2]["n"] for m in resumed], [3, 4])
+        self.assertIsNone(too_old)
+        self.assertIsNone(future)
+
+    def test_slow_subscriber_is_dropped_without_blocking_publisher(self) -> None:
+        broker = StreamBroker(max_buffer=2)
+
+        async def scenario() -> list:
+            sub, _ = broker.subscribe(asyncio.get_running_loop())
+            for i in range(5):
+                broker.publish("state", {"n": i})
+            await asyncio.sleep(0)
+            received = []
+            while True:
+                msg = await asyncio.wait_for(sub.get(), timeout=1)
+                received.append(msg)
+                if msg is None:
+                    break
+            broker.publish("state", {"n": 99})
+            return received
+
+        received = asyncio.run(scenario())
+        self.assertEqual(len(received), 3)
+        self.assertIsNone(received[-1])
+        self.assertEqual(broker.subscriber_count(), 0)
+        self.assertEqual(broker.dropped_total, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from app.state import StateStore
+
+
+class TagAggregateTests(unittest.TestCase):
+    def test_tag_summaries_counts_worst_and_p95(self) -> None:
+        store = StateStore(db_path=None)
+        for i in range(20):
+            store.ensure_check(f"m{i}", "http", tags=["media"])
+            store.update(f"m{i}", ok=True, latency_ms=(i + 1) * 10)
+        store.ensure_check("llm", "http", tags=["ai"])
+
+        tags = store.tag_summaries()
+        self.assertEqual(tags["media"]["worst"], "up")
+        self.assertEqual(tags["media"]["latency_p95_ms"], 190)
+        self.assertEqual(tags["ai"]["worst"], "unknown")
+        self.assertIsNone(tags["ai"]["latency_p95_ms"])
+
+        store.update("m18", ok=True, latency_ms=5000)
+        store.update("m19", ok=False, latency_ms=5000)
+        tags = store.tag_summaries()
+        self.assertEqual(tags["media"]["down"], 1)
+        self.assertEqual(tags["media"]["worst"], "down")
+        self.assertEqual(tags["media"]["latency_p95_ms"], 5000)
+
+    def test_latency_moves_with_retag_and_prune(self) -> None:
+        store = StateStore(db_path=None)
+        store.ensure_check("a", "http", tags=["x"])
+        store.ensure_check("b", "http", tags=["x"])
+        store.update("a", ok=True, latency_ms=10)
+        store.update("b", ok=True, latency_ms=900)
+
+        store.ensure_check("b", "http", tags=["y"])
+        tags = store.tag_summaries()
+        self.assertEqual(tags["x"]["latency_p95_ms"], 10)
+        self.assertEqual(tags["y"]["latency_p95_ms"], 900)
+
+        store.prune({"a"})
+        self.assertEqual(set(store.tag_summaries()), {"x"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+
+from app.checks.results import CheckResult
+from app.runner import run_once
+from app.state import StateStore
+from app.timing import RollingTimer, TimingRegistry, timings
+
+
+class RollingTimerTests(unittest.TestCase):
+    def test_window_percentiles_and_lifetime_totals(self) -> None:
+        timer = RollingTimer(size=10)
+        for i in range(1, 21):
+            timer.record(i / 1000)
+
+        stats = timer.stats()
+        self.assertEqual(stats["count"], 20)
+        self.assertEqual(stats["window"], 10)
+        self.assertEqual(stats["p50_ms"], 15.0)
+        self.assertEqual(stats["p99_ms"], 20.0)
+        self.assertEqual(stats["max_ms"], 20.0)
+        self.assertEqual(stats["total_ms"], 210.0)
+
+    def test_registry_time_context(self) -> None:
+        reg = TimingRegistry()
+        with reg.time("phase"):
+            pass
+        self.assertEqual(reg.snapshot()["phase"]["count"], 1)
+
+
+class RunnerTimingTests(unittest.TestCase):
+    def test_run_once_records_phases_and_store_lock(self) -> None:
+        timings.reset()
+        store = StateStore(db_path=None)
+        checks = {
+            "svc": {"id": "svc", "type": "http", "url": "http://x.local", "timeout_s": 1}
+        }
+        with patch("app.runner.load_registry", return_value=object()), patch(
+            "app.runner.apply_defaults", return_value=checks
+        ), patch(
+            "app.runner.run_http", return_value=CheckResult(ok=True, latency_ms=3)
+        ):
+            run_once(store)
+
+        snap = timings.snapshot()
+        for name in (
+            "runner.run_once",
+            "runner.load_registry",
+            "runner.prune",
+            "runner.ensure_checks",
+            "runner.probe.http",
+            "runner.store_update",
+            "store.lock_wait",
+        ):
+            self.assertIn(name, snap)
+            self.assertGreaterEqual(snap[name]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()